@@ -2,18 +2,43 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import base64
+import bisect
+import contextlib
+import functools
+import hashlib
+import heapq
+import hmac
+import ipaddress
+import itertools
 import json
+import multiprocessing
 import os
+import pickle
+import re
+import secrets
 import shutil
+import struct
+import sys
 import threading
+import time
+import unicodedata
 import uuid
+from collections import OrderedDict, deque
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
 import datetime as dt
+import xml.etree.ElementTree as ET
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
+import numpy as np
 import pandas as pd
 import webview
 from openpyxl import Workbook, load_workbook
@@ -23,11 +48,16 @@ from openpyxl.worksheet.datavalidation import DataValidation
 try:
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
-    from watchdog.observers.polling import PollingObserver
 except ImportError:  # pragma: no cover - optional dependency guard
     FileSystemEventHandler = object  # type: ignore
     Observer = None  # type: ignore
-    PollingObserver = None  # type: ignore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency guard
+    pa = None  # type: ignore
+    pq = None  # type: ignore
 
 
 TASK_COLUMNS = [
@@ -42,12 +72,58 @@ TASK_COLUMNS = [
 ]
 META_ID_COLUMN = "__kanban_id"
 HIDDEN_META_COLUMNS = [META_ID_COLUMN]
+# 値の種類が少ない列は辞書エンコード (カテゴリ型) で保持し、_df と
+# _last_saved_snapshot で同じ値テーブルを共有する。
+CATEGORICAL_COLUMNS = ["ステータス", "大分類", "中分類", "担当者", "優先度"]
 DEFAULT_STATUSES = ["未着手", "進行中", "完了", "保留"]
 DEFAULT_PRIORITY_LEVELS = ["高", "中", "低"]
 DEFAULT_VALIDATIONS: Dict[str, List[str]] = {
     "ステータス": list(DEFAULT_STATUSES),
     "優先度": list(DEFAULT_PRIORITY_LEVELS),
 }
+PROGRESS_REPORT_ROWS = 500
+IMPORT_CHUNK_ROWS = 2000
+VALIDATION_CACHE_MAX = 16
+# 期限がこの日数以内になると「期限間近」。frontend/scripts/common.js の getDueState と揃える。
+DUE_WARNING_DAYS = 3
+DUE_COMPLETED_STATUSES = {"完了", "完了済み", "完了済", "done", "completed"}
+DUE_SCHEDULER_CHECK_SECONDS = 60.0
+# 状態の版ごとの変更位置を保持する件数。これより古い版からの差分は全件送信になる。
+STATE_LOG_MAX = 2000
+EXPORT_CHUNK_ROWS = 2000
+# get_pending_changes が行の一覧を返す件数の既定値。件数 (counts) は常に全体を数える。
+PENDING_CHANGES_LIMIT = 1000
+# 元に戻す履歴の上限。件数と、値の JSON 表現の合計バイト数のどちらかを超えると古いものから捨てる。
+UNDO_MAX_ENTRIES = 500
+UNDO_MAX_BYTES = 256 * 1024
+# evaluate_js による通知の未送信上限と、1 回の評価を待つ秒数。
+PUSH_QUEUE_MAX = 32
+PUSH_EVAL_TIMEOUT_SECONDS = 10.0
+# 入力候補 (suggest) の索引を持つ列と、1 回に返す候補数の既定値・上限。
+SUGGEST_COLUMNS = ["大分類", "中分類", "担当者"]
+SUGGEST_LIMIT_DEFAULT = 20
+SUGGEST_LIMIT_MAX = 200
+# 累積フロー図・バーンダウン用の日別件数 (<ブック名>.analytics.jsonl)。1 回に取得できる期間の日数の上限、
+# 1 日 1 行へ詰め直すまでに許す余分な行数、補完に使うバックアップ名 (<ブック名>.bak_YYYYMMDD_HHMMSS) の日時部分。
+FLOW_HISTORY_RANGE_MAX_DAYS = 3660
+FLOW_HISTORY_COMPACT_SLACK = 256
+BACKUP_STAMP_PATTERN = re.compile(r"\.bak_(\d{8})_(\d{6})$")
+# ブリッジで送る状態の形式。columnar は列名を 1 回だけ送り、繰り返し値を辞書化し、
+# 期限を 1970-01-01 からの日数で表す。要求されない限り従来の rows を返す。
+WIRE_FORMATS = ("rows", "columnar")
+WIRE_EPOCH = dt.date(1970, 1, 1)
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+IMPORT_SUFFIXES = (".csv", ".txt", ".xlsx", ".xlsm")
+# ブックの付随ファイル (<ブック名>.<種類>.jsonl)。画面からの取り込み・書き出しでは指定させない。
+SIDECAR_KINDS = ("journal", "changes", "analytics")
+ARCHIVE_STATUS = "完了"
+ARCHIVE_SHEET_SUFFIX = "_アーカイブ"
+ARCHIVED_AT_COLUMN = "アーカイブ日"
+ARCHIVE_PAGE_MAX = 500
+ARCHIVE_UNSAVED_MESSAGE = "未保存の変更があるためアーカイブできません。先に保存するか再読込してください。"
+
+# (phase, done, total) を受け取る進捗通知。キャンセル時は例外を送出してよい。
+ProgressCallback = Callable[[str, int, int], None]
 
 
 def _load_exec_options(path: Path) -> Dict[str, Any]:
@@ -96,6 +172,7 @@ def _open_option_dialog(initial_options: Dict[str, Any]) -> Optional[Dict[str, A
         "width": tk.StringVar(value=str(initial_options.get("width", ""))),
         "height": tk.StringVar(value=str(initial_options.get("height", ""))),
         "watch_interval": tk.StringVar(value=str(initial_options.get("watch_interval", ""))),
+        "watch_max_interval": tk.StringVar(value=str(initial_options.get("watch_max_interval", ""))),
         "watch_debounce": tk.StringVar(value=str(initial_options.get("watch_debounce", ""))),
     }
 
@@ -160,7 +237,7 @@ def _open_option_dialog(initial_options: Dict[str, Any]) -> Optional[Dict[str, A
     ).grid(row=0, column=1, sticky="w", padx=(10, 0))
     ttk.Checkbutton(
         checks_frame,
-        text="PollingObserver を使用",
+        text="ポーリング監視を使用",
         variable=bool_fields["watch_polling"],
     ).grid(row=0, column=2, sticky="w", padx=(10, 0))
 
@@ -169,13 +246,18 @@ def _open_option_dialog(initial_options: Dict[str, Any]) -> Optional[Dict[str, A
         row=6, column=1, sticky="w", pady=2
     )
 
-    ttk.Label(main_frame, text="監視ディレイ (秒)").grid(row=7, column=0, sticky="w", pady=2)
-    ttk.Entry(main_frame, textvariable=string_fields["watch_debounce"], width=10).grid(
+    ttk.Label(main_frame, text="監視間隔の上限 (秒)").grid(row=7, column=0, sticky="w", pady=2)
+    ttk.Entry(main_frame, textvariable=string_fields["watch_max_interval"], width=10).grid(
         row=7, column=1, sticky="w", pady=2
     )
 
+    ttk.Label(main_frame, text="監視ディレイ (秒)").grid(row=8, column=0, sticky="w", pady=2)
+    ttk.Entry(main_frame, textvariable=string_fields["watch_debounce"], width=10).grid(
+        row=8, column=1, sticky="w", pady=2
+    )
+
     button_frame = ttk.Frame(main_frame)
-    button_frame.grid(row=8, column=0, columnspan=3, pady=(12, 0))
+    button_frame.grid(row=9, column=0, columnspan=3, pady=(12, 0))
 
     def on_submit():
         try:
@@ -187,9 +269,10 @@ def _open_option_dialog(initial_options: Dict[str, Any]) -> Optional[Dict[str, A
 
         try:
             watch_interval_value = float(string_fields["watch_interval"].get())
+            watch_max_interval_value = float(string_fields["watch_max_interval"].get())
             watch_debounce_value = float(string_fields["watch_debounce"].get())
         except ValueError:
-            messagebox.showerror("入力エラー", "監視間隔と監視ディレイには数値を入力してください。")
+            messagebox.showerror("入力エラー", "監視間隔・監視間隔の上限・監視ディレイには数値を入力してください。")
             return
 
         result.update(
@@ -204,6 +287,7 @@ def _open_option_dialog(initial_options: Dict[str, Any]) -> Optional[Dict[str, A
                 "no_watch": bool_fields["no_watch"].get(),
                 "watch_polling": bool_fields["watch_polling"].get(),
                 "watch_interval": watch_interval_value,
+                "watch_max_interval": watch_max_interval_value,
                 "watch_debounce": watch_debounce_value,
             }
         )
@@ -278,374 +362,2312 @@ def _format_priority(value: Any):
     return str(value)
 
 
-class TaskStore:
-    def __init__(self, excel_path: Path, sheet_name: str | None = None):
-        self.excel_path = excel_path
-        self._lock = threading.RLock()
-        self._meta_id_column = META_ID_COLUMN
-        self._df = pd.DataFrame(columns=TASK_COLUMNS + HIDDEN_META_COLUMNS)
-        self._column_order: List[str] = list(TASK_COLUMNS) + list(HIDDEN_META_COLUMNS)
-        self._statuses: List[str] = list(DEFAULT_STATUSES)
-        self._requested_sheet_name: str | None = (
-            sheet_name.strip() if isinstance(sheet_name, str) and sheet_name.strip() else None
-        )
-        self._sheet_name: str | None = self._requested_sheet_name
-        self._validations: Dict[str, List[str]] = {
-            key: list(values) for key, values in DEFAULT_VALIDATIONS.items()
-        }
-        self._last_saved_at: Optional[dt.datetime] = None
-        self._last_saved_mtime: Optional[float] = None
-        self._last_loaded_mtime: Optional[float] = None
-        self._dirty_row_ids: Set[str] = set()
-        self._deleted_row_ids: Set[str] = set()
-        self._last_saved_snapshot: pd.DataFrame = pd.DataFrame(columns=self._df.columns)
-        self.load_excel()
-
-    def load_excel(self):
-        with self._lock:
-            requested_sheet = self._requested_sheet_name
-            if not self.excel_path.exists():
-                df = pd.DataFrame(columns=TASK_COLUMNS)
-                df.to_excel(
-                    self.excel_path,
-                    index=False,
-                    sheet_name=requested_sheet or "Sheet1",
-                )
-
-            wb = load_workbook(self.excel_path, data_only=False)
-            if requested_sheet:
-                if requested_sheet in wb.sheetnames:
-                    sheet_name = requested_sheet
-                else:
-                    ws = wb.create_sheet(title=requested_sheet)
-                    ws.append(TASK_COLUMNS)
-                    wb.save(self.excel_path)
-                    sheet_name = requested_sheet
-            else:
-                sheet_name = wb.sheetnames[0]
-            ws = wb[sheet_name]
-            self._sheet_name = sheet_name
-            extracted = self._extract_validations(wb, ws)
-            validations: Dict[str, List[str]] = {
-                key: list(values) for key, values in DEFAULT_VALIDATIONS.items()
-            }
-            for column, values in extracted.items():
-                if not values:
-                    continue
-                validations[column] = list(values)
-            self._validations = validations
+def _map_distinct(series: pd.Series, fn: Callable[[Any], Any], missing: Any) -> List[Any]:
+    # 列の値を辞書化し、異なる値ごとに 1 回だけ fn を呼んでコードで展開する。
+    # セル単位の関数をそのまま使うため、出力はセル単位の変換と一致する。
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    table = np.empty(len(uniques) + 1, dtype=object)
+    for position, value in enumerate(uniques):
+        table[position] = fn(value)
+    table[-1] = missing
+    return table[codes].tolist()
 
-            df = pd.read_excel(
-                self.excel_path,
-                sheet_name=sheet_name,
-                engine="openpyxl",
-            )
 
-            if "No" in df.columns:
-                df = df.drop(columns=["No"])
+def _is_completed_status(value: Any) -> bool:
+    if _is_missing(value):
+        return False
+    return "".join(str(value).split()).lower() in DUE_COMPLETED_STATUSES
 
-            for col in TASK_COLUMNS:
-                if col not in df.columns:
-                    df[col] = pd.NA
 
-            extra_columns = [col for col in df.columns if col not in TASK_COLUMNS]
-            ordered_columns = TASK_COLUMNS + extra_columns
-            df = df[ordered_columns].copy()
+def _parse_due_text(text: str) -> Optional[dt.date]:
+    try:
+        return dt.date.fromisoformat(text) if text else None
+    except ValueError:
+        return None
 
-            df = df.dropna(how="all", subset=TASK_COLUMNS).reset_index(drop=True)
 
-            df["タスク"] = df["タスク"].apply(
-                lambda v: "" if pd.isna(v) else str(v).strip()
-            )
-            df = df[df["タスク"] != ""].reset_index(drop=True)
+def _due_state(due: dt.date, today: dt.date) -> Dict[str, Any]:
+    diff = (due - today).days
+    if diff < 0:
+        return {"level": "overdue", "diff": -diff, "label": f"{-diff}日超過"}
+    if diff == 0:
+        return {"level": "warning", "diff": 0, "label": "本日期限"}
+    level = "warning" if diff <= DUE_WARNING_DAYS else "normal"
+    return {"level": level, "diff": diff, "label": f"あと{diff}日"}
 
-            if "期限" in df.columns:
-                df["期限"] = pd.to_datetime(df["期限"], errors="coerce").dt.date
 
-            had_meta_column = self._meta_id_column in df.columns
+def _next_due_threshold(due: dt.date, today: dt.date) -> Optional[dt.date]:
+    # 次に期限状態 (normal → warning → overdue) が切り替わる日。超過済みなら None。
+    if (due - today).days > DUE_WARNING_DAYS:
+        return due - dt.timedelta(days=DUE_WARNING_DAYS)
+    if due >= today:
+        return due + dt.timedelta(days=1)
+    return None
 
-            df = self._ensure_row_ids(df)
-            persisted_mtime: Optional[float] = None
-            if not had_meta_column:
-                persisted_mtime = self._persist_row_ids_to_workbook(df)
-                if persisted_mtime is not None:
-                    self._last_saved_at = dt.datetime.now()
 
-            local_df = self._ensure_row_ids(self._df.copy())
+def _format_text_value(value: Any) -> str:
+    return str(value)
 
-            excel_columns = list(df.columns)
-            local_columns = list(local_df.columns)
-            all_columns = list(
-                dict.fromkeys(excel_columns + [col for col in local_columns if col not in excel_columns])
-            )
 
-            dirty_ids = set(self._dirty_row_ids)
-            deleted_ids = set(self._deleted_row_ids)
+def _format_priority_text(value: Any) -> str:
+    return str(_format_priority(value))
 
-            excel_row_ids: List[str] = []
-            excel_row_map: Dict[str, pd.Series] = {}
-            for _, excel_row in df.iterrows():
-                row_id = str(excel_row[self._meta_id_column])
-                excel_row_ids.append(row_id)
-                excel_row_map[row_id] = excel_row
 
-            local_row_map: Dict[str, pd.Series] = {}
-            for _, local_row in local_df.iterrows():
-                row_id = str(local_row[self._meta_id_column])
-                local_row_map[row_id] = local_row
+def _format_due_column(series: pd.Series) -> List[str]:
+    return _map_distinct(series, _to_iso_date_str, "")
 
-            merged_rows: List[pd.Series] = []
-            new_dirty_ids: Set[str] = set()
 
-            for row_id in excel_row_ids:
-                if row_id in deleted_ids:
-                    continue
-                if row_id in local_row_map and row_id in dirty_ids:
-                    source_row = local_row_map[row_id]
-                    new_dirty_ids.add(row_id)
-                else:
-                    source_row = excel_row_map[row_id]
-                merged_rows.append(source_row.reindex(all_columns))
+def _format_priority_column(series: pd.Series) -> List[Any]:
+    return _map_distinct(series, _format_priority, "")
 
-            for _, local_row in local_df.iterrows():
-                row_id = str(local_row[self._meta_id_column])
-                if row_id in deleted_ids or row_id in excel_row_map:
-                    continue
-                if row_id not in dirty_ids:
-                    continue
-                merged_rows.append(local_row.reindex(all_columns))
-                new_dirty_ids.add(row_id)
 
-            if merged_rows:
-                merged_df = pd.DataFrame(merged_rows)
-                merged_df = merged_df.reindex(columns=all_columns)
-            else:
-                merged_df = pd.DataFrame(columns=all_columns)
+def _sidecar_path_for(excel_path: Path, kind: str, key: Optional[str] = None) -> Path:
+    # 同じブックの複数シートを別ソースとして扱う場合は、シートごとに別ファイルにする。
+    infix = f".{key}" if key else ""
+    return excel_path.with_name(f"{excel_path.stem}{infix}.{kind}.jsonl")
 
-            new_excel_columns = [
-                col
-                for col in all_columns
-                if col in df.columns and col not in local_df.columns and col != self._meta_id_column
-            ]
-            for col in new_excel_columns:
-                merged_df[col] = merged_df[col].where(~merged_df[col].isna(), pd.NA)
 
-            merged_df = merged_df.dropna(how="all", subset=TASK_COLUMNS).reset_index(drop=True)
+def _normalize_wire_format(wire: Any) -> str:
+    text = str(wire or "").strip().lower()
+    return text if text in WIRE_FORMATS else "rows"
 
-            merged_df["タスク"] = merged_df["タスク"].apply(
-                lambda v: "" if pd.isna(v) else str(v).strip()
-            )
-            merged_df = merged_df[merged_df["タスク"] != ""].reset_index(drop=True)
 
-            if "期限" in merged_df.columns:
-                merged_df["期限"] = pd.to_datetime(merged_df["期限"], errors="coerce").dt.date
+def _normalize_task_fields(fields: Any) -> Optional[List[str]]:
+    # タスクとして返す列の指定。None / 空 / "*" は全列。No は常に付く。
+    # 列名の配列かカンマ区切りの文字列を受け付け、TASK_COLUMNS の順に並べ直す。
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        if fields.strip() in ("", "*"):
+            return None
+        fields = fields.split(",")
+    wanted = {str(name).strip() for name in fields}
+    unknown = wanted - set(TASK_COLUMNS) - {"No", ""}
+    if unknown:
+        raise ValueError(f"存在しない列が指定されました: {', '.join(sorted(unknown))}")
+    selected = [col for col in TASK_COLUMNS if col in wanted]
+    return None if len(selected) == len(TASK_COLUMNS) else selected
 
-            extra_columns = [col for col in merged_df.columns if col not in TASK_COLUMNS]
-            ordered_columns = TASK_COLUMNS + extra_columns
-            merged_df = merged_df[ordered_columns]
-            self._column_order = ordered_columns
 
-            self._df = merged_df
-            self._dirty_row_ids = new_dirty_ids
-            excel_id_set = set(excel_row_ids)
-            self._deleted_row_ids = {row_id for row_id in deleted_ids if row_id in excel_id_set}
+def _wire_day_number(text: str) -> Any:
+    if not text:
+        return None
+    try:
+        return (dt.date.fromisoformat(text) - WIRE_EPOCH).days
+    except ValueError:
+        return text
+
+
+def _encode_wire_column(values: List[Any]) -> Dict[str, Any]:
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    if len(uniques) * 2 > len(values):
+        return {"type": "plain", "values": values}
+    return {
+        "type": "dict",
+        "values": [_export_value(value) for value in uniques],
+        "codes": codes.tolist(),
+    }
 
-            self._last_saved_snapshot = df.reindex(columns=all_columns).copy(deep=True)
-            self._last_saved_snapshot = self._last_saved_snapshot.where(
-                ~self._last_saved_snapshot.isna(), pd.NA
-            )
 
-            if self._validations.get("ステータス"):
-                base = list(self._validations["ステータス"])
-                extras = [
-                    s
-                    for s in self._df["ステータス"].dropna().astype(str).tolist()
-                    if s and s not in base
-                ]
-                self._statuses = base + extras
-            else:
-                self._rebuild_statuses_from_df(self._df)
-            mtime = persisted_mtime if persisted_mtime is not None else self._get_file_mtime()
-            self._last_loaded_mtime = mtime
-            if persisted_mtime is not None:
-                self._last_saved_mtime = mtime
-            elif self._last_saved_mtime is None:
-                self._last_saved_mtime = self._last_loaded_mtime
+def _encode_columnar_table(count: int, columns: Dict[str, List[Any]]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"No": {"type": "range", "start": 1}}
+    for col, values in columns.items():
+        if col == "期限":
+            data[col] = {"type": "days", "values": _map_distinct(pd.Series(values, dtype=object), _wire_day_number, None)}
+        else:
+            data[col] = _encode_wire_column(values)
+    return {"count": count, "columns": ["No"] + list(columns), "data": data}
 
-    def _generate_row_id(self) -> str:
-        return uuid.uuid4().hex
 
-    def _ensure_meta_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        if self._meta_id_column not in df.columns:
-            df[self._meta_id_column] = pd.NA
-        return df
+def _journal_path_for(excel_path: Path, key: Optional[str] = None) -> Path:
+    return _sidecar_path_for(excel_path, "journal", key)
 
-    def _ensure_row_ids(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = self._ensure_meta_columns(df.copy())
-        for idx, value in df[self._meta_id_column].items():
-            if value is None or (isinstance(value, str) and not value.strip()) or pd.isna(value):
-                df.at[idx, self._meta_id_column] = self._generate_row_id()
-            else:
-                df.at[idx, self._meta_id_column] = str(value).strip()
-        return df
 
-    def _persist_row_ids_to_workbook(self, df: pd.DataFrame) -> Optional[float]:
-        sheet_name = self._sheet_name
-        if not sheet_name:
+def _encode_journal_value(col_name: str, value: Any):
+    if col_name == "期限":
+        text = _to_iso_date_str(value)
+        return text or None
+    if col_name == "優先度":
+        formatted = _format_priority(value)
+        return None if formatted == "" else formatted
+    if value is None or value is pd.NA:
+        return None
+    try:
+        if pd.isna(value):
             return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _decode_journal_value(col_name: str, value: Any):
+    if col_name == "期限":
+        return _from_iso_date_str(value or "")
+    if col_name == "優先度":
+        return _normalize_priority(value)
+    return "" if value is None else str(value)
+
+
+def _fsync_file(fp) -> None:
+    fp.flush()
+    # fdatasync はメタデータ (atime 等) の同期を省略できるため、利用可能なら優先する。
+    sync = getattr(os, "fdatasync", None) or os.fsync
+    sync(fp.fileno())
+
+
+class OperationJournal:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fp = None
+        self._size_bytes = self._stat_size()
+        self._first_pending_at: Optional[float] = time.monotonic() if self._size_bytes else None
+
+    def _stat_size(self) -> int:
         try:
-            wb = load_workbook(self.excel_path)
+            return self.path.stat().st_size
         except FileNotFoundError:
-            return None
-        if sheet_name not in wb.sheetnames:
-            wb.close()
-            return None
-        ws = wb[sheet_name]
-
-        header_row = list(next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()))
-        id_col_idx: Optional[int] = None
-        for idx, value in enumerate(header_row, start=1):
-            if isinstance(value, str) and value == self._meta_id_column:
-                id_col_idx = idx
-                break
+            return 0
 
-        changes_made = False
-        if id_col_idx is None:
-            id_col_idx = len(header_row) + 1 if header_row else 1
-            ws.cell(row=1, column=id_col_idx, value=self._meta_id_column)
-            changes_made = True
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
 
-        header_map: Dict[str, int] = {}
-        for col_idx in range(1, ws.max_column + 1):
-            header_value = ws.cell(row=1, column=col_idx).value
-            if isinstance(header_value, str):
-                header_map[header_value] = col_idx
+    @property
+    def first_pending_at(self) -> Optional[float]:
+        return self._first_pending_at
 
-        column_letter = get_column_letter(id_col_idx)
-        if ws.column_dimensions[column_letter].hidden is not True:
-            ws.column_dimensions[column_letter].hidden = True
-            changes_made = True
+    def has_records(self) -> bool:
+        return self._size_bytes > 0
 
-        id_values = [str(value) for value in df[self._meta_id_column].tolist()]
-        task_col_idx = header_map.get("タスク")
-        id_index = 0
-        for row_idx in range(2, ws.max_row + 1):
-            if id_index >= len(id_values):
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        data = line.encode("utf-8")
+        with self._lock:
+            if self._fp is None:
+                self._fp = self.path.open("ab")
+            self._fp.write(data)
+            _fsync_file(self._fp)
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            self._size_bytes += len(data)
+
+    def read_records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            try:
+                raw = self.path.read_bytes()
+            except FileNotFoundError:
+                return []
+        records: List[Dict[str, Any]] = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                # 書き込み途中でクラッシュした末尾行は破棄する。
                 break
-            if task_col_idx is not None:
-                task_cell = ws.cell(row=row_idx, column=task_col_idx).value
-                task_text = "" if task_cell is None else str(task_cell).strip()
-                if not task_text:
-                    continue
-            ws.cell(row=row_idx, column=id_col_idx).value = id_values[id_index]
-            id_index += 1
-            changes_made = True
+            if isinstance(record, dict):
+                records.append(record)
+        return records
 
-        if not changes_made:
-            wb.close()
-            return None
+    def truncate(self) -> None:
+        with self._lock:
+            self._close_locked()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            self._size_bytes = 0
+            self._first_pending_at = None
 
-        wb.save(self.excel_path)
-        try:
-            return self._get_file_mtime()
-        finally:
+    def _close_locked(self) -> None:
+        if self._fp is not None:
             try:
-                wb.close()
-            except Exception:
+                self._fp.close()
+            except OSError:
                 pass
+            self._fp = None
 
-    def _get_row_id_at_index(self, row_index: int) -> str:
-        self._df = self._ensure_meta_columns(self._df)
-        value = self._df.at[row_index, self._meta_id_column]
-        if value is None or (isinstance(value, str) and not value.strip()) or pd.isna(value):
-            new_id = self._generate_row_id()
-            self._df.at[row_index, self._meta_id_column] = new_id
-            return new_id
-        return str(value).strip()
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
 
-    def _get_file_mtime(self) -> Optional[float]:
+
+def _change_log_path_for(excel_path: Path, key: Optional[str] = None) -> Path:
+    return _sidecar_path_for(excel_path, "changes", key)
+
+
+def _fingerprints_match(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> bool:
+    if not left or not right:
+        return False
+    try:
+        return int(left["size"]) == int(right["size"]) and abs(
+            float(left["mtime"]) - float(right["mtime"])
+        ) < 0.5
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def _file_fingerprint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+class ChangeLog:
+    def __init__(self, path: Path, instance_id: str, *, max_bytes: int = 1024 * 1024):
+        self.path = path
+        self.instance_id = instance_id
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._seq = 0
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    def _read_from(self, offset: int) -> bytes:
         try:
-            return self.excel_path.stat().st_mtime
+            with self.path.open("rb") as fp:
+                fp.seek(offset)
+                return fp.read()
         except FileNotFoundError:
-            return None
+            return b""
 
-    def get_last_saved_markers(self) -> Tuple[Optional[dt.datetime], Optional[float]]:
+    def seek_to_end(self) -> None:
+        with self._lock:
+            raw = self._read_from(0)
+            self._offset = len(raw)
+            for line in reversed(raw.splitlines()):
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("seq"), int):
+                    self._seq = max(self._seq, record["seq"])
+                    break
+
+    def append_batch(self, records: List[Dict[str, Any]], fingerprint: Optional[Dict[str, Any]]) -> int:
+        with self._lock:
+            seq = self._seq + 1
+            lines = [
+                json.dumps(
+                    {"seq": seq, "instance": self.instance_id, **record},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+                for record in records
+            ]
+            lines.append(
+                json.dumps(
+                    {
+                        "seq": seq,
+                        "instance": self.instance_id,
+                        "op": "commit",
+                        "fingerprint": fingerprint,
+                    },
+                    separators=(",", ":"),
+                )
+            )
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            try:
+                current_size = self.path.stat().st_size
+            except FileNotFoundError:
+                current_size = 0
+            mode = "ab"
+            if self.max_bytes and current_size + len(data) > self.max_bytes:
+                # ローテーションすると他インスタンスは読み取り位置を失い、全再解析に切り替わる。
+                mode = "wb"
+                self._offset = 0
+            # バッチは 1 回の write で追記し、他インスタンスの書き込みと混ざりにくくする。
+            with self.path.open(mode) as fp:
+                fp.write(data)
+                _fsync_file(fp)
+            self._seq = seq
+            return seq
+
+    def read_new_batches(self) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size < self._offset:
+                self._offset = size
+                return None
+            raw = self._read_from(self._offset)
+            batches: List[Dict[str, Any]] = []
+            pending: List[Dict[str, Any]] = []
+            consumed = 0
+            position = 0
+            for line in raw.splitlines(keepends=True):
+                position += len(line)
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    return None
+                if not isinstance(record, dict):
+                    continue
+                if isinstance(record.get("seq"), int):
+                    self._seq = max(self._seq, record["seq"])
+                if record.get("op") == "commit":
+                    batches.append(
+                        {
+                            "seq": record.get("seq"),
+                            "instance": record.get("instance"),
+                            "fingerprint": record.get("fingerprint"),
+                            "records": pending,
+                        }
+                    )
+                    pending = []
+                    consumed = position
+                else:
+                    pending.append(record)
+            # コミット行が揃っていないバッチは次回に持ち越す。
+            self._offset += consumed
+            return batches
+
+
+# 元に戻す操作の通し番号。複数ソースのボードでどのソースの操作が最新かを比べるのに使う。
+_UNDO_SEQUENCE = itertools.count(1)
+
+
+def _undo_entry_size(entry: Dict[str, Any]) -> int:
+    return len(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def _suggest_key(value: Any) -> str:
+    # 全角・半角や大文字・小文字の違いを吸収して前方一致を判定する。
+    return unicodedata.normalize("NFKC", str(value or "")).strip().casefold()
+
+
+class CompletionIndex:
+    # 1 列分の入力候補。値ごとの使用行数と入力規則の有無を持ち、正規化したキーで
+    # ソートした一覧を二分探索して前方一致の範囲を取り出す。
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._validated: Set[str] = set()
+        self._keys: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _insert(self, value: str):
+        entry = (_suggest_key(value), value)
+        pos = bisect.bisect_left(self._keys, entry)
+        if pos == len(self._keys) or self._keys[pos] != entry:
+            self._keys.insert(pos, entry)
+
+    def _discard(self, value: str):
+        if self._counts.get(value) or value in self._validated:
+            return
+        entry = (_suggest_key(value), value)
+        pos = bisect.bisect_left(self._keys, entry)
+        if pos < len(self._keys) and self._keys[pos] == entry:
+            del self._keys[pos]
+
+    def reset(self, counts: Dict[str, int], validated: Iterable[str]):
+        self._counts = {value: int(count) for value, count in counts.items() if value and count > 0}
+        self._validated = {value for value in validated if value}
+        values = set(self._counts) | self._validated
+        self._keys = sorted((_suggest_key(value), value) for value in values)
+
+    def set_validated(self, validated: Iterable[str]):
+        previous = self._validated
+        self._validated = {value for value in validated if value}
+        for value in self._validated - previous:
+            self._insert(value)
+        for value in previous - self._validated:
+            self._discard(value)
+
+    def add(self, value: str):
+        if not value:
+            return
+        count = self._counts.get(value, 0)
+        self._counts[value] = count + 1
+        if count == 0 and value not in self._validated:
+            self._insert(value)
+
+    def remove(self, value: str):
+        count = self._counts.get(value, 0)
+        if count <= 0:
+            return
+        if count == 1:
+            del self._counts[value]
+            self._discard(value)
+        else:
+            self._counts[value] = count - 1
+
+    def matches(self, prefix: str) -> List[Dict[str, Any]]:
+        # 前方一致する値をすべて返す。並べ替えと件数の切り詰めは呼び出し側で行う。
+        key = _suggest_key(prefix)
+        start = bisect.bisect_left(self._keys, (key, ""))
+        matches: List[Dict[str, Any]] = []
+        for entry_key, value in self._keys[start:]:
+            if not entry_key.startswith(key):
+                break
+            matches.append(
+                {
+                    "value": value,
+                    "count": self._counts.get(value, 0),
+                    "validated": value in self._validated,
+                }
+            )
+        return matches
+
+    def suggest(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        return _rank_suggestions(self.matches(prefix), _suggest_key(prefix), limit)
+
+
+def _rank_suggestions(matches: List[Dict[str, Any]], key: str, limit: int) -> List[Dict[str, Any]]:
+    # 完全一致 → 使用行数の多い順 → 入力規則にある値 → 読みの順で並べる。
+    return heapq.nsmallest(
+        limit,
+        matches,
+        key=lambda match: (
+            _suggest_key(match["value"]) != key,
+            -match["count"],
+            not match["validated"],
+            _suggest_key(match["value"]),
+        ),
+    )
+
+
+def _flow_history_path_for(excel_path: Path, key: Optional[str] = None) -> Path:
+    return _sidecar_path_for(excel_path, "analytics", key)
+
+
+def _parse_history_date(value: Any, label: str) -> Optional[dt.date]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    try:
+        return dt.date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        raise ValueError(f"{label}の日付が不正です: {value}") from None
+
+
+class FlowHistory:
+    # 日ごとのステータス別・担当者別の件数を追記専用の JSONL に残す。
+    # 行ごとの (ステータス, 担当者) を覚えておき、変更のあった行だけで件数を増減するので、
+    # 記録のたびに表全体や過去のブックを数え直すことはない。
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._days: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._dates: List[str] = []
+        self._lines = 0
+        self.backfilled = False
+        self._rows: Dict[str, Tuple[str, str]] = {}
+        self._counts: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+        self._load()
+
+    def _load(self):
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        for line in raw.splitlines():
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if not isinstance(record, dict):
+                continue
+            self._lines += 1
+            if record.get("op") == "backfill":
+                self.backfilled = True
+            elif isinstance(record.get("date"), str):
+                self._store_day(record["date"], record)
+
+    def _store_day(self, day: str, record: Dict[str, Any]):
+        if day not in self._days:
+            bisect.insort(self._dates, day)
+        self._days[day] = {
+            "status": dict(record.get("status") or {}),
+            "assignee": dict(record.get("assignee") or {}),
+        }
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    @property
+    def first_date(self) -> Optional[str]:
+        with self._lock:
+            return self._dates[0] if self._dates else None
+
+    def _shift(self, values: Tuple[str, str], step: int):
+        for counts, value in zip(self._counts, values):
+            count = counts.get(value, 0) + step
+            if count > 0:
+                counts[value] = count
+            else:
+                counts.pop(value, None)
+
+    def reset(self, rows: Dict[str, Tuple[str, str]]):
+        with self._lock:
+            self._rows = {}
+            self._counts = ({}, {})
+            for row_id, values in rows.items():
+                self._rows[row_id] = values
+                self._shift(values, 1)
+
+    def update(self, rows: Dict[str, Tuple[str, str]]):
+        with self._lock:
+            for row_id, values in rows.items():
+                previous = self._rows.get(row_id)
+                if previous == values:
+                    continue
+                if previous is not None:
+                    self._shift(previous, -1)
+                self._shift(values, 1)
+                self._rows[row_id] = values
+
+    def retain(self, alive: Set[str]):
+        with self._lock:
+            for row_id in [row_id for row_id in self._rows if row_id not in alive]:
+                self._shift(self._rows.pop(row_id), -1)
+
+    def _append_locked(self, records: List[Dict[str, Any]]):
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+        )
+        # 集計は作業の記録ではないため fsync は省く。最悪でも直近の 1 行を失うだけで済む。
+        with self.path.open("a", encoding="utf-8") as fp:
+            fp.write(data)
+        self._lines += len(records)
+        if self._lines > len(self._days) * 2 + FLOW_HISTORY_COMPACT_SLACK:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        # 同じ日の行は最後のものだけが有効なので、1 日 1 行に詰め直す。
+        records = [{"date": day, **self._days[day]} for day in self._dates]
+        if self.backfilled:
+            records.append({"op": "backfill"})
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fp:
+            for record in records:
+                fp.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+        self._lines = len(records)
+
+    def record(self, day: str) -> bool:
+        with self._lock:
+            snapshot = {"status": dict(self._counts[0]), "assignee": dict(self._counts[1])}
+            if self._days.get(day) == snapshot:
+                return False
+            self._store_day(day, snapshot)
+            try:
+                self._append_locked([{"date": day, **snapshot}])
+            except OSError as exc:
+                print(f"[kanban] Failed to record flow history: {exc}")
+            return True
+
+    def missing_dates(self, dates: Iterable[str]) -> List[str]:
+        with self._lock:
+            return [day for day in dates if day not in self._days]
+
+    def merge_backfill(self, days: Dict[str, Dict[str, Dict[str, int]]]) -> int:
+        # 記録済みの日はその日の実際の操作に基づくため、バックアップの値で上書きしない。
+        with self._lock:
+            added = [day for day in sorted(days) if day not in self._days]
+            for day in added:
+                self._store_day(day, days[day])
+            self.backfilled = True
+            self._append_locked([{"date": day, **days[day]} for day in added] + [{"op": "backfill"}])
+            return len(added)
+
+    def snapshots(self, start: dt.date, end: dt.date) -> List[Dict[str, Dict[str, int]]]:
+        # start..end の各日の件数。記録の無い日は直前に記録された日の値を引き継ぐ。
+        with self._lock:
+            result: List[Dict[str, Dict[str, int]]] = []
+            pos = bisect.bisect_right(self._dates, start.isoformat()) - 1
+            empty: Dict[str, Dict[str, int]] = {"status": {}, "assignee": {}}
+            for offset in range((end - start).days + 1):
+                day = (start + dt.timedelta(days=offset)).isoformat()
+                while pos + 1 < len(self._dates) and self._dates[pos + 1] <= day:
+                    pos += 1
+                result.append(self._days[self._dates[pos]] if pos >= 0 else empty)
+            return result
+
+
+def _resolve_history_range(start: Any, end: Any, first_date: Optional[str]) -> Tuple[dt.date, dt.date]:
+    today = dt.date.today()
+    end_date = _parse_history_date(end, "終了日") or today
+    start_date = _parse_history_date(start, "開始日") or (
+        min(dt.date.fromisoformat(first_date), end_date) if first_date else end_date
+    )
+    if start_date > end_date:
+        raise ValueError("開始日が終了日より後になっています。")
+    if (end_date - start_date).days + 1 > FLOW_HISTORY_RANGE_MAX_DAYS:
+        raise ValueError(f"集計期間は {FLOW_HISTORY_RANGE_MAX_DAYS} 日以内で指定してください。")
+    return start_date, end_date
+
+
+def _build_flow_series(
+    start: dt.date, snapshots: List[Dict[str, Dict[str, int]]], statuses: List[str]
+) -> Dict[str, Any]:
+    # 累積フロー図と残件数 (バーンダウン) 用に、名前ごとの日別系列へ並べ替える。
+    status_names = {name for snap in snapshots for name in snap["status"]}
+    ordered = [name for name in statuses if name in status_names]
+    ordered += sorted(status_names - set(ordered))
+    assignees = sorted({name for snap in snapshots for name in snap["assignee"]})
+    totals = [sum(snap["status"].values()) for snap in snapshots]
+    completed = [
+        sum(count for name, count in snap["status"].items() if _is_completed_status(name))
+        for snap in snapshots
+    ]
+    return {
+        "start": start.isoformat(),
+        "end": (start + dt.timedelta(days=max(0, len(snapshots) - 1))).isoformat(),
+        "dates": [(start + dt.timedelta(days=i)).isoformat() for i in range(len(snapshots))],
+        "statuses": ordered,
+        "status": {name: [snap["status"].get(name, 0) for snap in snapshots] for name in ordered},
+        "assignees": assignees,
+        "assignee": {name: [snap["assignee"].get(name, 0) for snap in snapshots] for name in assignees},
+        "total": totals,
+        "completed": completed,
+        "remaining": [total - done for total, done in zip(totals, completed)],
+    }
+
+
+def _find_backup_workbooks(excel_path: Path, directories: Iterable[Path]) -> Dict[str, Path]:
+    # save_excel が作る {stem}.bak_YYYYmmdd_HHMMSS{suffix} を日ごとに探し、その日最後のものを使う。
+    latest: Dict[str, Tuple[str, Path]] = {}
+    seen: Set[Path] = set()
+    for directory in directories:
+        directory = Path(directory)
+        if directory in seen or not directory.is_dir():
+            continue
+        seen.add(directory)
+        for path in directory.glob(f"{excel_path.stem}.bak_*{excel_path.suffix}"):
+            match = BACKUP_STAMP_PATTERN.search(path.stem)
+            if match is None or match.group(0) != path.stem[len(excel_path.stem):]:
+                continue
+            try:
+                day = dt.datetime.strptime(match.group(1), "%Y%m%d").date().isoformat()
+            except ValueError:
+                continue
+            stamp = match.group(1) + match.group(2)
+            if day not in latest or latest[day][0] < stamp:
+                latest[day] = (stamp, path)
+    return {day: path for day, (_stamp, path) in latest.items()}
+
+
+def _count_backup_workbook(path: Path, sheet_name: Optional[str]) -> Dict[str, Dict[str, int]]:
+    # バックアップは補完で一度だけ読む。必要な 2 列だけを取り出す。
+    wanted = ("ステータス", "担当者")
+    try:
+        df = pd.read_excel(
+            path, sheet_name=sheet_name or 0, engine="openpyxl", usecols=lambda col: col in wanted
+        )
+    except ValueError:
+        if not sheet_name:
+            raise
+        df = pd.read_excel(path, sheet_name=0, engine="openpyxl", usecols=lambda col: col in wanted)
+    result: Dict[str, Dict[str, int]] = {}
+    for key, col in (("status", "ステータス"), ("assignee", "担当者")):
+        values = df[col] if col in df.columns else pd.Series([""] * len(df), dtype=object)
+        labels = pd.Series(
+            ["" if _is_missing(value) else str(value).strip() for value in values.tolist()],
+            dtype=object,
+        )
+        result[key] = {str(name): int(count) for name, count in labels.value_counts().items()}
+    return result
+
+
+def _extract_validation_columns(wb, ws) -> Dict[int, List[str]]:
+    # 入力規則を列番号ごとのリスト値へ解決する。見出しとの対応付けは呼び出し側で行う。
+    columns: Dict[int, List[str]] = {}
+    dv_list = getattr(ws, "data_validations", None)
+    if not dv_list:
+        return columns
+
+    resolved: Dict[str, List[str]] = {}
+    max_column = ws.max_column
+    for dv in getattr(dv_list, "dataValidation", []) or []:
+        if dv.type != "list":
+            continue
+        formula = (dv.formula1 or "").strip()
+        if formula not in resolved:
+            resolved[formula] = _resolve_validation_values(wb, ws, formula)
+        values = resolved[formula]
+        if not values:
+            continue
+        try:
+            ranges = list(dv.ranges)
+        except TypeError:
+            ranges = []
+        for cell_range in ranges:
+            min_col, _min_row, max_col, _max_row = range_boundaries(str(cell_range))
+            # A:XFD のような範囲でも、見出しのある列より先は見ない。
+            for col_idx in range(min_col or 1, min(max_col or max_column, max_column) + 1):
+                columns[col_idx] = list(values)
+    return columns
+
+
+def _validations_for_headers(columns: Dict[int, List[str]], headers: List[Any]) -> Dict[str, List[str]]:
+    validations: Dict[str, List[str]] = {}
+    for col_idx, values in columns.items():
+        if col_idx > len(headers):
+            continue
+        header = headers[col_idx - 1]
+        if isinstance(header, str) and header in TASK_COLUMNS:
+            validations[header] = list(values)
+    return validations
+
+
+def _split_validation_reference(formula: str, default_sheet: str) -> Optional[Tuple[str, str]]:
+    # openpyxl で書いた規則は "=" 付き、Excel で保存した規則は "=" なしで読まれる。
+    target = formula[1:] if formula.startswith("=") else formula
+    if not target or target.startswith('"'):
+        return None
+    sheet_name = default_sheet
+    range_part = target
+    if "!" in target:
+        sheet_part, range_part = target.rsplit("!", 1)
+        sheet_name = sheet_part.strip()
+        if sheet_name.startswith("'") and sheet_name.endswith("'"):
+            sheet_name = sheet_name[1:-1].replace("''", "'")
+    return sheet_name, range_part.strip()
+
+
+def _resolve_validation_values(wb, ws, formula: str) -> List[str]:
+    if not formula:
+        return []
+    if formula.startswith('"') and formula.endswith('"'):
+        content = formula[1:-1]
+        parts = [p.replace('""', '"').strip() for p in content.split(",")]
+        return [p for p in parts if p]
+    reference = _split_validation_reference(formula, ws.title)
+    if reference is None:
+        return []
+    sheet_name, range_part = reference
+    try:
+        target_ws = wb[sheet_name]
+        min_col, min_row, max_col, max_row = range_boundaries(range_part)
+    except (KeyError, ValueError):
+        # 名前付き範囲などは解決しない。
+        return []
+    # $A:$A のような列全体の参照は、使用中の範囲までに切り詰める。
+    max_row = min(max_row or target_ws.max_row, target_ws.max_row)
+    max_col = min(max_col or target_ws.max_column, target_ws.max_column)
+    values: List[str] = []
+    seen: Set[str] = set()
+    for row in target_ws.iter_rows(
+        min_row=min_row or 1,
+        max_row=max_row,
+        min_col=min_col or 1,
+        max_col=max_col,
+        values_only=True,
+    ):
+        for value in row:
+            if value is None:
+                continue
+            text = str(value).strip()
+            if text and text not in seen:
+                seen.add(text)
+                values.append(text)
+    return values
+
+
+def _workbook_sheet_parts(archive: zipfile.ZipFile) -> Dict[str, str]:
+    ns_main = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    ns_rel = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+    ns_pkg = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+    targets: Dict[str, str] = {}
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{ns_pkg}Relationship"):
+        target = rel.get("Target") or ""
+        targets[rel.get("Id") or ""] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    parts: Dict[str, str] = {}
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    for sheet in workbook.iter(f"{ns_main}sheet"):
+        part = targets.get(sheet.get(f"{ns_rel}id") or "")
+        if part:
+            parts[sheet.get("name") or ""] = part
+    return parts
+
+
+_SHARED_STRING_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*?\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</(?:\w+:)?v>')
+
+
+def _shared_strings_part(archive: zipfile.ZipFile) -> Optional[str]:
+    ns_pkg = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{ns_pkg}Relationship"):
+        if (rel.get("Type") or "").endswith("/sharedStrings"):
+            target = rel.get("Target") or ""
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    return None
+
+
+def _shared_string_values(archive: zipfile.ZipFile, part: str, indexes: Set[int]) -> Dict[int, str]:
+    # 必要な番号の文字列だけを取り出す。最大の番号を過ぎたら読むのをやめる。
+    ns_main = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    values: Dict[int, str] = {}
+    last = max(indexes)
+    position = 0
+    with archive.open(part) as fp:
+        for _event, element in ET.iterparse(fp):
+            if element.tag != f"{ns_main}si":
+                continue
+            if position in indexes:
+                values[position] = "".join(node.text or "" for node in element.iter(f"{ns_main}t"))
+            element.clear()
+            position += 1
+            if position > last:
+                break
+    return values
+
+
+def _validation_fingerprint(excel_path: Path, requested_sheet: Optional[str]) -> Optional[Tuple[str, str]]:
+    # ブックを openpyxl で開かずに、入力規則の定義と参照先シートの内容から指紋を作る。
+    # 参照先シートは zip の CRC とサイズだけを見るため、タスクだけの編集では変わらない。
+    # Excel が保存したブックでは値が共有文字列 (sharedStrings.xml) にあり、値を同じ位置で
+    # 書き換えてもシートは変わらないため、参照先シートが使う共有文字列の値も指紋に含める。
+    # 判断できない形式の場合は None を返し、従来どおり解析させる。
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            parts = _workbook_sheet_parts(archive)
+            sheet_name = requested_sheet or next(iter(parts), None)
+            if sheet_name is None or sheet_name not in parts:
+                return None
+            xml = archive.read(parts[sheet_name])
+            begin = xml.find(b"<dataValidations")
+            if begin < 0:
+                if b"dataValidations" in xml:
+                    return None
+                return sheet_name, hashlib.sha1(b"").hexdigest()
+            end = xml.find(b"</dataValidations>", begin)
+            if end < 0:
+                return None
+            block = xml[begin : end + len(b"</dataValidations>")]
+            digest = hashlib.sha1(block)
+            shared_indexes: Set[int] = set()
+            for node in ET.fromstring(block).iter("formula1"):
+                reference = _split_validation_reference((node.text or "").strip(), sheet_name)
+                if reference is None:
+                    continue
+                try:
+                    range_boundaries(reference[1])
+                except ValueError:
+                    return None
+                part = parts.get(reference[0])
+                if part is None:
+                    digest.update(f"missing:{reference[0]}".encode("utf-8"))
+                    continue
+                info = archive.getinfo(part)
+                digest.update(f"{reference[0]}:{info.CRC}:{info.file_size}".encode("utf-8"))
+                shared_indexes.update(int(index) for index in _SHARED_STRING_CELL.findall(archive.read(part)))
+            if shared_indexes:
+                strings_part = _shared_strings_part(archive)
+                if strings_part is None:
+                    return None
+                values = _shared_string_values(archive, strings_part, shared_indexes)
+                digest.update(
+                    json.dumps(sorted(values.items()), ensure_ascii=False).encode("utf-8")
+                )
+            return sheet_name, digest.hexdigest()
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return None
+
+
+# 解析ワーカーは再読込の間も生き続けるため、プロセス内に解決済みの入力規則を保持する。
+_VALIDATION_CACHE: Dict[Tuple[str, str], Tuple[str, Dict[int, List[str]]]] = {}
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+
+def _cached_validation_columns(excel_path: Path, sheet_name: str, fingerprint: str) -> Optional[Dict[int, List[str]]]:
+    with _VALIDATION_CACHE_LOCK:
+        entry = _VALIDATION_CACHE.get((str(excel_path), sheet_name))
+    if entry is None or entry[0] != fingerprint:
+        return None
+    return entry[1]
+
+
+def _store_validation_columns(excel_path: Path, sheet_name: str, fingerprint: str, columns: Dict[int, List[str]]):
+    with _VALIDATION_CACHE_LOCK:
+        _VALIDATION_CACHE.pop((str(excel_path), sheet_name), None)
+        while len(_VALIDATION_CACHE) >= VALIDATION_CACHE_MAX:
+            _VALIDATION_CACHE.pop(next(iter(_VALIDATION_CACHE)))
+        _VALIDATION_CACHE[(str(excel_path), sheet_name)] = (fingerprint, columns)
+
+
+def _archive_sheet_name_for(sheet_name: str) -> str:
+    # Excel のシート名は 31 文字まで。
+    return f"{sheet_name[: 31 - len(ARCHIVE_SHEET_SUFFIX)]}{ARCHIVE_SHEET_SUFFIX}"
+
+
+def _parse_workbook_columnar(excel_path: str, requested_sheet: Optional[str]) -> Dict[str, Any]:
+    # ワーカープロセスで実行される。openpyxl オブジェクトは返さず、列ごとの
+    # プレーンな値リストだけを返す。
+    path = Path(excel_path)
+    if not path.exists():
+        pd.DataFrame(columns=TASK_COLUMNS).to_excel(
+            path,
+            index=False,
+            sheet_name=requested_sheet or "Sheet1",
+        )
+
+    fingerprint = _validation_fingerprint(path, requested_sheet)
+    validation_columns = None
+    if fingerprint is not None:
+        sheet_name = fingerprint[0]
+        validation_columns = _cached_validation_columns(path, sheet_name, fingerprint[1])
+    if validation_columns is None:
+        wb = load_workbook(path, data_only=False)
+        try:
+            if requested_sheet:
+                if requested_sheet not in wb.sheetnames:
+                    created = wb.create_sheet(title=requested_sheet)
+                    created.append(TASK_COLUMNS)
+                    wb.save(path)
+                    fingerprint = None
+                sheet_name = requested_sheet
+            else:
+                sheet_name = wb.sheetnames[0]
+            validation_columns = _extract_validation_columns(wb, wb[sheet_name])
+        finally:
+            wb.close()
+        if fingerprint is not None:
+            _store_validation_columns(path, sheet_name, fingerprint[1], validation_columns)
+
+    file_fingerprint = _file_fingerprint(path)
+    mtime = file_fingerprint["mtime"] if file_fingerprint else path.stat().st_mtime
+    df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
+    columns = list(df.columns)
+    validations = _validations_for_headers(validation_columns, columns)
+    data: Dict[str, List[Any]] = {}
+    for col in columns:
+        data[col] = [None if _is_missing(value) else value for value in df[col].tolist()]
+    return {
+        "sheet_name": sheet_name,
+        "validations": validations,
+        "columns": columns,
+        "data": data,
+        "mtime": mtime,
+        "fingerprint": file_fingerprint,
+    }
+
+
+def _parse_workbook_sheets(excel_path: str, sheets: List[Optional[str]]) -> List[Dict[str, Any]]:
+    # 同じブックのシートは 1 つのワーカーで順に解析し、シート作成時の書き込み競合を避ける。
+    return [_parse_workbook_columnar(excel_path, sheet) for sheet in sheets]
+
+
+def _parse_source_spec(spec: str) -> Tuple[Path, Optional[str]]:
+    text = str(spec).strip()
+    path_text, sep, sheet = text.rpartition("#")
+    if not sep:
+        path_text, sheet = text, ""
+    return Path(path_text).expanduser().resolve(), (sheet.strip() or None)
+
+
+def _iter_import_chunks(path: Path, chunk_size: int, sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    # 取り込み元を一定行数ずつ読み、全体をメモリに載せない。
+    suffix = path.suffix.lower()
+    if suffix in (".csv", ".txt"):
+        for chunk in pd.read_csv(
+            path,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=chunk_size,
+            encoding="utf-8-sig",
+        ):
+            yield chunk
+        return
+    if suffix not in (".xlsx", ".xlsm"):
+        raise ValueError(f"取り込めない形式です: {path.suffix} (CSV または xlsx を指定してください)")
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb[wb.sheetnames[0]]
+        rows = ws.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        buffer: List[Tuple[Any, ...]] = []
+        for values in rows:
+            buffer.append(values[: len(header)])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=header, dtype=object)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header, dtype=object)
+    finally:
+        wb.close()
+
+
+def _estimate_import_rows(path: Path, sheet_name: Optional[str] = None) -> int:
+    if path.suffix.lower() not in (".xlsx", ".xlsm"):
+        return 0
+    wb = load_workbook(path, read_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb[wb.sheetnames[0]]
+        return max(0, (ws.max_row or 1) - 1)
+    finally:
+        wb.close()
+
+
+def _import_text(value: Any) -> str:
+    return str(value).strip()
+
+
+def _import_due(value: Any):
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return _from_iso_date_str(str(value))
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, (dt.datetime, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _resolve_export_format(path: Path, fmt: Optional[str]) -> str:
+    if fmt:
+        name = str(fmt).strip().lower().lstrip(".")
+        name = "jsonl" if name in ("ndjson", "json") else name
+        if name not in ("csv", "jsonl", "parquet"):
+            raise ValueError(f"未対応の出力形式です: {fmt}")
+        return name
+    name = EXPORT_FORMATS.get(path.suffix.lower())
+    if name is None:
+        raise ValueError(f"出力形式を判別できません: {path.name} (.csv / .jsonl / .parquet)")
+    return name
+
+
+def _write_export(
+    path: Path,
+    fmt: str,
+    columns: List[str],
+    chunks: Iterable[pd.DataFrame],
+    progress: Optional[ProgressCallback] = None,
+    total: int = 0,
+) -> int:
+    # チャンクごとに書き出し、全行を同時にメモリへ載せない。一時ファイルへ書いてから置き換える。
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet 出力には pyarrow が必要です (pip install pyarrow)。")
+    if fmt == "csv":
+        open_kwargs: Dict[str, Any] = {"mode": "w", "encoding": "utf-8-sig", "newline": ""}
+    elif fmt == "jsonl":
+        open_kwargs = {"mode": "w", "encoding": "utf-8"}
+    else:
+        open_kwargs = {"mode": "wb"}
+    tmp_path = path.with_name(f"{path.name}.tmp_{uuid.uuid4().hex[:8]}")
+    written = 0
+    writer = None
+    try:
+        with open(tmp_path, **open_kwargs) as fp:
+            if fmt == "csv":
+                pd.DataFrame(columns=columns).to_csv(fp, index=False)
+            elif fmt == "parquet":
+                schema = pa.schema([(col, pa.string()) for col in columns])
+                writer = pq.ParquetWriter(fp, schema)
+            for chunk in chunks:
+                chunk = chunk.reindex(columns=columns)
+                if fmt == "csv":
+                    chunk.to_csv(fp, index=False, header=False)
+                elif fmt == "jsonl":
+                    for record in chunk.to_dict("records"):
+                        fp.write(json.dumps(record, ensure_ascii=False, default=str))
+                        fp.write("\n")
+                else:
+                    arrays = [
+                        pa.array(
+                            [None if _is_missing(v) else str(v) for v in chunk[col].tolist()],
+                            type=pa.string(),
+                        )
+                        for col in columns
+                    ]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                written += len(chunk)
+                if progress is not None:
+                    progress("rows_exported", written, total)
+            if writer is not None:
+                writer.close()
+                writer = None
+        os.replace(tmp_path, path)
+    except BaseException:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        if tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except Exception:
+                pass
+        raise
+    return written
+
+
+def _is_missing(value: Any) -> bool:
+    if value is None:
+        return True
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _categories_in_use(series: pd.Series) -> List[Any]:
+    # 出現順を保ったまま、実際に使われている値だけをコードから求める。
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return list(pd.unique(series.dropna()))
+    codes = series.cat.codes.to_numpy()
+    used = pd.unique(codes[codes >= 0])
+    return list(series.cat.categories[used])
+
+
+def _columnar_to_frame(parsed: Dict[str, Any]) -> pd.DataFrame:
+    columns = list(parsed.get("columns") or [])
+    data = parsed.get("data") or {}
+    if not columns:
+        return pd.DataFrame(columns=TASK_COLUMNS)
+    return pd.DataFrame({col: pd.Series(data.get(col, []), dtype=object) for col in columns}, columns=columns)
+
+
+class TaskStore:
+    def __init__(
+        self,
+        excel_path: Path,
+        sheet_name: str | None = None,
+        *,
+        enable_journal: bool = True,
+        enable_change_log: bool = True,
+        parse_in_subprocess: bool = False,
+        sidecar_key: Optional[str] = None,
+        initial_parse: Optional[Dict[str, Any]] = None,
+        undo_max_bytes: int = UNDO_MAX_BYTES,
+        enable_flow_history: bool = False,
+    ):
+        self.excel_path = excel_path
+        self.instance_id = uuid.uuid4().hex
+        self._lock = threading.RLock()
+        self._meta_id_column = META_ID_COLUMN
+        self._df = self._encode_categorical_frames(
+            pd.DataFrame(columns=TASK_COLUMNS + HIDDEN_META_COLUMNS)
+        )[0]
+        self._column_order: List[str] = list(TASK_COLUMNS) + list(HIDDEN_META_COLUMNS)
+        self._statuses: List[str] = list(DEFAULT_STATUSES)
+        self._requested_sheet_name: str | None = (
+            sheet_name.strip() if isinstance(sheet_name, str) and sheet_name.strip() else None
+        )
+        self._sheet_name: str | None = self._requested_sheet_name
+        self._validations: Dict[str, List[str]] = {
+            key: list(values) for key, values in DEFAULT_VALIDATIONS.items()
+        }
+        self._last_saved_at: Optional[dt.datetime] = None
+        self._last_saved_mtime: Optional[float] = None
+        self._last_loaded_mtime: Optional[float] = None
+        # 現在の状態がどのブック内容から作られたか。起動直後の再読込を省くために使う。
+        self._loaded_fingerprint: Optional[Dict[str, Any]] = None
+        self._loaded_at: Optional[dt.datetime] = None
+        self._load_version = 0
+        # 画面遷移をまたいで状態を使い回すための版番号と、版ごとの変更位置
+        # ("set": その行だけ / "tail": その位置以降すべて)。
+        self._state_version = 0
+        self._state_log: deque = deque(maxlen=STATE_LOG_MAX)
+        self._state_log_floor = 0
+        # 期限状態が次に切り替わる日 (序数) と行 ID の最小ヒープ。古い要素は取り出し時に捨てる。
+        self._due_heap: List[Tuple[int, str]] = []
+        self._due_today = dt.date.today()
+        # 入力候補の索引と、索引に反映済みの行ごとの値 (行 ID → SUGGEST_COLUMNS の値)。
+        self._suggest_index: Dict[str, CompletionIndex] = {
+            col: CompletionIndex() for col in SUGGEST_COLUMNS
+        }
+        self._suggest_rows: Dict[str, Tuple[str, ...]] = {}
+        # 累積フロー図・バーンダウン用の日別件数。読み込み時と操作のたびに差分で記録する。
+        self._flow_history: Optional[FlowHistory] = (
+            FlowHistory(_flow_history_path_for(excel_path, sidecar_key)) if enable_flow_history else None
+        )
+        # 元に戻す / やり直す履歴。行 ID と変わった列の前後の値 (ジャーナルと同じ表現) だけを持つ。
+        self.undo_max_bytes = max(0, int(undo_max_bytes))
+        self._undo_log: deque = deque()
+        self._redo_log: deque = deque()
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+        self._dirty_row_ids: Set[str] = set()
+        self._deleted_row_ids: Set[str] = set()
+        self._last_saved_snapshot: pd.DataFrame = self._df.copy()
+        self._journal: Optional[OperationJournal] = (
+            OperationJournal(_journal_path_for(excel_path, sidecar_key)) if enable_journal else None
+        )
+        self._replaying_journal = False
+        self._journal_suspended = False
+        self._change_log: Optional[ChangeLog] = (
+            ChangeLog(_change_log_path_for(excel_path, sidecar_key), self.instance_id)
+            if enable_change_log
+            else None
+        )
+        self._archive_total_cache: Optional[Tuple[float, int]] = None
+        self._save_generation = 0
+        self._parse_in_subprocess = False
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
+        self._validations_dirty = False
+        # 起動時はまだ UI が無いため同一プロセスで解析し、以降の再読込からワーカーを使う。
+        # 複数ソースのボードでは呼び出し側がまとめて解析した結果を受け取る。
+        if initial_parse is not None:
+            self._apply_parsed_workbook(initial_parse)
+        else:
+            self.load_excel()
+        self._parse_in_subprocess = parse_in_subprocess
+        self._replay_journal()
+
+    def load_excel(self, progress: Optional[ProgressCallback] = None):
+        # 解析はロック外 (既定ではワーカープロセス) で行い、その間も読み取り API は
+        # 直前のスナップショットを返し続ける。解析中に保存された場合は解析し直す。
+        for _attempt in range(3):
+            generation = self._save_generation
+            if progress is not None:
+                progress("reading", 0, 0)
+            parsed = self._parse_workbook(self._requested_sheet_name)
+            with self._lock:
+                if generation != self._save_generation:
+                    continue
+                self._apply_parsed_workbook(parsed, progress)
+                return
+        with self._lock:
+            self._apply_parsed_workbook(self._parse_workbook(self._requested_sheet_name), progress)
+
+    def _parse_workbook(self, requested_sheet: Optional[str]) -> Dict[str, Any]:
+        pool = self._get_parse_pool()
+        if pool is not None:
+            try:
+                return pool.submit(
+                    _parse_workbook_columnar, str(self.excel_path), requested_sheet
+                ).result()
+            except (BrokenProcessPool, OSError, pickle.PicklingError) as exc:
+                print(f"[kanban] Parse worker failed, falling back to in-process parse: {exc}")
+                self._shutdown_parse_pool()
+        return _parse_workbook_columnar(str(self.excel_path), requested_sheet)
+
+    def _get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        if not self._parse_in_subprocess:
+            return None
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._parse_pool
+
+    def _shutdown_parse_pool(self):
+        with self._parse_pool_lock:
+            pool, self._parse_pool = self._parse_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up_parse_worker(self):
+        pool = self._get_parse_pool()
+        if pool is not None:
+            pool.submit(os.getpid)
+
+    def close(self):
+        self._shutdown_parse_pool()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _apply_parsed_workbook(
+        self,
+        parsed: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None,
+    ):
+        with self._lock:
+            sheet_name = parsed["sheet_name"]
+            self._sheet_name = sheet_name
+            validations: Dict[str, List[str]] = {
+                key: list(values) for key, values in DEFAULT_VALIDATIONS.items()
+            }
+            for column, values in parsed["validations"].items():
+                if not values:
+                    continue
+                validations[column] = list(values)
+            self._validations = validations
+
+            df = _columnar_to_frame(parsed)
+            if progress is not None:
+                progress("rows_parsed", len(df), len(df))
+
+            if "No" in df.columns:
+                df = df.drop(columns=["No"])
+
+            for col in TASK_COLUMNS:
+                if col not in df.columns:
+                    df[col] = pd.NA
+
+            extra_columns = [col for col in df.columns if col not in TASK_COLUMNS]
+            ordered_columns = TASK_COLUMNS + extra_columns
+            df = df[ordered_columns].copy()
+
+            df = df.dropna(how="all", subset=TASK_COLUMNS).reset_index(drop=True)
+
+            df["タスク"] = df["タスク"].apply(
+                lambda v: "" if pd.isna(v) else str(v).strip()
+            )
+            df = df[df["タスク"] != ""].reset_index(drop=True)
+
+            if "期限" in df.columns:
+                df["期限"] = pd.to_datetime(df["期限"], errors="coerce").dt.date
+
+            had_meta_column = self._meta_id_column in df.columns
+
+            df = self._ensure_row_ids(df)
+            persisted_mtime: Optional[float] = None
+            if not had_meta_column:
+                persisted_mtime = self._persist_row_ids_to_workbook(df)
+                if persisted_mtime is not None:
+                    self._last_saved_at = dt.datetime.now()
+
+            local_df = self._ensure_row_ids(self._df.copy())
+
+            excel_columns = list(df.columns)
+            local_columns = list(local_df.columns)
+            all_columns = list(
+                dict.fromkeys(excel_columns + [col for col in local_columns if col not in excel_columns])
+            )
+
+            dirty_ids = set(self._dirty_row_ids)
+            deleted_ids = set(self._deleted_row_ids)
+
+            excel_row_ids: List[str] = []
+            excel_row_map: Dict[str, pd.Series] = {}
+            for _, excel_row in df.iterrows():
+                row_id = str(excel_row[self._meta_id_column])
+                excel_row_ids.append(row_id)
+                excel_row_map[row_id] = excel_row
+
+            local_row_map: Dict[str, pd.Series] = {}
+            for _, local_row in local_df.iterrows():
+                row_id = str(local_row[self._meta_id_column])
+                local_row_map[row_id] = local_row
+
+            merged_rows: List[pd.Series] = []
+            new_dirty_ids: Set[str] = set()
+
+            for merged_count, row_id in enumerate(excel_row_ids, start=1):
+                if progress is not None and merged_count % PROGRESS_REPORT_ROWS == 0:
+                    progress("rows_merged", merged_count, len(excel_row_ids))
+                if row_id in deleted_ids:
+                    continue
+                if row_id in local_row_map and row_id in dirty_ids:
+                    source_row = local_row_map[row_id]
+                    new_dirty_ids.add(row_id)
+                else:
+                    source_row = excel_row_map[row_id]
+                merged_rows.append(source_row.reindex(all_columns))
+
+            for _, local_row in local_df.iterrows():
+                row_id = str(local_row[self._meta_id_column])
+                if row_id in deleted_ids or row_id in excel_row_map:
+                    continue
+                if row_id not in dirty_ids:
+                    continue
+                merged_rows.append(local_row.reindex(all_columns))
+                new_dirty_ids.add(row_id)
+
+            if merged_rows:
+                merged_df = pd.DataFrame(merged_rows)
+                merged_df = merged_df.reindex(columns=all_columns)
+            else:
+                merged_df = pd.DataFrame(columns=all_columns)
+
+            new_excel_columns = [
+                col
+                for col in all_columns
+                if col in df.columns and col not in local_df.columns and col != self._meta_id_column
+            ]
+            for col in new_excel_columns:
+                merged_df[col] = merged_df[col].where(~merged_df[col].isna(), pd.NA)
+
+            merged_df = merged_df.dropna(how="all", subset=TASK_COLUMNS).reset_index(drop=True)
+
+            merged_df["タスク"] = merged_df["タスク"].apply(
+                lambda v: "" if pd.isna(v) else str(v).strip()
+            )
+            merged_df = merged_df[merged_df["タスク"] != ""].reset_index(drop=True)
+
+            if "期限" in merged_df.columns:
+                merged_df["期限"] = pd.to_datetime(merged_df["期限"], errors="coerce").dt.date
+
+            extra_columns = [col for col in merged_df.columns if col not in TASK_COLUMNS]
+            ordered_columns = TASK_COLUMNS + extra_columns
+            merged_df = merged_df[ordered_columns]
+            self._column_order = ordered_columns
+
+            self._df = merged_df
+            self._dirty_row_ids = new_dirty_ids
+            excel_id_set = set(excel_row_ids)
+            self._deleted_row_ids = {row_id for row_id in deleted_ids if row_id in excel_id_set}
+
+            snapshot = df.reindex(columns=all_columns).copy(deep=True)
+            snapshot = snapshot.where(~snapshot.isna(), pd.NA)
+            self._df, self._last_saved_snapshot = self._encode_categorical_frames(
+                self._df, snapshot
+            )
+
+            self._refresh_statuses()
+            mtime = persisted_mtime if persisted_mtime is not None else parsed.get("mtime")
+            if mtime is None:
+                mtime = self._get_file_mtime()
+            self._last_loaded_mtime = mtime
+            self._mark_loaded(
+                _file_fingerprint(self.excel_path)
+                if persisted_mtime is not None
+                else parsed.get("fingerprint")
+            )
+            if persisted_mtime is not None:
+                self._last_saved_mtime = mtime
+            elif self._last_saved_mtime is None:
+                self._last_saved_mtime = self._last_loaded_mtime
+            if self._change_log is not None:
+                self._change_log.seek_to_end()
+            self._record_state_change("reset")
+
+    def _generate_row_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def _encode_categorical_frames(self, *frames: pd.DataFrame) -> Tuple[pd.DataFrame, ...]:
+        encoded = [frame.copy() for frame in frames]
+        for col in CATEGORICAL_COLUMNS:
+            values: List[Any] = []
+            for frame in encoded:
+                if col not in frame.columns:
+                    frame[col] = pd.NA
+                values.extend(_categories_in_use(frame[col]))
+            categories = pd.Index(pd.unique(pd.Series(values, dtype=object)), dtype=object)
+            for frame in encoded:
+                frame[col] = pd.Categorical(
+                    frame[col].astype(object).where(frame[col].notna(), None),
+                    categories=categories,
+                )
+        return tuple(encoded)
+
+    def _ensure_category(self, df: pd.DataFrame, column: str, value: Any):
+        if column not in df.columns or _is_missing(value):
+            return
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+            df[column] = series.cat.add_categories([value])
+
+    def _register_category(self, column: str, value: Any):
+        # 新しい値は _df と _last_saved_snapshot の両方の値テーブルへ同時に追加する。
+        if column not in CATEGORICAL_COLUMNS:
+            return
+        self._ensure_category(self._df, column, value)
+        self._ensure_category(self._last_saved_snapshot, column, value)
+
+    def _set_frame_value(self, df: pd.DataFrame, row_index: Any, column: str, value: Any):
+        self._register_category(column, value)
+        self._ensure_category(df, column, value)
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and _is_missing(value):
+            value = None
+        df.at[row_index, column] = value
+
+    def _append_frame_row(self, df: pd.DataFrame, values: Dict[str, Any]) -> pd.DataFrame:
+        full_row = {col: pd.NA for col in df.columns}
+        full_row.update(values)
+        for col in CATEGORICAL_COLUMNS:
+            self._register_category(col, full_row.get(col))
+            self._ensure_category(df, col, full_row.get(col))
+        row_frame = pd.DataFrame([full_row], columns=df.columns)
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                value = full_row.get(col)
+                row_frame[col] = pd.Categorical(
+                    [None if _is_missing(value) else value], categories=df[col].cat.categories
+                )
+        if len(df) == 0:
+            return row_frame.reset_index(drop=True)
+        return pd.concat([df.reset_index(drop=True), row_frame], ignore_index=True)
+
+    def _insert_frame_row(self, df: pd.DataFrame, values: Dict[str, Any], position: int) -> pd.DataFrame:
+        appended = self._append_frame_row(df, values)
+        if position >= len(df):
+            return appended
+        order = list(range(len(df)))
+        order.insert(position, len(df))
+        return appended.iloc[order].reset_index(drop=True)
+
+    def _ensure_meta_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self._meta_id_column not in df.columns:
+            df[self._meta_id_column] = pd.NA
+        return df
+
+    def _ensure_row_ids(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._ensure_meta_columns(df.copy())
+        for idx, value in df[self._meta_id_column].items():
+            if value is None or (isinstance(value, str) and not value.strip()) or pd.isna(value):
+                df.at[idx, self._meta_id_column] = self._generate_row_id()
+            else:
+                df.at[idx, self._meta_id_column] = str(value).strip()
+        return df
+
+    def _persist_row_ids_to_workbook(self, df: pd.DataFrame) -> Optional[float]:
+        sheet_name = self._sheet_name
+        if not sheet_name:
+            return None
+        try:
+            wb = load_workbook(self.excel_path)
+        except FileNotFoundError:
+            return None
+        if sheet_name not in wb.sheetnames:
+            wb.close()
+            return None
+        ws = wb[sheet_name]
+
+        header_row = list(next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()))
+        id_col_idx: Optional[int] = None
+        for idx, value in enumerate(header_row, start=1):
+            if isinstance(value, str) and value == self._meta_id_column:
+                id_col_idx = idx
+                break
+
+        changes_made = False
+        if id_col_idx is None:
+            id_col_idx = len(header_row) + 1 if header_row else 1
+            ws.cell(row=1, column=id_col_idx, value=self._meta_id_column)
+            changes_made = True
+
+        header_map: Dict[str, int] = {}
+        for col_idx in range(1, ws.max_column + 1):
+            header_value = ws.cell(row=1, column=col_idx).value
+            if isinstance(header_value, str):
+                header_map[header_value] = col_idx
+
+        column_letter = get_column_letter(id_col_idx)
+        if ws.column_dimensions[column_letter].hidden is not True:
+            ws.column_dimensions[column_letter].hidden = True
+            changes_made = True
+
+        id_values = [str(value) for value in df[self._meta_id_column].tolist()]
+        task_col_idx = header_map.get("タスク")
+        id_index = 0
+        for row_idx in range(2, ws.max_row + 1):
+            if id_index >= len(id_values):
+                break
+            if task_col_idx is not None:
+                task_cell = ws.cell(row=row_idx, column=task_col_idx).value
+                task_text = "" if task_cell is None else str(task_cell).strip()
+                if not task_text:
+                    continue
+            ws.cell(row=row_idx, column=id_col_idx).value = id_values[id_index]
+            id_index += 1
+            changes_made = True
+
+        if not changes_made:
+            wb.close()
+            return None
+
+        wb.save(self.excel_path)
+        self._save_generation += 1
+        try:
+            return self._get_file_mtime()
+        finally:
+            try:
+                wb.close()
+            except Exception:
+                pass
+
+    def _get_row_id_at_index(self, row_index: int) -> str:
+        self._df = self._ensure_meta_columns(self._df)
+        value = self._df.at[row_index, self._meta_id_column]
+        if value is None or (isinstance(value, str) and not value.strip()) or pd.isna(value):
+            new_id = self._generate_row_id()
+            self._df.at[row_index, self._meta_id_column] = new_id
+            return new_id
+        return str(value).strip()
+
+    def _get_file_mtime(self) -> Optional[float]:
+        try:
+            return self.excel_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def task_count(self) -> int:
+        with self._lock:
+            return len(self._df)
+
+    def find_task_no(self, row_id: str) -> Optional[int]:
+        with self._lock:
+            index = self._find_row_index_by_id(row_id)
+            return None if index is None else index + 1
+
+    def has_unsaved_changes(self) -> bool:
+        with self._lock:
+            return bool(self._dirty_row_ids or self._deleted_row_ids or self._validations_dirty)
+
+    def _diff_against_saved(self) -> Dict[str, Any]:
+        # 最後に保存した内容と現在の内容を行 ID で揃え、表示形式の値を列ごとに一括比較する。
+        # 行の並び順だけの違いは変更として扱わない。
+        current, saved = self._df, self._last_saved_snapshot
+        id_col = self._meta_id_column
+
+        def row_ids(df: pd.DataFrame) -> np.ndarray:
+            if id_col not in df.columns or df.empty:
+                return np.array([], dtype=object)
+            return df[id_col].astype(str).to_numpy(dtype=object)
+
+        current_ids, saved_ids = row_ids(current), row_ids(saved)
+        lookup = pd.Series(np.arange(len(saved_ids)), index=saved_ids)
+        lookup = lookup[~lookup.index.duplicated()]
+        matched = lookup.reindex(current_ids).to_numpy()
+        added = np.flatnonzero(np.isnan(matched))
+        common = np.flatnonzero(~np.isnan(matched))
+        common_saved = matched[common].astype(np.int64)
+        deleted = np.flatnonzero(~pd.Index(saved_ids).isin(current_ids))
+
+        def formatted(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+            present = [col for col in TASK_COLUMNS if col in df.columns]
+            columns = self._format_columns(df, present)
+            return {
+                col: np.asarray(columns[col], dtype=object) if col in columns else np.full(len(df), "", dtype=object)
+                for col in TASK_COLUMNS
+            }
+
+        current_values, saved_values = formatted(current), formatted(saved)
+        changed_cells = np.zeros((len(common), len(TASK_COLUMNS)), dtype=bool)
+        for j, col in enumerate(TASK_COLUMNS):
+            changed_cells[:, j] = current_values[col][common] != saved_values[col][common_saved]
+        modified = np.flatnonzero(changed_cells.any(axis=1))
+        return {
+            "added": added,
+            "deleted": deleted,
+            "modified": modified,
+            "common": common,
+            "common_saved": common_saved,
+            "changed_cells": changed_cells,
+            "current_values": current_values,
+            "saved_values": saved_values,
+        }
+
+    def get_pending_changes(self, limit: int = PENDING_CHANGES_LIMIT) -> Dict[str, Any]:
+        # 保存で書き込まれる内容を、追加・変更 (列ごとの前後の値)・削除の行で返す。
+        limit = max(0, int(limit))
+        with self._lock:
+            diff = self._diff_against_saved()
+            current_values, saved_values = diff["current_values"], diff["saved_values"]
+
+            def row_fields(values: Dict[str, np.ndarray], position: int) -> Dict[str, Any]:
+                return {col: values[col][position] for col in TASK_COLUMNS}
+
+            added = [
+                {"No": int(position) + 1, **row_fields(current_values, position)}
+                for position in diff["added"][:limit]
+            ]
+            modified = []
+            for k in diff["modified"][:limit]:
+                position, saved_position = int(diff["common"][k]), int(diff["common_saved"][k])
+                columns = [TASK_COLUMNS[j] for j in np.flatnonzero(diff["changed_cells"][k])]
+                modified.append(
+                    {
+                        "No": position + 1,
+                        "タスク": current_values["タスク"][position],
+                        "changes": {
+                            col: {
+                                "before": saved_values[col][saved_position],
+                                "after": current_values[col][position],
+                            }
+                            for col in columns
+                        },
+                    }
+                )
+            deleted = [row_fields(saved_values, position) for position in diff["deleted"][:limit]]
+            counts = {name: int(len(diff[name])) for name in ("added", "modified", "deleted")}
+            return {
+                "has_changes": bool(any(counts.values()) or self._validations_dirty),
+                "validations_changed": self._validations_dirty,
+                "counts": counts,
+                "added": added,
+                "modified": modified,
+                "deleted": deleted,
+                "truncated": any(count > limit for count in counts.values()),
+            }
+
+    def _pending_counts(self) -> Dict[str, int]:
+        diff = self._diff_against_saved()
+        return {name: int(len(diff[name])) for name in ("added", "modified", "deleted")}
+
+    def has_pending_changes(self) -> bool:
+        with self._lock:
+            return self._validations_dirty or any(self._pending_counts().values())
+
+    def get_sources(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "label": self.excel_path.stem,
+                    "path": str(self.excel_path),
+                    "sheet": self._sheet_name,
+                    "task_count": len(self._df),
+                    "dirty": self.has_unsaved_changes(),
+                }
+            ]
+
+    def get_last_saved_markers(self) -> Tuple[Optional[dt.datetime], Optional[float]]:
         with self._lock:
             return self._last_saved_at, self._last_saved_mtime
 
+    @property
+    def journal(self) -> Optional[OperationJournal]:
+        return self._journal
+
+    def _journal_append(self, record: Dict[str, Any]) -> None:
+        if self._journal is None or self._replaying_journal or self._journal_suspended:
+            return
+        self._journal.append(record)
+
+    @contextlib.contextmanager
+    def journal_suspended(self) -> Iterator[None]:
+        # バッチのように最後にまとめて保存する処理では、操作ごとの追記と fsync を省く。
+        # 保存せずに終わった場合も、既存のジャーナルはそのまま残る。
+        with self._lock:
+            previous, self._journal_suspended = self._journal_suspended, True
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._journal_suspended = previous
+
+    def _find_row_index_by_id(self, row_id: str) -> Optional[int]:
+        if self._meta_id_column not in self._df.columns:
+            return None
+        matches = self._df.index[self._df[self._meta_id_column].astype(str) == str(row_id)]
+        if len(matches) == 0:
+            return None
+        return int(matches[0])
+
+    def _replay_journal(self) -> int:
+        if self._journal is None:
+            return 0
+        records = self._journal.read_records()
+        if not records:
+            return 0
+        with self._lock:
+            self._replaying_journal = True
+            applied = 0
+            try:
+                for record in records:
+                    try:
+                        if self._apply_journal_record(record):
+                            applied += 1
+                    except (KeyError, TypeError, ValueError) as exc:
+                        print(f"[kanban] Skipped journal record {record.get('op')!r}: {exc}")
+            finally:
+                self._replaying_journal = False
+        if applied:
+            self._record_state_change("reset")
+            print(f"[kanban] Replayed {applied} journal operation(s) from {self._journal.path.name}.")
+        return applied
+
+    def _apply_journal_record(self, record: Dict[str, Any]) -> bool:
+        op = record.get("op")
+        if op == "validations":
+            self._apply_validations(record.get("values") or {})
+            self._validations_dirty = True
+            return True
+
+        if op == "add_many":
+            rows = record.get("rows") or []
+            frame = pd.DataFrame(
+                [
+                    {
+                        **{
+                            col: _decode_journal_value(col, value)
+                            for col, value in (item.get("row") or {}).items()
+                            if col in TASK_COLUMNS
+                        },
+                        self._meta_id_column: str(item.get("id") or ""),
+                    }
+                    for item in rows
+                    if item.get("id")
+                ],
+                columns=TASK_COLUMNS + [self._meta_id_column],
+                dtype=object,
+            )
+            return self._append_rows_bulk(frame) > 0
+
+        row_id = str(record.get("id") or "")
+        if not row_id:
+            return False
+
+        if op == "add":
+            values = {
+                col: _decode_journal_value(col, value)
+                for col, value in (record.get("row") or {}).items()
+                if col in TASK_COLUMNS
+            }
+            position = record.get("position")
+            if isinstance(position, int) and self._find_row_index_by_id(row_id) is None:
+                # 元に戻した削除は元の位置へ、追加列も含めて戻す。
+                extra = {
+                    col: value
+                    for col, value in (record.get("extra") or {}).items()
+                    if col not in TASK_COLUMNS and col != self._meta_id_column
+                }
+                self._df = self._insert_frame_row(
+                    self._ensure_meta_columns(self._df),
+                    {**values, **extra, self._meta_id_column: row_id},
+                    min(max(0, position), len(self._df)),
+                )
+            else:
+                self._df = self._upsert_frame_row(self._df, row_id, values)
+            self._ensure_status_registered(str(values.get("ステータス", "") or ""))
+            self._dirty_row_ids.add(row_id)
+            self._deleted_row_ids.discard(row_id)
+            return True
+
+        if op == "update":
+            row_index = self._find_row_index_by_id(row_id)
+            if row_index is None:
+                return False
+            fields = {
+                col: _decode_journal_value(col, value)
+                for col, value in (record.get("fields") or {}).items()
+                if col in TASK_COLUMNS
+            }
+            if "ステータス" in fields:
+                self._ensure_status_registered(str(fields["ステータス"] or ""))
+            for column, value in fields.items():
+                self._set_frame_value(self._df, row_index, column, value)
+            self._dirty_row_ids.add(row_id)
+            self._deleted_row_ids.discard(row_id)
+            return True
+
+        if op == "delete":
+            row_index = self._find_row_index_by_id(row_id)
+            if row_index is None:
+                return False
+            self._df = self._df.drop(index=row_index).reset_index(drop=True)
+            self._dirty_row_ids.discard(row_id)
+            self._deleted_row_ids.add(row_id)
+            return True
+
+        return False
+
+    @property
+    def change_log(self) -> Optional[ChangeLog]:
+        return self._change_log
+
+    def _build_change_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        if self._dirty_row_ids and self._meta_id_column in df.columns:
+            ids = df[self._meta_id_column].astype(str)
+            for _, row in df[ids.isin(self._dirty_row_ids)].iterrows():
+                records.append(
+                    {
+                        "op": "upsert",
+                        "id": str(row[self._meta_id_column]),
+                        "row": {col: _encode_journal_value(col, row[col]) for col in TASK_COLUMNS},
+                    }
+                )
+        for row_id in sorted(self._deleted_row_ids):
+            records.append({"op": "delete", "id": row_id})
+        records.append({"op": "validations", "values": self.get_validations()})
+        return records
+
+    def sync_from_change_log(self) -> bool:
+        # 他インスタンスの保存内容を差分で取り込む。ブックの指紋が最後のコミットと
+        # 一致しない (Excel で直接編集された等) 場合は False を返し、全再解析に任せる。
+        if self._change_log is None:
+            return False
+        with self._lock:
+            batches = self._change_log.read_new_batches()
+            if not batches:
+                return False
+            peer_batches = [b for b in batches if b.get("instance") != self.instance_id]
+            if not peer_batches:
+                return False
+            for batch in peer_batches:
+                self._apply_change_batch(batch.get("records") or [])
+            self._record_state_change("reset")
+            fingerprint = _file_fingerprint(self.excel_path)
+            if not _fingerprints_match(fingerprint, batches[-1].get("fingerprint")):
+                return False
+            self._last_loaded_mtime = fingerprint["mtime"]
+            self._mark_loaded(fingerprint)
+            return True
+
+    def _mark_loaded(self, fingerprint: Optional[Dict[str, Any]]):
+        self._loaded_fingerprint = fingerprint
+        self._loaded_at = dt.datetime.now()
+        self._load_version += 1
+
+    def _record_state_change(self, kind: str, position: int = 0):
+        self._state_version += 1
+        if kind == "reset":
+            self._state_log.clear()
+            self._state_log_floor = self._state_version
+            self._rebuild_due_heap()
+            self._rebuild_suggest_index()
+            self._rebuild_flow_rows()
+            # 再読込などで行の内容が入れ替わった後は、履歴を当てると外部の変更を上書きしかねない。
+            self._clear_undo_history()
+            return
+        if kind == "set":
+            self._schedule_due_rows([position])
+            self._update_suggest_rows(position, position + 1)
+            self._update_flow_rows(position, position + 1)
+        if kind == "tail":
+            self._update_suggest_rows(position, len(self._df))
+            self._update_flow_rows(position, len(self._df))
+        if kind == "meta":
+            return
+        if len(self._state_log) == self._state_log.maxlen:
+            self._state_log_floor = self._state_log[0][0]
+        self._state_log.append((self._state_version, kind, position))
+
+    def _suggest_values(self, df: pd.DataFrame) -> List[List[str]]:
+        return [
+            _map_distinct(df[col], lambda value: str(value).strip(), "")
+            if col in df.columns
+            else [""] * len(df)
+            for col in SUGGEST_COLUMNS
+        ]
+
+    def _rebuild_suggest_index(self):
+        columns = self._suggest_values(self._df)
+        for col, values in zip(SUGGEST_COLUMNS, columns):
+            counts = pd.Series(values, dtype=object).value_counts()
+            self._suggest_index[col].reset(counts.to_dict(), self._validations.get(col, []))
+        ids = self._df[self._meta_id_column].astype(str).tolist() if len(self._df) else []
+        self._suggest_rows = dict(zip(ids, zip(*columns)))
+
+    def _update_suggest_rows(self, start: int, stop: int):
+        # start..stop の行を索引へ反映し、削除で消えた行の値を索引から外す。
+        df = self._df.iloc[start:stop]
+        ids = df[self._meta_id_column].astype(str).tolist() if len(df) else []
+        for row_id, values in zip(ids, zip(*self._suggest_values(df))):
+            previous = self._suggest_rows.get(row_id)
+            if previous == values:
+                continue
+            for index, old, new in zip(
+                self._suggest_index.values(), previous or [""] * len(values), values
+            ):
+                if old != new:
+                    index.remove(old)
+                    index.add(new)
+            self._suggest_rows[row_id] = values
+        if len(self._suggest_rows) > len(self._df):
+            alive = set(self._df[self._meta_id_column].astype(str))
+            for row_id in [row_id for row_id in self._suggest_rows if row_id not in alive]:
+                for index, old in zip(self._suggest_index.values(), self._suggest_rows.pop(row_id)):
+                    index.remove(old)
+
+    def _flow_rows(self, df: pd.DataFrame) -> Dict[str, Tuple[str, str]]:
+        if df.empty:
+            return {}
+        statuses = _map_distinct(df["ステータス"], lambda value: str(value).strip(), "")
+        assignees = _map_distinct(df["担当者"], lambda value: str(value).strip(), "")
+        return dict(zip(df[self._meta_id_column].astype(str).tolist(), zip(statuses, assignees)))
+
+    def _rebuild_flow_rows(self):
+        if self._flow_history is None:
+            return
+        self._flow_history.reset(self._flow_rows(self._df))
+        self._flow_history.record(dt.date.today().isoformat())
+
+    def _update_flow_rows(self, start: int, stop: int):
+        history = self._flow_history
+        if history is None:
+            return
+        history.update(self._flow_rows(self._df.iloc[start:stop]))
+        if history.row_count > len(self._df):
+            history.retain(set(self._df[self._meta_id_column].astype(str)))
+        history.record(dt.date.today().isoformat())
+
+    @property
+    def flow_history(self) -> Optional[FlowHistory]:
+        return self._flow_history
+
+    def get_flow_history(self, start: Any = None, end: Any = None) -> Dict[str, Any]:
+        # 記録済みの日別件数だけから系列を組み立てる。ブックは読み直さない。
+        history = self._flow_history
+        if history is None:
+            return {"enabled": False}
+        start_date, end_date = _resolve_history_range(start, end, history.first_date)
+        with self._lock:
+            statuses = list(self._statuses)
+        return {
+            "enabled": True,
+            "backfilled": history.backfilled,
+            **_build_flow_series(start_date, history.snapshots(start_date, end_date), statuses),
+        }
+
+    def backfill_flow_history(
+        self,
+        directories: Optional[Iterable[Path]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        # 既存のバックアップから、まだ記録の無い日の件数を一度だけ補う。
+        # ブックの読み取りはロック外で行い、その間も通常の操作は止めない。
+        history = self._flow_history
+        if history is None or history.backfilled:
+            return 0
+        if directories is None:
+            directories = [Path.cwd(), self.excel_path.parent]
+        backups = _find_backup_workbooks(self.excel_path, directories)
+        days = history.missing_dates(sorted(backups))
+        counted: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for done, day in enumerate(days):
+            if progress is not None:
+                progress("backfill", done, len(days))
+            try:
+                counted[day] = _count_backup_workbook(backups[day], self._sheet_name)
+            except Exception as exc:
+                print(f"[kanban] Skipped backup {backups[day].name} for flow history: {exc}")
+        if progress is not None:
+            progress("backfill", len(days), len(days))
+        added = history.merge_backfill(counted)
+        if added:
+            print(f"[kanban] Backfilled flow history for {added} day(s) from backups")
+        return added
+
+    def _suggest_index_for(self, column: str) -> CompletionIndex:
+        index = self._suggest_index.get(column)
+        if index is None:
+            raise ValueError(f"入力候補に対応していない列です: {column}")
+        return index
+
+    def suggest(self, column: str, prefix: str = "", limit: int = SUGGEST_LIMIT_DEFAULT) -> List[Dict[str, Any]]:
+        index = self._suggest_index_for(column)
+        limit = max(1, min(int(limit), SUGGEST_LIMIT_MAX))
+        with self._lock:
+            return index.suggest(str(prefix or ""), limit)
+
+    def suggest_matches(self, column: str, prefix: str = "") -> List[Dict[str, Any]]:
+        # 切り詰める前の前方一致の候補。複数ソースをまとめてから並べる TaskBoard が使う。
+        index = self._suggest_index_for(column)
+        with self._lock:
+            return index.matches(str(prefix or ""))
+
+    def get_state_version(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"epoch": self.instance_id, "version": self._state_version}
+
+    def _open_due_rows(self, positions: Optional[List[int]] = None) -> Iterator[Tuple[int, str, dt.date]]:
+        # 未完了で期限のある行を (位置, 行 ID, 期限) で返す。
+        df = self._df if positions is None else self._df.iloc[positions]
+        if df.empty or "期限" not in df.columns:
+            return
+        dues = _format_due_column(df["期限"])
+        done = _map_distinct(df["ステータス"], _is_completed_status, False)
+        ids = df[self._meta_id_column].astype(str).tolist()
+        rows = range(len(df)) if positions is None else positions
+        for position, row_id, due_text, completed in zip(rows, ids, dues, done):
+            due = None if completed else _parse_due_text(due_text)
+            if due is not None:
+                yield position, row_id, due
+
+    def _schedule_due_rows(self, positions: List[int]):
+        for _position, row_id, due in self._open_due_rows(positions):
+            threshold = _next_due_threshold(due, self._due_today)
+            if threshold is not None:
+                heapq.heappush(self._due_heap, (threshold.toordinal(), row_id))
+        if len(self._due_heap) > 2 * len(self._df) + 64:
+            self._rebuild_due_heap()
+
+    def _rebuild_due_heap(self):
+        heap = []
+        for _position, row_id, due in self._open_due_rows():
+            threshold = _next_due_threshold(due, self._due_today)
+            if threshold is not None:
+                heap.append((threshold.toordinal(), row_id))
+        heapq.heapify(heap)
+        self._due_heap = heap
+
+    def get_due_states(self, today: Optional[dt.date] = None) -> Dict[str, Any]:
+        today = today or dt.date.today()
+        with self._lock:
+            states = []
+            counts = {"overdue": 0, "warning": 0}
+            for position, _row_id, due in self._open_due_rows():
+                state = _due_state(due, today)
+                if state["level"] in counts:
+                    counts[state["level"]] += 1
+                states.append({"No": position + 1, "期限": due.isoformat(), **state})
+            # 画面は版が一致する間だけ件数を使い、タスク一覧を数え直さずに済ませる。
+            return {
+                "date": today.isoformat(),
+                "counts": counts,
+                "states": states,
+                "state_epoch": self.instance_id,
+                "state_version": self._state_version,
+            }
+
+    def advance_due_clock(self, today: Optional[dt.date] = None) -> Dict[str, Any]:
+        # 日付が変わったときに呼ぶ。ヒープから今日までに境界を越えた行だけを取り出し、
+        # 次の境界を積み直して、状態が変わった行と件数を返す。
+        today = today or dt.date.today()
+        with self._lock:
+            rolled_over = today != self._due_today
+            self._due_today = today
+            positions: Dict[str, int] = {}
+            if self._due_heap and self._due_heap[0][0] <= today.toordinal():
+                positions = {
+                    row_id: position
+                    for position, row_id in enumerate(self._df[self._meta_id_column].astype(str))
+                }
+            crossed: List[int] = []
+            seen: Set[str] = set()
+            while self._due_heap and self._due_heap[0][0] <= today.toordinal():
+                threshold, row_id = heapq.heappop(self._due_heap)
+                position = positions.get(row_id)
+                if position is None or row_id in seen:
+                    continue
+                entry = next(iter(self._open_due_rows([position])), None)
+                day_before = dt.date.fromordinal(threshold - 1)
+                if entry is None or _next_due_threshold(entry[2], day_before) != dt.date.fromordinal(threshold):
+                    continue
+                seen.add(row_id)
+                crossed.append(position)
+                following = _next_due_threshold(entry[2], today)
+                if following is not None:
+                    heapq.heappush(self._due_heap, (following.toordinal(), row_id))
+            summary = self.get_due_states(today)
+            by_no = {state["No"]: state for state in summary["states"]}
+            return {
+                "date": summary["date"],
+                "rolled_over": rolled_over,
+                "counts": summary["counts"],
+                "transitions": [by_no[position + 1] for position in sorted(crossed)],
+                "state_epoch": summary["state_epoch"],
+                "state_version": summary["state_version"],
+            }
+
+    def get_changes_since(
+        self, version: Any, epoch: Any = None, fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        # 指定の版から変わった行だけを返す。行は No (位置) で識別されるため、削除や
+        # 一括追加はその位置以降をすべて送り直す。判断できない場合は mode=full を返す。
+        with self._lock:
+            stamp = {"state_epoch": self.instance_id, "state_version": self._state_version}
+            try:
+                base = int(version)
+            except (TypeError, ValueError):
+                base = -1
+            if epoch != self.instance_id or base < self._state_log_floor or base > self._state_version:
+                return {"mode": "full", **stamp}
+            if base == self._state_version:
+                return {"mode": "unchanged", **stamp}
+            count = len(self._df)
+            positions: Set[int] = set()
+            tail = count
+            for entry_version, kind, position in self._state_log:
+                if entry_version <= base:
+                    continue
+                if kind == "tail":
+                    tail = min(tail, position)
+                else:
+                    positions.add(position)
+            changed = sorted({p for p in positions if p < tail} | set(range(tail, count)))
+            if len(changed) * 2 > count:
+                return {"mode": "full", **stamp}
+            tasks = self._format_frame(self._df.iloc[changed], fields)
+            for position, task in zip(changed, tasks):
+                task["No"] = position + 1
+            return {
+                "mode": "delta",
+                **stamp,
+                "count": count,
+                "tasks": tasks,
+                "statuses": list(self._statuses),
+                "validations": {k: list(v) for k, v in self._validations.items()},
+            }
+
+    def get_freshness(self) -> Dict[str, Any]:
+        with self._lock:
+            loaded = self._loaded_fingerprint
+            current = _file_fingerprint(self.excel_path)
+            return {
+                "version": self._load_version,
+                "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+                "fingerprint": dict(loaded) if loaded else None,
+                # 許容誤差付きの _fingerprints_match ではなく、同じ stat 結果かどうかで判定する。
+                "fresh": loaded is not None and current == loaded,
+            }
+
+    def _apply_change_batch(self, records: List[Dict[str, Any]]):
+        for record in records:
+            op = record.get("op")
+            if op == "validations":
+                self._apply_validations(record.get("values") or {})
+                continue
+            row_id = str(record.get("id") or "")
+            # ローカルで未保存の変更がある行は load_excel と同じくローカルを優先する。
+            if not row_id or row_id in self._dirty_row_ids or row_id in self._deleted_row_ids:
+                continue
+            if op == "upsert":
+                values = {
+                    col: _decode_journal_value(col, value)
+                    for col, value in (record.get("row") or {}).items()
+                    if col in TASK_COLUMNS
+                }
+                self._df = self._upsert_frame_row(self._df, row_id, values)
+                self._last_saved_snapshot = self._upsert_frame_row(
+                    self._last_saved_snapshot, row_id, values
+                )
+                self._ensure_status_registered(str(values.get("ステータス", "") or ""))
+            elif op == "delete":
+                self._df = self._drop_frame_row(self._df, row_id)
+                self._last_saved_snapshot = self._drop_frame_row(self._last_saved_snapshot, row_id)
+
+    def _upsert_frame_row(self, df: pd.DataFrame, row_id: str, values: Dict[str, Any]) -> pd.DataFrame:
+        df = self._ensure_meta_columns(df)
+        matches = df.index[df[self._meta_id_column].astype(str) == row_id]
+        if len(matches):
+            for column, value in values.items():
+                self._set_frame_value(df, matches[0], column, value)
+            return df
+        return self._append_frame_row(df, {**values, self._meta_id_column: row_id})
+
+    def _drop_frame_row(self, df: pd.DataFrame, row_id: str) -> pd.DataFrame:
+        if self._meta_id_column not in df.columns:
+            return df
+        keep = df[self._meta_id_column].astype(str) != row_id
+        if bool(keep.all()):
+            return df
+        return df[keep].reset_index(drop=True)
+
+    def compact_journal(self) -> Optional[str]:
+        with self._lock:
+            if self._journal is None or not self._journal.has_records():
+                return None
+            return self.save_excel(backup=False)
+
     def _rebuild_statuses_from_df(self, df: pd.DataFrame | None = None):
         if df is None:
             df = self._df
-        status_values = [
-            s for s in df["ステータス"].dropna().astype(str).tolist() if s
-        ]
+        status_values = [str(s) for s in _categories_in_use(df["ステータス"]) if str(s)]
         merged: List[str] = []
         for name in status_values + DEFAULT_STATUSES:
             if name not in merged:
                 merged.append(name)
         self._statuses = merged
 
-    def _extract_validations(self, wb, ws) -> Dict[str, List[str]]:
-        validations: Dict[str, List[str]] = {}
-        dv_list = getattr(ws, "data_validations", None)
-        if not dv_list:
-            return validations
-
-        for dv in getattr(dv_list, "dataValidation", []) or []:
-            if dv.type != "list":
-                continue
-            values = self._resolve_validation_values(wb, ws, dv)
-            if not values:
-                continue
-            try:
-                ranges = list(dv.ranges)
-            except TypeError:
-                ranges = []
-            for cell_range in ranges:
-                min_col, min_row, max_col, max_row = range_boundaries(str(cell_range))
-                for col_idx in range(min_col, max_col + 1):
-                    header = ws.cell(row=1, column=col_idx).value
-                    if isinstance(header, str) and header in TASK_COLUMNS:
-                        validations[header] = list(values)
-        return validations
-
-    def _resolve_validation_values(self, wb, ws, dv) -> List[str]:
-        formula = (dv.formula1 or "").strip()
-        if not formula:
-            return []
-        if formula.startswith('"') and formula.endswith('"'):
-            content = formula[1:-1]
-            parts = [p.replace('""', '"').strip() for p in content.split(",")]
-            return [p for p in parts if p]
-        if formula.startswith("="):
-            target = formula[1:]
-            sheet_name = ws.title
-            if "!" in target:
-                sheet_part, range_part = target.split("!", 1)
-                sheet_name = sheet_part.strip()
-                if sheet_name.startswith("'") and sheet_name.endswith("'"):
-                    sheet_name = sheet_name[1:-1].replace("''", "'")
-            else:
-                range_part = target
-            range_part = range_part.strip()
-            try:
-                target_ws = wb[sheet_name]
-            except KeyError:
-                return []
-            values: List[str] = []
-            for row in target_ws[range_part]:
-                cells = row if isinstance(row, (list, tuple)) else (row,)
-                for cell in cells:
-                    if cell.value is None:
-                        continue
-                    text = str(cell.value).strip()
-                    if not text:
-                        continue
-                    if text not in values:
-                        values.append(text)
-            return values
-        return []
-
     def _to_excel_value(self, col_name: str, value: Any):
         if value is None or value is pd.NA:
             return None
@@ -683,9 +2705,15 @@ class TaskStore:
         escaped = [v.replace('"', '""') for v in values]
         return '"' + ",".join(escaped) + '"'
 
-    def get_tasks(self) -> List[Dict[str, Any]]:
+    def get_tasks(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._format_frame(self._df, fields)
+
+    def get_task_detail(self, no_value: int) -> Dict[str, Any]:
+        # 一覧で省いた重い列 (備考など) を含む 1 件分の全列。
         with self._lock:
-            return [self._format_row(i, self._df.iloc[i]) for i in range(len(self._df))]
+            i = self._resolve_row_index(int(no_value))
+            return self._format_row(i, self._df.iloc[i])
 
     def get_statuses(self) -> List[str]:
         with self._lock:
@@ -695,9 +2723,15 @@ class TaskStore:
         with self._lock:
             return {k: list(v) for k, v in self._validations.items()}
 
+    def get_task_columns(self, fields: Optional[List[str]] = None) -> Tuple[int, Dict[str, List[Any]]]:
+        with self._lock:
+            columns = self._format_columns(self._df, fields)
+            columns[META_ID_COLUMN] = self._format_row_ids(self._df)
+            return len(self._df), columns
+
     def get_state_snapshot(self) -> Dict[str, Any]:
         with self._lock:
-            tasks = [self._format_row(i, self._df.iloc[i]) for i in range(len(self._df))]
+            tasks = self._format_frame(self._df)
             statuses = list(self._statuses)
             validations = {k: list(v) for k, v in self._validations.items()}
             return {
@@ -720,24 +2754,37 @@ class TaskStore:
                         values.append(text)
                 if values:
                     cleaned[col] = values
+            self._journal_append({"op": "validations", "values": cleaned})
+            self._apply_validations(cleaned)
+            self._validations_dirty = True
+            self._record_state_change("meta")
+
+    def _apply_validations(self, cleaned: Dict[str, List[str]]):
+        with self._lock:
             merged: Dict[str, List[str]] = {
                 key: list(values) for key, values in DEFAULT_VALIDATIONS.items()
             }
-            merged.update(cleaned)
+            merged.update({key: list(values) for key, values in cleaned.items()})
             self._validations = merged
-            if self._validations.get("ステータス"):
-                base = list(self._validations["ステータス"])
-                extras = [
-                    s
-                    for s in self._df["ステータス"].dropna().astype(str).tolist()
-                    if s and s not in base
-                ]
-                self._statuses = base + extras
-            else:
-                self._rebuild_statuses_from_df()
+            for col, index in self._suggest_index.items():
+                index.set_validated(merged.get(col, []))
+            self._refresh_statuses()
+
+    def _refresh_statuses(self):
+        # 候補一覧は行を走査せず、ステータス列の値テーブルから作る。
+        if self._validations.get("ステータス"):
+            base = list(self._validations["ステータス"])
+            extras = [
+                str(s)
+                for s in _categories_in_use(self._df["ステータス"])
+                if str(s) and str(s) not in base
+            ]
+            self._statuses = base + extras
+        else:
+            self._rebuild_statuses_from_df(self._df)
 
     def _format_row(self, idx: int, row: pd.Series) -> Dict[str, Any]:
-        return {
+        formatted = {
             "No": int(idx + 1),
             "ステータス": "" if pd.isna(row["ステータス"]) else str(row["ステータス"]),
             "大分類": "" if pd.isna(row["大分類"]) else str(row["大分類"]),
@@ -748,6 +2795,112 @@ class TaskStore:
             "期限": _to_iso_date_str(row["期限"]),
             "備考": "" if pd.isna(row["備考"]) else str(row["備考"]),
         }
+        if self._meta_id_column in row.index:
+            formatted[META_ID_COLUMN] = _format_text_value(row[self._meta_id_column])
+        return formatted
+
+    def _format_row_ids(self, df: pd.DataFrame) -> List[str]:
+        # 画面が No の代わりにカード・行の対応付けに使う。No と違い前の行の追加・削除でずれない。
+        return [_format_text_value(value) for value in df[self._meta_id_column].tolist()]
+
+    def _format_columns(self, df: pd.DataFrame, fields: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        # _format_row の列単位版。期限・優先度などは異なる値ごとに一度だけ変換する。
+        columns: Dict[str, List[Any]] = {}
+        for col in TASK_COLUMNS if fields is None else fields:
+            if col == "期限":
+                columns[col] = _format_due_column(df[col])
+            elif col == "優先度":
+                columns[col] = _format_priority_column(df[col])
+            else:
+                columns[col] = _map_distinct(df[col], _format_text_value, "")
+        return columns
+
+    def _format_frame(self, df: pd.DataFrame, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        columns = self._format_columns(df, fields)
+        if self._meta_id_column in df.columns:
+            columns[META_ID_COLUMN] = self._format_row_ids(df)
+        numbers = range(1, len(df) + 1)
+        if not columns:
+            return [{"No": no} for no in numbers]
+        return [
+            {"No": no, **dict(zip(columns, values))}
+            for no, values in zip(numbers, zip(*columns.values()))
+        ]
+
+    def export_columns(self, include_hidden: bool = True) -> List[str]:
+        with self._lock:
+            extras = [
+                col for col in self._df.columns if col not in TASK_COLUMNS and col not in HIDDEN_META_COLUMNS
+            ]
+        return list(TASK_COLUMNS) + extras + (list(HIDDEN_META_COLUMNS) if include_hidden else [])
+
+    def _filter_mask(self, df: pd.DataFrame, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        # 表示形式 (期限は YYYY-MM-DD) の文字列で一致判定する。リストはいずれかに一致。
+        mask = np.ones(len(df), dtype=bool)
+        for col, expected in (filters or {}).items():
+            if col not in df.columns:
+                raise ValueError(f"絞り込み対象の列が存在しません: {col}")
+            candidates = expected if isinstance(expected, (list, tuple, set)) else [expected]
+            wanted = {"" if value is None else str(value) for value in candidates}
+            if col == "期限":
+                formatter: Callable[[Any], Any] = _to_iso_date_str
+            elif col == "優先度":
+                formatter = _format_priority_text
+            else:
+                formatter = str
+            values = pd.Series(_map_distinct(df[col], formatter, ""), dtype=object)
+            mask &= values.isin(wanted).to_numpy()
+        return mask
+
+    def iter_export_chunks(
+        self,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        include_hidden: bool = True,
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+    ) -> Tuple[int, Iterator[pd.DataFrame]]:
+        # 絞り込んだ時点の状態を固定し、出力用の整形はチャンクごとに行う。
+        # 編集は self._df のセルをその場で書き換えるため、時点の固定には絞り込んだ行の生の値の
+        # コピーが 1 回だけ必要になる (全体のコピーはしない)。整形後の値はチャンク分しか持たない。
+        columns = self.export_columns(include_hidden)
+        with self._lock:
+            positions = np.flatnonzero(self._filter_mask(self._df, filters))
+            df = self._df.iloc[positions].reset_index(drop=True)
+        chunk_size = max(1, int(chunk_size))
+
+        def generate() -> Iterator[pd.DataFrame]:
+            for start in range(0, len(df), chunk_size):
+                part = df.iloc[start : start + chunk_size]
+                data: Dict[str, List[Any]] = self._format_columns(part)
+                for col in columns:
+                    if col not in data:
+                        data[col] = _map_distinct(part[col], _export_value, None)
+                yield pd.DataFrame(data, columns=columns)
+
+        return len(df), generate()
+
+    def export_tasks(
+        self,
+        path: Path,
+        *,
+        fmt: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        include_hidden: bool = True,
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        # ブックには触れず、メモリ上の状態を直接書き出す。
+        path = Path(path).expanduser()
+        fmt_name = _resolve_export_format(path, fmt)
+        total, chunks = self.iter_export_chunks(
+            filters=filters, include_hidden=include_hidden, chunk_size=chunk_size
+        )
+        columns = self.export_columns(include_hidden)
+        rows = _write_export(path, fmt_name, columns, chunks, progress, total)
+        return {"path": str(path.resolve()), "format": fmt_name, "rows": rows}
+
+    def _excel_column_values(self, col_name: str, series: pd.Series) -> List[Any]:
+        return _map_distinct(series, lambda value: self._to_excel_value(col_name, value), None)
 
     def _resolve_row_index(self, no_value: int) -> int:
         try:
@@ -758,6 +2911,138 @@ class TaskStore:
             raise KeyError(f"No={no_value} は存在しません。")
         return no - 1
 
+    def _append_rows_bulk(self, frame: pd.DataFrame) -> int:
+        # 複数行をまとめて追加し、値テーブルと候補一覧の更新は最後に 1 回だけ行う。
+        with self._lock:
+            existing = set(self._df[self._meta_id_column].astype(str)) if len(self._df) else set()
+            frame = frame[~frame[self._meta_id_column].astype(str).isin(existing)]
+            if frame.empty:
+                return 0
+            base = self._df.astype({col: object for col in CATEGORICAL_COLUMNS if col in self._df.columns})
+            combined = pd.concat(
+                [base, frame.reindex(columns=base.columns)],
+                ignore_index=True,
+            )
+            self._df, self._last_saved_snapshot = self._encode_categorical_frames(
+                combined, self._last_saved_snapshot
+            )
+            self._record_state_change("tail", len(base))
+            self._schedule_due_rows(list(range(len(base), len(self._df))))
+            added_ids = set(frame[self._meta_id_column].astype(str))
+            self._dirty_row_ids |= added_ids
+            self._deleted_row_ids -= added_ids
+            self._refresh_statuses()
+            return len(frame)
+
+    def _normalize_import_chunk(self, chunk: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+        renamed = chunk.rename(columns={src: dst for src, dst in mapping.items() if src in chunk.columns})
+        renamed = renamed.loc[:, ~renamed.columns.duplicated()]
+        out = pd.DataFrame(index=range(len(renamed)))
+
+        def source(col: str) -> pd.Series:
+            if col in renamed.columns:
+                return renamed[col].reset_index(drop=True).astype(object)
+            return pd.Series([None] * len(renamed), dtype=object)
+
+        for col in ("ステータス", "大分類", "中分類", "タスク", "担当者"):
+            out[col] = _map_distinct(source(col), _import_text, "")
+        out["優先度"] = _map_distinct(source("優先度"), _normalize_priority, pd.NA)
+        out["期限"] = _map_distinct(source("期限"), _import_due, pd.NaT)
+        out["備考"] = _map_distinct(source("備考"), str, "")
+        out[self._meta_id_column] = _map_distinct(source(self._meta_id_column), _import_text, "")
+        return out
+
+    def import_tasks(
+        self,
+        path: Path,
+        *,
+        mapping: Optional[Dict[str, str]] = None,
+        sheet_name: Optional[str] = None,
+        chunk_size: int = IMPORT_CHUNK_ROWS,
+        extend_validations: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        # 取り込み元の読み込みと整形はロック外で行い、最後にまとめて反映する。
+        # 途中でキャンセルされた場合はボードを変更しない。
+        path = Path(path).expanduser()
+        if not path.exists():
+            raise FileNotFoundError(f"取り込み元が見つかりません: {path}")
+        column_map = {str(src): str(dst) for src, dst in (mapping or {}).items()}
+        for dst in column_map.values():
+            if dst not in TASK_COLUMNS and dst != self._meta_id_column:
+                raise ValueError(f"取り込み先の列が不正です: {dst}")
+        with self._lock:
+            known_ids = set(self._df[self._meta_id_column].astype(str)) if len(self._df) else set()
+        total = _estimate_import_rows(path, sheet_name)
+        read_rows = 0
+        invalid = 0
+        duplicates = 0
+        chunks: List[pd.DataFrame] = []
+        for chunk in _iter_import_chunks(path, max(1, int(chunk_size)), sheet_name):
+            read_rows += len(chunk)
+            normalized = self._normalize_import_chunk(chunk, column_map)
+            valid = normalized["タスク"] != ""
+            invalid += int((~valid).sum())
+            normalized = normalized[valid]
+            ids = normalized[self._meta_id_column]
+            missing = ids == ""
+            if bool(missing.any()):
+                normalized.loc[missing, self._meta_id_column] = [
+                    self._generate_row_id() for _ in range(int(missing.sum()))
+                ]
+            ids = normalized[self._meta_id_column]
+            duplicate = ids.isin(known_ids) | ids.duplicated()
+            duplicates += int(duplicate.sum())
+            normalized = normalized[~duplicate]
+            known_ids.update(normalized[self._meta_id_column])
+            chunks.append(normalized)
+            if progress is not None:
+                progress("rows_read", read_rows, max(total, read_rows) if total else 0)
+
+        frame = (
+            pd.concat(chunks, ignore_index=True)
+            if chunks
+            else pd.DataFrame(columns=TASK_COLUMNS + [self._meta_id_column])
+        )
+        with self._lock:
+            if not frame.empty:
+                self._journal_append(
+                    {
+                        "op": "add_many",
+                        "rows": [
+                            {
+                                "id": str(row[self._meta_id_column]),
+                                "row": {col: _encode_journal_value(col, row[col]) for col in TASK_COLUMNS},
+                            }
+                            for row in frame.to_dict("records")
+                        ],
+                    }
+                )
+            imported = self._append_rows_bulk(frame)
+            duplicates += len(frame) - imported
+            if extend_validations and imported:
+                current = {
+                    col: list(values)
+                    for col, values in self._validations.items()
+                    if col in TASK_COLUMNS
+                }
+                for col in list(current):
+                    if col not in frame.columns:
+                        continue
+                    for value in _categories_in_use(frame[col]):
+                        text = str(value).strip()
+                        if text and text not in current[col]:
+                            current[col].append(text)
+                self.set_validations(current)
+        if progress is not None:
+            progress("rows_merged", imported, imported)
+        return {
+            "imported": imported,
+            "duplicates": duplicates,
+            "invalid": invalid,
+            "read": read_rows,
+        }
+
     def _ensure_status_registered(self, name: str):
         name = name.strip()
         if name and name not in self._statuses:
@@ -792,11 +3077,24 @@ class TaskStore:
 
             new_index = len(self._df)
             self._df = self._ensure_meta_columns(self._df)
-            full_row = {col: pd.NA for col in self._df.columns}
-            full_row.update(row)
             row_id = self._generate_row_id()
-            full_row[self._meta_id_column] = row_id
-            self._df.loc[new_index] = full_row
+            self._journal_append(
+                {
+                    "op": "add",
+                    "id": row_id,
+                    "row": {col: _encode_journal_value(col, value) for col, value in row.items()},
+                }
+            )
+            self._df = self._append_frame_row(self._df, {**row, self._meta_id_column: row_id})
+            self._record_state_change("set", new_index)
+            self._remember_undo(
+                {
+                    "op": "add",
+                    "id": row_id,
+                    "position": new_index,
+                    "row": {col: _encode_journal_value(col, value) for col, value in row.items()},
+                }
+            )
             self._ensure_status_registered(status)
             self._dirty_row_ids.add(row_id)
             self._deleted_row_ids.discard(row_id)
@@ -829,34 +3127,248 @@ class TaskStore:
             if "備考" in patch:
                 updates["備考"] = str(patch["備考"] or "")
 
+            row_id = self._get_row_id_at_index(row_index)
+            self._journal_append(
+                {
+                    "op": "update",
+                    "id": row_id,
+                    "fields": {
+                        col: _encode_journal_value(col, value) for col, value in updates.items()
+                    },
+                }
+            )
+
             if "ステータス" in updates:
                 self._ensure_status_registered(updates["ステータス"])
 
+            before = {col: _encode_journal_value(col, self._df.at[row_index, col]) for col in updates}
             for column, value in updates.items():
-                self._df.at[row_index, column] = value
+                self._set_frame_value(self._df, row_index, column, value)
+            self._record_state_change("set", i)
+            after = {col: _encode_journal_value(col, value) for col, value in updates.items()}
+            changed = [col for col in updates if before[col] != after[col]]
+            if changed:
+                self._remember_undo(
+                    {
+                        "op": "update",
+                        "id": row_id,
+                        "position": i,
+                        "before": {col: before[col] for col in changed},
+                        "after": {col: after[col] for col in changed},
+                    }
+                )
+
+            self._dirty_row_ids.add(row_id)
+            self._deleted_row_ids.discard(row_id)
+            return self._format_row(i, self._df.loc[row_index])
+
+    def move_task(self, no_value: int, new_status: str) -> Dict[str, Any]:
+        return self.update_task(int(no_value), {"ステータス": new_status})
+
+    def delete_task(self, no_value: int) -> bool:
+        with self._lock:
+            try:
+                idx = self._resolve_row_index(int(no_value))
+            except KeyError:
+                return False
+            row_index = self._df.index[idx]
+            row_id = self._get_row_id_at_index(row_index)
+            removed = self._capture_row(row_index)
+            self._journal_append({"op": "delete", "id": row_id})
+            self._df = self._df.drop(index=row_index).reset_index(drop=True)
+            self._record_state_change("tail", idx)
+            self._remember_undo({"op": "delete", "id": row_id, "position": idx, **removed})
+            self._dirty_row_ids.discard(row_id)
+            self._deleted_row_ids.add(row_id)
+            return True
+
+    def _capture_row(self, row_index: Any) -> Dict[str, Any]:
+        extras = [
+            col for col in self._df.columns if col not in TASK_COLUMNS and col != self._meta_id_column
+        ]
+        captured: Dict[str, Any] = {
+            "row": {col: _encode_journal_value(col, self._df.at[row_index, col]) for col in TASK_COLUMNS}
+        }
+        if extras:
+            captured["extra"] = {
+                col: None if _is_missing(self._df.at[row_index, col]) else self._df.at[row_index, col]
+                for col in extras
+            }
+        return captured
+
+    def _remember_undo(self, entry: Dict[str, Any]):
+        if self._replaying_journal:
+            return
+        entry["seq"] = next(_UNDO_SEQUENCE)
+        size = _undo_entry_size(entry)
+        self._undo_log.append((entry, size))
+        self._undo_bytes += size
+        self._redo_log.clear()
+        self._redo_bytes = 0
+        while self._undo_log and (
+            self._undo_bytes > self.undo_max_bytes or len(self._undo_log) > UNDO_MAX_ENTRIES
+        ):
+            _old, old_size = self._undo_log.popleft()
+            self._undo_bytes -= old_size
+
+    def _clear_undo_history(self):
+        self._undo_log.clear()
+        self._redo_log.clear()
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+
+    def clear_redo(self):
+        with self._lock:
+            self._redo_log.clear()
+            self._redo_bytes = 0
+
+    def get_undo_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "can_undo": bool(self._undo_log),
+                "can_redo": bool(self._redo_log),
+                "undo_count": len(self._undo_log),
+                "redo_count": len(self._redo_log),
+                "bytes": self._undo_bytes + self._redo_bytes,
+                "max_bytes": self.undo_max_bytes,
+                "undo_seq": self._undo_log[-1][0]["seq"] if self._undo_log else 0,
+                "redo_seq": self._redo_log[-1][0]["seq"] if self._redo_log else 0,
+            }
+
+    def _locate_row_id(self, row_id: str, hint: int) -> Optional[int]:
+        # 記録時の位置に同じ行があればそれを使い、ずれていた場合だけ列全体を探す。
+        if 0 <= hint < len(self._df) and str(self._df.at[self._df.index[hint], self._meta_id_column]) == row_id:
+            return hint
+        row_index = self._find_row_index_by_id(row_id)
+        return None if row_index is None else int(self._df.index.get_loc(row_index))
+
+    def _apply_undo_fields(self, row_id: str, hint: int, fields: Dict[str, Any]) -> Optional[int]:
+        position = self._locate_row_id(row_id, hint)
+        if position is None:
+            return None
+        row_index = self._df.index[position]
+        decoded = {col: _decode_journal_value(col, value) for col, value in fields.items()}
+        self._journal_append(
+            {"op": "update", "id": row_id, "fields": {col: value for col, value in fields.items()}}
+        )
+        if "ステータス" in decoded:
+            self._ensure_status_registered(str(decoded["ステータス"] or ""))
+        for column, value in decoded.items():
+            self._set_frame_value(self._df, row_index, column, value)
+        self._record_state_change("set", position)
+        self._dirty_row_ids.add(row_id)
+        self._deleted_row_ids.discard(row_id)
+        return position
+
+    def _apply_undo_insert(self, entry: Dict[str, Any]) -> Optional[int]:
+        row_id = entry["id"]
+        if self._find_row_index_by_id(row_id) is not None:
+            return None
+        position = min(max(0, int(entry["position"])), len(self._df))
+        values = {col: _decode_journal_value(col, value) for col, value in entry["row"].items()}
+        extra = entry.get("extra") or {}
+        record = {"op": "add", "id": row_id, "row": dict(entry["row"]), "position": position}
+        if extra:
+            # 追加列も記録し、再起動後の再生で元に戻した削除の行が追加列を失わないようにする。
+            record["extra"] = {col: _export_value(value) for col, value in extra.items()}
+        self._journal_append(record)
+        self._df = self._ensure_meta_columns(self._df)
+        self._df = self._insert_frame_row(
+            self._df, {**values, **extra, self._meta_id_column: row_id}, position
+        )
+        self._ensure_status_registered(str(values.get("ステータス", "") or ""))
+        self._record_state_change("tail", position)
+        self._schedule_due_rows([position])
+        self._dirty_row_ids.add(row_id)
+        self._deleted_row_ids.discard(row_id)
+        return position
+
+    def _apply_undo_remove(self, entry: Dict[str, Any]) -> Optional[int]:
+        row_id = entry["id"]
+        position = self._locate_row_id(row_id, int(entry["position"]))
+        if position is None:
+            return None
+        self._journal_append({"op": "delete", "id": row_id})
+        self._df = self._df.drop(index=self._df.index[position]).reset_index(drop=True)
+        self._record_state_change("tail", position)
+        self._dirty_row_ids.discard(row_id)
+        self._deleted_row_ids.add(row_id)
+        return position
+
+    def _step_history(self, undo: bool) -> Dict[str, Any]:
+        source, target = (self._undo_log, self._redo_log) if undo else (self._redo_log, self._undo_log)
+        if not source:
+            return {"ok": False, **self.get_undo_state()}
+        entry, size = source.pop()
+        op = entry["op"]
+        if op == "update":
+            position = self._apply_undo_fields(
+                entry["id"], int(entry["position"]), entry["before"] if undo else entry["after"]
+            )
+        elif (op == "add") == undo:
+            position = self._apply_undo_remove(entry)
+        else:
+            position = self._apply_undo_insert(entry)
+        if undo:
+            self._undo_bytes -= size
+        else:
+            self._redo_bytes -= size
+        if position is None:
+            # 対象の行が既に無い (または既に戻されている) 操作は履歴から捨てる。
+            return {"ok": False, "skipped": op, **self.get_undo_state()}
+        entry["position"] = position
+        entry["seq"] = next(_UNDO_SEQUENCE)
+        target.append((entry, size))
+        if undo:
+            self._redo_bytes += size
+        else:
+            self._undo_bytes += size
+        task = None
+        if position < len(self._df) and str(self._df.at[self._df.index[position], self._meta_id_column]) == entry["id"]:
+            task = self._format_row(position, self._df.iloc[position])
+        return {"ok": True, "op": op, "No": position + 1, "task": task, **self.get_undo_state()}
 
-            row_id = self._get_row_id_at_index(row_index)
-            self._dirty_row_ids.add(row_id)
-            self._deleted_row_ids.discard(row_id)
-            return self._format_row(i, self._df.loc[row_index])
+    def undo(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._step_history(True)
 
-    def move_task(self, no_value: int, new_status: str) -> Dict[str, Any]:
-        return self.update_task(int(no_value), {"ステータス": new_status})
+    def redo(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._step_history(False)
 
-    def delete_task(self, no_value: int) -> bool:
+    def save_if_changed(
+        self, *, backup: bool = True, progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        # 画面からの保存。差分は 1 回だけ数え、保存済みの内容から変わっておらずブックも外部で
+        # 書き換えられていなければ、書き込みとバックアップを省く。saved で実際に書いたかを返す。
         with self._lock:
-            try:
-                idx = self._resolve_row_index(int(no_value))
-            except KeyError:
-                return False
-            row_index = self._df.index[idx]
-            row_id = self._get_row_id_at_index(row_index)
-            self._df = self._df.drop(index=row_index).reset_index(drop=True)
-            self._dirty_row_ids.discard(row_id)
-            self._deleted_row_ids.add(row_id)
-            return True
+            counts = self._pending_counts()
+            validations_changed = self._validations_dirty
+            changed = validations_changed or any(counts.values()) or not self.get_freshness()["fresh"]
+            if changed:
+                path = self.save_excel(backup=backup, progress=progress)
+            else:
+                # 編集して元に戻した行などの印とジャーナルは、書き込んだ場合と同じく片付ける。
+                self._dirty_row_ids.clear()
+                self._deleted_row_ids.clear()
+                if self._journal is not None:
+                    self._journal.truncate()
+                print(f"[kanban] No pending changes; skipped saving {self.excel_path.name}")
+                path = str(self.excel_path.resolve())
+            return {
+                "saved": changed,
+                "path": path,
+                "counts": counts,
+                "validations_changed": validations_changed,
+            }
 
-    def save_excel(self) -> str:
+    def save_excel(
+        self,
+        *,
+        backup: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        archive_rows: Optional[pd.DataFrame] = None,
+    ) -> str:
         with self._lock:
             ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = Path.cwd() / (
@@ -891,11 +3403,16 @@ class TaskStore:
                     if col_name in HIDDEN_META_COLUMNS:
                         col_letter = get_column_letter(idx)
                         ws.column_dimensions[col_letter].hidden = True
-                for row in df.itertuples(index=False, name=None):
-                    values: List[Any] = []
-                    for col_name, value in zip(ordered_columns, row):
-                        values.append(self._to_excel_value(col_name, value))
-                    ws.append(values)
+                total_rows = len(df)
+                excel_columns = [
+                    self._excel_column_values(col_name, df[col_name]) for col_name in ordered_columns
+                ]
+                for written, values in enumerate(zip(*excel_columns), start=1):
+                    ws.append(list(values))
+                    if progress is not None and written % PROGRESS_REPORT_ROWS == 0:
+                        progress("rows_written", written, total_rows)
+                if progress is not None:
+                    progress("rows_written", total_rows, total_rows)
 
                 try:
                     due_col_idx = TASK_COLUMNS.index("期限") + 1
@@ -933,14 +3450,36 @@ class TaskStore:
                     dv.add(f"${col_letter}$2:${col_letter}$1048576")
                     ws.add_data_validation(dv)
 
+                if archive_rows is not None and len(archive_rows):
+                    self._append_archive_rows(wb, archive_rows)
+
+                if progress is not None:
+                    progress("writing_file", total_rows, total_rows)
                 wb.save(tmp_path)
+                change_batch = None
+                if self._change_log is not None:
+                    # os.replace は mtime とサイズを保つため、指紋は置換前の一時ファイルから取れる。
+                    change_batch = (self._build_change_records(df), _file_fingerprint(tmp_path))
                 os.replace(tmp_path, self.excel_path)
-                shutil.copy2(self.excel_path, backup_path)
+                self._save_generation += 1
+                if change_batch is not None:
+                    # 置換に失敗したときに、存在しない保存を他のインスタンスへ知らせないよう置換後に追記する。
+                    # 追記できなくても保存自体は済んでおり、他のインスタンスは読み込み直しで追従する。
+                    try:
+                        self._change_log.append_batch(*change_batch)
+                    except OSError as exc:
+                        print(f"[kanban] Failed to append change log: {exc}")
+                if backup:
+                    shutil.copy2(self.excel_path, backup_path)
+                if self._journal is not None:
+                    self._journal.truncate()
                 self._last_saved_at = dt.datetime.now()
                 self._last_saved_mtime = self._get_file_mtime()
                 self._last_loaded_mtime = self._last_saved_mtime
+                self._mark_loaded(_file_fingerprint(self.excel_path))
                 self._dirty_row_ids.clear()
                 self._deleted_row_ids.clear()
+                self._validations_dirty = False
                 self._last_saved_snapshot = df.copy(deep=True)
                 self._df = df.copy()
             except Exception:
@@ -952,35 +3491,871 @@ class TaskStore:
                 raise
             return str(self.excel_path.resolve())
 
+    def _append_archive_rows(self, wb, rows: pd.DataFrame):
+        archive_name = _archive_sheet_name_for(self._sheet_name)
+        if archive_name in wb.sheetnames:
+            ws = wb[archive_name]
+            header = [
+                value
+                for value in next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+                if value is not None
+            ]
+        else:
+            ws = wb.create_sheet(title=archive_name)
+            header = []
+        if not header:
+            header = list(TASK_COLUMNS) + [ARCHIVED_AT_COLUMN]
+        # 追加列は既存の見出しの末尾に足し、過去のアーカイブ行の位置は変えない。
+        for col in rows.columns:
+            if col not in header:
+                header.append(col)
+        for idx, col_name in enumerate(header, start=1):
+            ws.cell(row=1, column=idx, value=col_name)
+            if col_name in HIDDEN_META_COLUMNS:
+                ws.column_dimensions[get_column_letter(idx)].hidden = True
+        archived_at = dt.date.today()
+        for row in rows.to_dict("records"):
+            values: List[Any] = []
+            for col_name in header:
+                if col_name == ARCHIVED_AT_COLUMN:
+                    values.append(archived_at)
+                else:
+                    values.append(self._to_excel_value(col_name, row.get(col_name)))
+            ws.append(values)
+        self._archive_total_cache = None
+
+    def archive_completed_tasks(self, older_than_days: int, *, include_undated: bool = False) -> int:
+        # 期限から older_than_days 日以上経過した「完了」タスクを同じブックの
+        # アーカイブシートへ移し、アクティブシートから取り除いて保存する。
+        # 保存はボード全体を書き込むため、未保存の編集がある間は巻き込まないよう断る。
+        with self._lock:
+            if self.has_unsaved_changes():
+                raise ValueError(ARCHIVE_UNSAVED_MESSAGE)
+            df = self._ensure_row_ids(self._df)
+            cutoff = pd.Timestamp(dt.date.today() - dt.timedelta(days=max(0, int(older_than_days))))
+            due = pd.to_datetime(df["期限"], errors="coerce")
+            status = df["ステータス"].astype(str).str.strip()
+            old_enough = due < cutoff
+            if include_undated:
+                old_enough = old_enough | due.isna()
+            mask = (status == ARCHIVE_STATUS) & old_enough
+            if not bool(mask.any()):
+                return 0
+
+            archived = df[mask]
+            archived_ids = set(archived[self._meta_id_column].astype(str))
+            previous = (self._df, set(self._dirty_row_ids), set(self._deleted_row_ids))
+            self._df = df[~mask].reset_index(drop=True)
+            self._dirty_row_ids -= archived_ids
+            self._deleted_row_ids |= archived_ids
+            self._record_state_change("reset")
+            try:
+                self.save_excel(backup=False, archive_rows=archived)
+            except Exception:
+                self._df, self._dirty_row_ids, self._deleted_row_ids = previous
+                self._record_state_change("reset")
+                raise
+            return len(archived)
+
+    def get_archived_tasks(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        # アーカイブは起動時に読み込まず、要求されたページだけを読み取り専用で走査する。
+        offset = max(0, int(offset))
+        limit = max(1, min(int(limit), ARCHIVE_PAGE_MAX))
+        with self._lock:
+            sheet_name = self._sheet_name
+            mtime = self._get_file_mtime()
+            cached = self._archive_total_cache
+        empty = {"tasks": [], "total": 0, "offset": offset, "limit": limit}
+        if not sheet_name or mtime is None:
+            return empty
+        archive_name = _archive_sheet_name_for(sheet_name)
+        try:
+            wb = load_workbook(self.excel_path, read_only=True, data_only=True)
+        except FileNotFoundError:
+            return empty
+        try:
+            if archive_name not in wb.sheetnames:
+                return empty
+            rows = wb[archive_name].iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            tasks: List[Dict[str, Any]] = []
+            total = 0
+            for values in rows:
+                record = dict(zip(header, values))
+                if not str(record.get("タスク") or "").strip():
+                    continue
+                if offset <= total < offset + limit:
+                    tasks.append(self._format_archived_row(total, record))
+                total += 1
+                if cached is not None and cached[0] == mtime and total >= offset + limit:
+                    total = cached[1]
+                    break
+        finally:
+            wb.close()
+        with self._lock:
+            self._archive_total_cache = (mtime, total)
+        return {"tasks": tasks, "total": total, "offset": offset, "limit": limit}
+
+    def _format_archived_row(self, position: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        row = pd.Series({col: record.get(col) for col in TASK_COLUMNS}, dtype=object)
+        formatted = self._format_row(position, row)
+        formatted[ARCHIVED_AT_COLUMN] = _to_iso_date_str(record.get(ARCHIVED_AT_COLUMN))
+        return formatted
+
+
+SOURCE_FIELD = "ソース"
+
+
+class TaskBoard:
+    # 複数のシート／ブックを 1 つのボードとして束ねる。各ソースは独立した
+    # TaskStore で、JsApi からは TaskStore と同じメソッドで扱える。
+    def __init__(
+        self,
+        sources: List[Tuple[Path, Optional[str]]],
+        *,
+        enable_journal: bool = True,
+        enable_change_log: bool = True,
+        parse_in_subprocess: bool = False,
+        max_workers: Optional[int] = None,
+        undo_max_bytes: int = UNDO_MAX_BYTES,
+        enable_flow_history: bool = False,
+    ):
+        if not sources:
+            raise ValueError("ボードのソースが指定されていません。")
+        self.instance_id = uuid.uuid4().hex
+        self._lock = threading.RLock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or min(4, len(sources)),
+            thread_name_prefix="kanban-source",
+        )
+        groups: Dict[Path, List[int]] = {}
+        for index, (path, _sheet) in enumerate(sources):
+            groups.setdefault(Path(path), []).append(index)
+
+        parsed: Dict[int, Dict[str, Any]] = {}
+        if parse_in_subprocess:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(len(groups), os.cpu_count() or 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as pool:
+                    futures = {
+                        path: pool.submit(
+                            _parse_workbook_sheets, str(path), [sources[i][1] for i in indexes]
+                        )
+                        for path, indexes in groups.items()
+                    }
+                    for path, future in futures.items():
+                        for index, result in zip(groups[path], future.result()):
+                            parsed[index] = result
+            except (BrokenProcessPool, OSError, pickle.PicklingError) as exc:
+                print(f"[kanban] Parse workers failed, falling back to in-process parse: {exc}")
+                parsed = {}
+
+        def open_group(path: Path, indexes: List[int]) -> List[Tuple[int, TaskStore]]:
+            shared = len(indexes) > 1
+            opened = []
+            for index in indexes:
+                sheet = sources[index][1]
+                opened.append(
+                    (
+                        index,
+                        TaskStore(
+                            path,
+                            sheet,
+                            enable_journal=enable_journal,
+                            enable_change_log=enable_change_log,
+                            parse_in_subprocess=parse_in_subprocess,
+                            sidecar_key=sheet if shared else None,
+                            initial_parse=parsed.get(index),
+                            undo_max_bytes=undo_max_bytes,
+                            enable_flow_history=enable_flow_history,
+                        ),
+                    )
+                )
+            return opened
+
+        stores: Dict[int, TaskStore] = {}
+        for future in [self._pool.submit(open_group, path, indexes) for path, indexes in groups.items()]:
+            stores.update(future.result())
+        self.stores: List[TaskStore] = [stores[index] for index in range(len(sources))]
+        self.labels: List[str] = self._build_labels(len(groups) == 1)
+
+    def _build_labels(self, single_workbook: bool) -> List[str]:
+        labels: List[str] = []
+        for store in self.stores:
+            sheet = store._sheet_name or ""
+            if single_workbook and sheet:
+                label = sheet
+            elif store._requested_sheet_name:
+                label = f"{store.excel_path.stem}/{sheet}"
+            else:
+                label = store.excel_path.stem
+            candidate, suffix = label, 2
+            while candidate in labels:
+                candidate = f"{label} ({suffix})"
+                suffix += 1
+            labels.append(candidate)
+        return labels
+
+    @property
+    def excel_path(self) -> Path:
+        return self.stores[0].excel_path
+
+    def _resolve_store(self, label: Any) -> Tuple[int, TaskStore]:
+        text = str(label or "").strip()
+        if not text:
+            return 0, self.stores[0]
+        if text not in self.labels:
+            raise KeyError(f"ソース {text} は存在しません。")
+        index = self.labels.index(text)
+        return index, self.stores[index]
+
+    def _locate(self, no_value: Any) -> Tuple[int, TaskStore, int]:
+        try:
+            no = int(no_value)
+        except (TypeError, ValueError):
+            raise KeyError(f"No={no_value} は存在しません。")
+        offset = 0
+        for index, store in enumerate(self.stores):
+            count = store.task_count()
+            if offset < no <= offset + count:
+                return index, store, no - offset
+            offset += count
+        raise KeyError(f"No={no_value} は存在しません。")
+
+    def task_count(self) -> int:
+        return sum(store.task_count() for store in self.stores)
+
+    def find_task_no(self, row_id: str) -> Optional[int]:
+        with self._lock:
+            offset = 0
+            for store in self.stores:
+                no = store.find_task_no(row_id)
+                if no is not None:
+                    return offset + no
+                offset += store.task_count()
+            return None
+
+    def _offset_of(self, source_index: int) -> int:
+        return sum(store.task_count() for store in self.stores[:source_index])
+
+    def _tag(self, source_index: int, task: Dict[str, Any], offset: int) -> Dict[str, Any]:
+        tagged = dict(task)
+        tagged["No"] = int(task["No"]) + offset
+        tagged[SOURCE_FIELD] = self.labels[source_index]
+        return tagged
+
+    def get_tasks(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            tasks: List[Dict[str, Any]] = []
+            for index, store in enumerate(self.stores):
+                offset = len(tasks)
+                tasks.extend(self._tag(index, task, offset) for task in store.get_tasks(fields))
+            return tasks
+
+    def get_task_detail(self, no_value: int) -> Dict[str, Any]:
+        with self._lock:
+            index, store, local_no = self._locate(no_value)
+            return self._tag(index, store.get_task_detail(local_no), self._offset_of(index))
+
+    def get_statuses(self) -> List[str]:
+        with self._lock:
+            merged: List[str] = []
+            for store in self.stores:
+                for name in store.get_statuses():
+                    if name not in merged:
+                        merged.append(name)
+            return merged
+
+    def get_validations(self) -> Dict[str, List[str]]:
+        with self._lock:
+            merged: Dict[str, List[str]] = {}
+            for store in self.stores:
+                for column, values in store.get_validations().items():
+                    bucket = merged.setdefault(column, [])
+                    bucket.extend(value for value in values if value not in bucket)
+            return merged
+
+    def get_task_columns(self, fields: Optional[List[str]] = None) -> Tuple[int, Dict[str, List[Any]]]:
+        with self._lock:
+            total = 0
+            selected = TASK_COLUMNS if fields is None else fields
+            merged: Dict[str, List[Any]] = {col: [] for col in selected}
+            merged[META_ID_COLUMN] = []
+            merged[SOURCE_FIELD] = []
+            for label, store in zip(self.labels, self.stores):
+                count, columns = store.get_task_columns(fields)
+                for col in [*selected, META_ID_COLUMN]:
+                    merged[col].extend(columns[col])
+                merged[SOURCE_FIELD].extend([label] * count)
+                total += count
+            return total, merged
+
+    def get_state_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tasks": self.get_tasks(),
+                "statuses": self.get_statuses(),
+                "validations": self.get_validations(),
+            }
+
+    def get_state_version(self) -> Dict[str, Any]:
+        # ソースごとの版の合計。どのソースが変わっても増えるが、行位置の差分は追わない。
+        with self._lock:
+            return {
+                "epoch": self.instance_id,
+                "version": sum(store.get_state_version()["version"] for store in self.stores),
+            }
+
+    def suggest(self, column: str, prefix: str = "", limit: int = SUGGEST_LIMIT_DEFAULT) -> List[Dict[str, Any]]:
+        # ソースごとの前方一致の候補をすべて値でまとめ、使用行数を合算してから並べる。
+        # 先にソースごとに切り詰めると、合算すれば上位に入る値が落ちてしまう。
+        limit = max(1, min(int(limit), SUGGEST_LIMIT_MAX))
+        with self._lock:
+            merged: Dict[str, Dict[str, Any]] = {}
+            for store in self.stores:
+                for match in store.suggest_matches(column, prefix):
+                    entry = merged.setdefault(match["value"], {**match, "count": 0})
+                    entry["count"] += match["count"]
+                    entry["validated"] = entry["validated"] or match["validated"]
+            return _rank_suggestions(list(merged.values()), _suggest_key(prefix), limit)
+
+    def get_flow_history(self, start: Any = None, end: Any = None) -> Dict[str, Any]:
+        # ソースごとの日別件数を同じ期間でそろえ、日ごとに足し合わせる。
+        histories = [store.flow_history for store in self.stores if store.flow_history is not None]
+        if not histories:
+            return {"enabled": False}
+        firsts = [history.first_date for history in histories if history.first_date]
+        start_date, end_date = _resolve_history_range(start, end, min(firsts) if firsts else None)
+        merged: List[Dict[str, Dict[str, int]]] = []
+        for snaps in zip(*(history.snapshots(start_date, end_date) for history in histories)):
+            day: Dict[str, Dict[str, int]] = {"status": {}, "assignee": {}}
+            for snap in snaps:
+                for key in ("status", "assignee"):
+                    for name, count in snap[key].items():
+                        day[key][name] = day[key].get(name, 0) + count
+            merged.append(day)
+        return {
+            "enabled": True,
+            "backfilled": all(history.backfilled for history in histories),
+            **_build_flow_series(start_date, merged, self.get_statuses()),
+        }
+
+    def backfill_flow_history(
+        self,
+        directories: Optional[Iterable[Path]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        return sum(store.backfill_flow_history(directories, progress) for store in self.stores)
+
+    def _merge_due_results(self, results: List[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+        merged: List[Dict[str, Any]] = []
+        offset = 0
+        for store, result in zip(self.stores, results):
+            merged.extend({**state, "No": state["No"] + offset} for state in result[key])
+            offset += store.task_count()
+        return merged
+
+    def get_due_states(self, today: Optional[dt.date] = None) -> Dict[str, Any]:
+        today = today or dt.date.today()
+        with self._lock:
+            results = [store.get_due_states(today) for store in self.stores]
+            stamp = self.get_state_version()
+            return {
+                "date": today.isoformat(),
+                "counts": {
+                    level: sum(result["counts"][level] for result in results)
+                    for level in ("overdue", "warning")
+                },
+                "states": self._merge_due_results(results, "states"),
+                "state_epoch": stamp["epoch"],
+                "state_version": stamp["version"],
+            }
+
+    def advance_due_clock(self, today: Optional[dt.date] = None) -> Dict[str, Any]:
+        today = today or dt.date.today()
+        with self._lock:
+            results = [store.advance_due_clock(today) for store in self.stores]
+            return {
+                "date": today.isoformat(),
+                "rolled_over": any(result["rolled_over"] for result in results),
+                "counts": {
+                    level: sum(result["counts"][level] for result in results)
+                    for level in ("overdue", "warning")
+                },
+                "transitions": self._merge_due_results(results, "transitions"),
+                "state_epoch": self.instance_id,
+                "state_version": self.get_state_version()["version"],
+            }
+
+    def get_changes_since(
+        self, version: Any, epoch: Any = None, fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        current = self.get_state_version()
+        unchanged = epoch == current["epoch"] and str(version) == str(current["version"])
+        return {
+            "mode": "unchanged" if unchanged else "full",
+            "state_epoch": current["epoch"],
+            "state_version": current["version"],
+        }
+
+    def get_freshness(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = [store.get_freshness() for store in self.stores]
+            return {
+                "version": sum(entry["version"] for entry in entries),
+                "loaded_at": min((e["loaded_at"] for e in entries if e["loaded_at"]), default=None),
+                "fingerprint": [entry["fingerprint"] for entry in entries],
+                "fresh": all(entry["fresh"] for entry in entries),
+            }
+
+    def get_sources(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            sources = []
+            for label, store in zip(self.labels, self.stores):
+                entry = store.get_sources()[0]
+                entry["label"] = label
+                sources.append(entry)
+            return sources
+
+    def set_validations(self, mapping: Dict[str, List[Any]]):
+        with self._lock:
+            for store in self.stores:
+                store.set_validations(mapping)
+
+    def _clear_other_redo(self, index: int):
+        # 他のソースで新しい操作をした後に、古いソースのやり直しが残らないようにする。
+        for position, store in enumerate(self.stores):
+            if position != index:
+                store.clear_redo()
+
+    def add_task(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(payload)
+            index, store = self._resolve_store(data.pop(SOURCE_FIELD, None))
+            task = self._tag(index, store.add_task(data), self._offset_of(index))
+            self._clear_other_redo(index)
+            return task
+
+    def update_task(self, no_value: int, patch: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            index, store, local_no = self._locate(no_value)
+            data = {key: value for key, value in patch.items() if key != SOURCE_FIELD}
+            task = self._tag(index, store.update_task(local_no, data), self._offset_of(index))
+            self._clear_other_redo(index)
+            return task
+
+    def move_task(self, no_value: int, new_status: str) -> Dict[str, Any]:
+        return self.update_task(int(no_value), {"ステータス": new_status})
+
+    def delete_task(self, no_value: int) -> bool:
+        with self._lock:
+            try:
+                index, store, local_no = self._locate(no_value)
+            except KeyError:
+                return False
+            deleted = store.delete_task(local_no)
+            if deleted:
+                self._clear_other_redo(index)
+            return deleted
+
+    def get_pending_changes(self, limit: int = PENDING_CHANGES_LIMIT) -> Dict[str, Any]:
+        with self._lock:
+            merged: Dict[str, Any] = {
+                "has_changes": False,
+                "validations_changed": False,
+                "counts": {"added": 0, "modified": 0, "deleted": 0},
+                "added": [],
+                "modified": [],
+                "deleted": [],
+                "truncated": False,
+            }
+            for index, (label, store) in enumerate(zip(self.labels, self.stores)):
+                result = store.get_pending_changes(limit)
+                offset = self._offset_of(index)
+                for key in ("has_changes", "validations_changed", "truncated"):
+                    merged[key] = merged[key] or result[key]
+                for key, count in result["counts"].items():
+                    merged["counts"][key] += count
+                merged["added"].extend(self._tag(index, row, offset) for row in result["added"])
+                merged["modified"].extend(self._tag(index, row, offset) for row in result["modified"])
+                merged["deleted"].extend({**row, SOURCE_FIELD: label} for row in result["deleted"])
+            return merged
+
+    def get_undo_state(self) -> Dict[str, Any]:
+        with self._lock:
+            states = [store.get_undo_state() for store in self.stores]
+            return {
+                "can_undo": any(state["can_undo"] for state in states),
+                "can_redo": any(state["can_redo"] for state in states),
+                "undo_count": sum(state["undo_count"] for state in states),
+                "redo_count": sum(state["redo_count"] for state in states),
+                "bytes": sum(state["bytes"] for state in states),
+                "max_bytes": sum(state["max_bytes"] for state in states),
+                "undo_seq": max(state["undo_seq"] for state in states),
+                "redo_seq": max(state["redo_seq"] for state in states),
+            }
+
+    def _step_history(self, undo: bool) -> Dict[str, Any]:
+        # 通し番号が最も新しい操作を持つソースで 1 手だけ戻す / やり直す。
+        key = "undo_seq" if undo else "redo_seq"
+        with self._lock:
+            seqs = [store.get_undo_state()[key] for store in self.stores]
+            if not any(seqs):
+                return {"ok": False, **self.get_undo_state()}
+            index = max(range(len(seqs)), key=seqs.__getitem__)
+            store = self.stores[index]
+            result = store.undo() if undo else store.redo()
+            offset = self._offset_of(index)
+            if result.get("No") is not None:
+                result["No"] += offset
+            if result.get("task") is not None:
+                result["task"] = self._tag(index, result["task"], offset)
+            return {**result, **self.get_undo_state()}
+
+    def undo(self) -> Dict[str, Any]:
+        return self._step_history(True)
+
+    def redo(self) -> Dict[str, Any]:
+        return self._step_history(False)
+
+    def save_excel(
+        self,
+        *,
+        backup: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        # 変更のあるソースだけを書き戻す。同じブックのシートは順に保存する。
+        with self._lock:
+            saved = [
+                store.save_excel(backup=backup, progress=progress)
+                for store in self.stores
+                if store.has_unsaved_changes()
+            ]
+            if not saved:
+                return "\n".join(str(store.excel_path.resolve()) for store in self.stores)
+            return "\n".join(dict.fromkeys(saved))
+
+    def save_if_changed(
+        self, *, backup: bool = True, progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        with self._lock:
+            results = [
+                store.save_if_changed(backup=backup, progress=progress)
+                for store in self.stores
+                if store.has_unsaved_changes()
+            ]
+            written = [result["path"] for result in results if result["saved"]]
+            paths = written or [str(store.excel_path.resolve()) for store in self.stores]
+            return {
+                "saved": bool(written),
+                "path": "\n".join(dict.fromkeys(paths)),
+                "counts": {
+                    name: sum(result["counts"][name] for result in results)
+                    for name in ("added", "modified", "deleted")
+                },
+                "validations_changed": any(result["validations_changed"] for result in results),
+            }
+
+    def load_excel(self, progress: Optional[ProgressCallback] = None):
+        futures = [self._pool.submit(store.load_excel) for store in self.stores]
+        for done, future in enumerate(futures, start=1):
+            future.result()
+            if progress is not None:
+                progress("sources_loaded", done, len(futures))
+
+    def import_tasks(self, path: Path, *, source: Any = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            _index, store = self._resolve_store(source)
+        return store.import_tasks(path, **kwargs)
+
+    def export_tasks(
+        self,
+        path: Path,
+        *,
+        fmt: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        include_hidden: bool = True,
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        path = Path(path).expanduser()
+        fmt_name = _resolve_export_format(path, fmt)
+        source_filter = None
+        store_filters = dict(filters or {})
+        if SOURCE_FIELD in store_filters:
+            raw = store_filters.pop(SOURCE_FIELD)
+            source_filter = {str(v) for v in (raw if isinstance(raw, (list, tuple, set)) else [raw])}
+        columns: List[str] = [SOURCE_FIELD]
+        parts: List[Tuple[str, Iterator[pd.DataFrame]]] = []
+        total = 0
+        with self._lock:
+            for label, store in zip(self.labels, self.stores):
+                if source_filter is not None and label not in source_filter:
+                    continue
+                columns.extend(col for col in store.export_columns(include_hidden) if col not in columns)
+                count, chunks = store.iter_export_chunks(
+                    filters=store_filters, include_hidden=include_hidden, chunk_size=chunk_size
+                )
+                total += count
+                parts.append((label, chunks))
+
+        def generate() -> Iterator[pd.DataFrame]:
+            for label, chunks in parts:
+                for chunk in chunks:
+                    chunk.insert(0, SOURCE_FIELD, label)
+                    yield chunk
 
-def push_excel_update(window, store: TaskStore):
-    payload = {
-        "tasks": store.get_tasks(),
+        rows = _write_export(path, fmt_name, columns, generate(), progress, total)
+        return {"path": str(path.resolve()), "format": fmt_name, "rows": rows}
+
+    def archive_completed_tasks(self, older_than_days: int, *, include_undated: bool = False) -> int:
+        with self._lock:
+            # 一部のソースだけ移した状態で止まらないよう、先にすべてのソースを確かめる。
+            if any(store.has_unsaved_changes() for store in self.stores):
+                raise ValueError(ARCHIVE_UNSAVED_MESSAGE)
+            return sum(
+                store.archive_completed_tasks(older_than_days, include_undated=include_undated)
+                for store in self.stores
+            )
+
+    def get_archived_tasks(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        offset = max(0, int(offset))
+        limit = max(1, min(int(limit), ARCHIVE_PAGE_MAX))
+        tasks: List[Dict[str, Any]] = []
+        total = 0
+        for index, store in enumerate(self.stores):
+            local_offset = max(0, offset - total)
+            remaining = limit - len(tasks)
+            page = store.get_archived_tasks(local_offset, max(1, remaining))
+            if remaining > 0:
+                tasks.extend(
+                    self._tag(index, task, total) for task in page["tasks"][:remaining]
+                )
+            total += page["total"]
+        return {"tasks": tasks, "total": total, "offset": offset, "limit": limit}
+
+    def compact_journal(self) -> List[str]:
+        with self._lock:
+            return [path for path in (store.compact_journal() for store in self.stores) if path]
+
+    def warm_up_parse_worker(self):
+        for store in self.stores:
+            store.warm_up_parse_worker()
+
+    @contextlib.contextmanager
+    def journal_suspended(self) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            for store in self.stores:
+                stack.enter_context(store.journal_suspended())
+            yield
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for store in self.stores:
+            store.close()
+
+
+def build_update_payload(
+    store: TaskStore, wire: str = "rows", fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    # 版は内容より先に読む。読み取りの間に変更が入っても、受け取った側は
+    # 次回その版からの差分で同じ最新状態へ追いつける。
+    stamp = store.get_state_version()
+    state = {"state_epoch": stamp["epoch"], "state_version": stamp["version"]}
+    if fields is not None:
+        # 省いた列があることを受け取り側に伝え、全列の状態と混ざらないようにする。
+        state["fields"] = list(fields)
+    if _normalize_wire_format(wire) == "columnar":
+        count, columns = store.get_task_columns(fields)
+        return {
+            "format": "columnar",
+            "version": 1,
+            "table": _encode_columnar_table(count, columns),
+            "statuses": store.get_statuses(),
+            "validations": store.get_validations(),
+            **state,
+        }
+    return {
+        "tasks": store.get_tasks(fields),
         "statuses": store.get_statuses(),
         "validations": store.get_validations(),
+        **state,
     }
+
+
+def _receiver_script(receiver: str, payload: Dict[str, Any]) -> str:
     json_payload = json.dumps(payload, ensure_ascii=False)
-    script = (
-        "if (window.__kanban_receive_update) {"
-        f" window.__kanban_receive_update({json_payload});"
-        " }"
-    )
+    return f"if (window.{receiver}) {{ window.{receiver}({json_payload}); }}"
+
+
+def push_excel_update(
+    window, store: TaskStore, wire: str = "rows", fields: Optional[List[str]] = None
+):
+    payload = build_update_payload(store, wire, fields)
+    script = _receiver_script("__kanban_receive_update", payload)
     try:
         window.evaluate_js(script)
     except Exception as exc:  # pragma: no cover - depends on runtime
         print(f"[kanban] Failed to push update to frontend: {exc}")
 
 
+class PushDispatcher(threading.Thread):
+    # バックエンド → フロントエンドの evaluate_js 通知を 1 本のスレッドで順に送る。
+    # 同じ key の通知は未送信のものを最新の 1 件にまとめ、ペイロードは送る直前に作る。
+    # key の無い通知は max_queue を超えると古いものから捨てる。
+    def __init__(
+        self,
+        window,
+        *,
+        max_queue: int = PUSH_QUEUE_MAX,
+        eval_timeout: float = PUSH_EVAL_TIMEOUT_SECONDS,
+    ):
+        super().__init__(name="kanban-push-dispatcher", daemon=True)
+        self.window = window
+        self.max_queue = max(1, int(max_queue))
+        self.eval_timeout = max(0.01, float(eval_timeout))
+        self._cond = threading.Condition()
+        self._queue: "OrderedDict[Any, Callable[[], str]]" = OrderedDict()
+        self._stopped = False
+        self._busy = False
+        self._eval_worker: Optional[threading.Thread] = None
+        self._counters = {
+            "delivered": 0,
+            "superseded": 0,
+            "dropped": 0,
+            "timed_out": 0,
+            "failed": 0,
+        }
+
+    def submit(self, key: Optional[str], build_script: Callable[[], str]) -> bool:
+        with self._cond:
+            if self._stopped:
+                return False
+            if key is not None and key in self._queue:
+                self._queue[key] = build_script
+                self._counters["superseded"] += 1
+                return True
+            if len(self._queue) >= self.max_queue:
+                oldest = next((k for k in self._queue if isinstance(k, tuple)), None)
+                if oldest is None:
+                    self._counters["dropped"] += 1
+                    return False
+                del self._queue[oldest]
+                self._counters["dropped"] += 1
+            self._queue[key if key is not None else ("once", uuid.uuid4().hex)] = build_script
+            self._cond.notify()
+            return True
+
+    def push_state(self, store: TaskStore, wire: Callable[[], str], fields: Callable[[], Optional[List[str]]]):
+        # 形式と列は送る時点のページ側の申告に従う。
+        self.submit(
+            "state",
+            lambda: _receiver_script(
+                "__kanban_receive_update", build_update_payload(store, wire(), fields())
+            ),
+        )
+
+    def push_due(self, payload: Dict[str, Any]):
+        # 画面は通知の日付で全行の残り日数を数え直すため、間の通知を捨てて最新の 1 件だけ送ればよい。
+        self.submit("due", lambda: _receiver_script("__kanban_receive_due_update", payload))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue": self.max_queue,
+                "busy": self._busy,
+                **self._counters,
+            }
+
+    def _evaluate(self, script: str) -> bool:
+        # evaluate_js は WebView が応答しないと戻らないため、別スレッドで実行して待ち時間を区切る。
+        errors: List[BaseException] = []
+
+        def target():
+            try:
+                self.window.evaluate_js(script)
+            except Exception as exc:  # pragma: no cover - depends on runtime
+                errors.append(exc)
+
+        worker = threading.Thread(target=target, name="kanban-push-eval", daemon=True)
+        self._eval_worker = worker
+        worker.start()
+        worker.join(self.eval_timeout)
+        if worker.is_alive():
+            print(f"[kanban] Push to frontend timed out after {self.eval_timeout:.1f}s")
+            self._count("timed_out")
+            return False
+        if errors:
+            print(f"[kanban] Failed to push update to frontend: {errors[0]}")
+            self._count("failed")
+            return False
+        self._count("delivered")
+        return True
+
+    def _count(self, name: str):
+        with self._cond:
+            self._counters[name] += 1
+
+    def _stuck_worker(self) -> Optional[threading.Thread]:
+        worker = self._eval_worker
+        return worker if worker is not None and worker.is_alive() else None
+
+    def dispatch_pending(self) -> int:
+        # キューが空になるまで送る。送信を試みた件数を返す。
+        # 時間切れになった evaluate_js がまだ戻っていない間は新しいスレッドを作らず、
+        # 残りの通知はキューに置いたまま返る (同じ key の通知はその間も最新の 1 件にまとまる)。
+        sent = 0
+        while True:
+            with self._cond:
+                if not self._queue or self._stuck_worker() is not None:
+                    return sent
+                _key, build_script = self._queue.popitem(last=False)
+                self._busy = True
+            try:
+                self._evaluate(build_script())
+            except Exception as exc:
+                print(f"[kanban] Failed to build push payload: {exc}")
+                self._count("failed")
+            finally:
+                with self._cond:
+                    self._busy = False
+            sent += 1
+
+    def run(self):  # pragma: no cover - timing dependent
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            worker = self._stuck_worker()
+            if worker is not None:
+                worker.join(self.eval_timeout)
+                continue
+            self.dispatch_pending()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify_all()
+
+
 class ExcelFileWatcher(FileSystemEventHandler):
     def __init__(
         self,
         store: TaskStore,
         window,
         debounce_seconds: float = 2.0,
+        notifier: Optional[Callable[[TaskStore], None]] = None,
     ):
         super().__init__()
         self.store = store
         self.window = window
+        self.notifier = notifier
         self.debounce_seconds = max(0.0, float(debounce_seconds))
         try:
             self._target_path = store.excel_path.resolve()
@@ -1005,7 +4380,7 @@ class ExcelFileWatcher(FileSystemEventHandler):
             if not path_str:
                 continue
             if self._is_target(path_str):
-                self._process_change()
+                self.process_change()
                 break
 
     def _is_target(self, path_str: str) -> bool:
@@ -1018,7 +4393,8 @@ class ExcelFileWatcher(FileSystemEventHandler):
         except Exception:
             return candidate == self._target_path
 
-    def _process_change(self):
+    def process_change(self):
+        # 対象ブックの変更を検知したときに呼ぶ。ファイルシステムのイベントと SingleFilePoller の両方から使う。
         now = dt.datetime.now()
         try:
             mtime = self.store.excel_path.stat().st_mtime
@@ -1034,59 +4410,527 @@ class ExcelFileWatcher(FileSystemEventHandler):
         ):
             return
 
-        if self._last_notified_mtime is not None and abs(mtime - self._last_notified_mtime) < 0.5:
-            return
+        if self._last_notified_mtime is not None and abs(mtime - self._last_notified_mtime) < 0.5:
+            return
+
+        try:
+            if not self.store.sync_from_change_log():
+                self.store.load_excel()
+            if self.notifier is not None:
+                self.notifier(self.store)
+            else:
+                push_excel_update(self.window, self.store)
+            self._last_notified_mtime = mtime
+            timestamp = now.strftime("%H:%M:%S")
+            print(f"[kanban] Excel change detected ({timestamp}), board updated.")
+        except Exception as exc:
+            print(f"[kanban] Failed to handle Excel change: {exc}")
+
+
+class SingleFilePoller(threading.Thread):
+    def __init__(
+        self,
+        handler: ExcelFileWatcher,
+        path: Path,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 8.0,
+        backoff_factor: float = 1.5,
+    ):
+        super().__init__(name="kanban-file-poller", daemon=True)
+        self.handler = handler
+        self.path = path
+        self.min_interval = max(0.05, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.backoff_factor = max(1.0, float(backoff_factor))
+        self._interval = self.min_interval
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._polls = 0
+        self._changes = 0
+        self._errors = 0
+        self._last_latency_ms = 0.0
+        self._max_latency_ms = 0.0
+        self._total_latency_ms = 0.0
+        self._last_signature = self._stat_signature()
+
+    def _stat_signature(self) -> Optional[Tuple[float, int]]:
+        # ディレクトリ全体を列挙せず、対象ブック 1 ファイルだけを stat する。
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def poll_once(self) -> bool:
+        started = time.perf_counter()
+        try:
+            signature = self._stat_signature()
+        except OSError:
+            with self._stats_lock:
+                self._polls += 1
+                self._errors += 1
+            return False
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        changed = signature is not None and signature != self._last_signature
+        self._last_signature = signature
+        with self._stats_lock:
+            self._polls += 1
+            self._last_latency_ms = latency_ms
+            self._max_latency_ms = max(self._max_latency_ms, latency_ms)
+            self._total_latency_ms += latency_ms
+            if changed:
+                self._changes += 1
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self.max_interval, self._interval * self.backoff_factor)
+        if changed:
+            self.handler.process_change()
+        return changed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            polls = self._polls
+            return {
+                "mode": "stat-poll",
+                "path": str(self.path),
+                "polls": polls,
+                "changes": self._changes,
+                "errors": self._errors,
+                "interval_seconds": round(self._interval, 3),
+                "min_interval_seconds": self.min_interval,
+                "max_interval_seconds": self.max_interval,
+                "last_latency_ms": round(self._last_latency_ms, 3),
+                "max_latency_ms": round(self._max_latency_ms, 3),
+                "avg_latency_ms": round(self._total_latency_ms / polls, 3) if polls else 0.0,
+            }
+
+    def run(self):  # pragma: no cover - timing dependent
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.poll_once()
+            except Exception as exc:
+                print(f"[kanban] File poller failed: {exc}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_excel_watcher(
+    window,
+    store: TaskStore,
+    *,
+    debounce_seconds: float = 2.0,
+    use_polling: bool = False,
+    poll_interval: float = 1.0,
+    max_poll_interval: float = 8.0,
+    notifier: Optional[Callable[[TaskStore], None]] = None,
+):
+    if isinstance(store, TaskBoard):
+        return _start_board_watchers(
+            window,
+            store,
+            debounce_seconds=debounce_seconds,
+            use_polling=use_polling,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            notifier=notifier,
+        )
+
+    handler = ExcelFileWatcher(
+        store,
+        window,
+        debounce_seconds=debounce_seconds,
+        notifier=notifier,
+    )
+
+    if use_polling:
+        poller = SingleFilePoller(
+            handler,
+            store.excel_path,
+            min_interval=poll_interval,
+            max_interval=max_poll_interval,
+        )
+        poller.start()
+        print(
+            f"[kanban] Started Excel watcher using stat polling on {store.excel_path} "
+            f"({poller.min_interval:g}s-{poller.max_interval:g}s)."
+        )
+        return poller
+
+    if Observer is None:
+        print("[kanban] watchdog is not installed; file watching is disabled.")
+        return None
+
+    observer = Observer()
+    watch_path = str(store.excel_path.parent)
+    observer.schedule(handler, watch_path, recursive=False)
+    observer.daemon = True
+    observer.start()
+    print(f"[kanban] Started Excel watcher using Observer on {watch_path}.")
+    return observer
+
+
+class WatcherGroup:
+    def __init__(self, watchers: List[Any]):
+        self.watchers = watchers
+
+    def stats(self) -> Dict[str, Any]:
+        sources = []
+        for watcher in self.watchers:
+            stats = getattr(watcher, "stats", None)
+            sources.append(stats() if callable(stats) else {"mode": "observer"})
+        return {"mode": "group", "sources": sources}
 
-        try:
-            self.store.load_excel()
-            push_excel_update(self.window, self.store)
-            self._last_notified_mtime = mtime
-            timestamp = now.strftime("%H:%M:%S")
-            print(f"[kanban] Excel change detected ({timestamp}), board updated.")
-        except Exception as exc:
-            print(f"[kanban] Failed to handle Excel change: {exc}")
+    def stop(self):
+        for watcher in self.watchers:
+            watcher.stop()
 
+    def join(self, timeout: Optional[float] = None):
+        for watcher in self.watchers:
+            watcher.join(timeout=timeout)
 
-def start_excel_watcher(
+
+def _start_board_watchers(
     window,
-    store: TaskStore,
+    board: TaskBoard,
     *,
-    debounce_seconds: float = 2.0,
-    use_polling: bool = False,
-    poll_interval: float = 1.0,
-):
+    debounce_seconds: float,
+    use_polling: bool,
+    poll_interval: float,
+    max_poll_interval: float,
+    notifier: Optional[Callable[[TaskStore], None]],
+) -> Optional[WatcherGroup]:
+    # 各ソースは自分のシートだけを再読込し、通知はボード全体の状態で行う。
+    def notify_board(_source: TaskStore):
+        if notifier is not None:
+            notifier(board)
+        else:
+            push_excel_update(window, board)
+
+    handlers = [
+        ExcelFileWatcher(
+            source,
+            window,
+            debounce_seconds=debounce_seconds,
+            notifier=notify_board,
+        )
+        for source in board.stores
+    ]
+
+    if use_polling:
+        pollers = []
+        for handler in handlers:
+            poller = SingleFilePoller(
+                handler,
+                handler.store.excel_path,
+                min_interval=poll_interval,
+                max_interval=max_poll_interval,
+            )
+            poller.start()
+            pollers.append(poller)
+        print(f"[kanban] Started Excel watcher using stat polling on {len(pollers)} source(s).")
+        return WatcherGroup(pollers)
+
     if Observer is None:
         print("[kanban] watchdog is not installed; file watching is disabled.")
         return None
 
-    observer_cls = Observer
-    if use_polling and PollingObserver is not None:
-        observer_cls = PollingObserver
+    observer = Observer()
+    for handler in handlers:
+        observer.schedule(handler, str(handler.store.excel_path.parent), recursive=False)
+    observer.daemon = True
+    observer.start()
+    print(f"[kanban] Started Excel watcher using Observer on {len(handlers)} source(s).")
+    return WatcherGroup([observer])
+
 
-    try:
-        if observer_cls is PollingObserver:
-            observer = observer_cls(timeout=max(0.1, float(poll_interval)))
+class DeadlineScheduler(threading.Thread):
+    # 日付が変わるまで眠り、TaskStore.advance_due_clock の結果を notify へ渡す。
+    # スリープ復帰や時計の変更に備えて check_interval ごとにも日付を確かめる。
+    def __init__(
+        self,
+        store: TaskStore,
+        notify: Callable[[Dict[str, Any]], None],
+        *,
+        check_interval: float = DUE_SCHEDULER_CHECK_SECONDS,
+    ):
+        super().__init__(name="kanban-deadline-scheduler", daemon=True)
+        self.store = store
+        self.notify = notify
+        self.check_interval = max(0.05, float(check_interval))
+        self._today = dt.date.today()
+        self._stop_event = threading.Event()
+
+    def _seconds_until_check(self) -> float:
+        now = dt.datetime.now()
+        midnight = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time())
+        return max(0.05, min(self.check_interval, (midnight - now).total_seconds() + 0.5))
+
+    def tick(self, today: Optional[dt.date] = None) -> Optional[Dict[str, Any]]:
+        today = today or dt.date.today()
+        if today == self._today:
+            return None
+        self._today = today
+        payload = self.store.advance_due_clock(today)
+        try:
+            self.notify(payload)
+        except Exception as exc:
+            print(f"[kanban] Failed to push due-state update: {exc}")
+        return payload
+
+    def run(self):  # pragma: no cover - timing dependent
+        while not self._stop_event.wait(self._seconds_until_check()):
+            self.tick()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class JournalCompactor(threading.Thread):
+    def __init__(
+        self,
+        store: TaskStore,
+        *,
+        interval_seconds: float = 300.0,
+        max_bytes: int = 256 * 1024,
+        check_interval: float = 1.0,
+    ):
+        super().__init__(name="kanban-journal-compactor", daemon=True)
+        self.store = store
+        self.interval_seconds = max(0.0, float(interval_seconds))
+        self.max_bytes = max(0, int(max_bytes))
+        self.check_interval = max(0.05, float(check_interval))
+        self._stop_event = threading.Event()
+
+    def should_compact(self) -> bool:
+        journal = self.store.journal
+        if journal is None or not journal.has_records():
+            return False
+        if self.max_bytes and journal.size_bytes >= self.max_bytes:
+            return True
+        first_pending_at = journal.first_pending_at
+        if self.interval_seconds and first_pending_at is not None:
+            return time.monotonic() - first_pending_at >= self.interval_seconds
+        return False
+
+    def run(self):  # pragma: no cover - timing dependent
+        while not self._stop_event.wait(self.check_interval):
+            if not self.should_compact():
+                continue
+            try:
+                self.store.compact_journal()
+                print("[kanban] Journal compacted into the workbook.")
+            except Exception as exc:
+                print(f"[kanban] Failed to compact journal: {exc}")
+
+    def stop(self):
+        # 未圧縮の操作はジャーナルに残り、次回起動時に再生される。
+        self._stop_event.set()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id: str, kind: str, params: Dict[str, Any], key: str):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.key = key
+        self.status = "queued"
+        self.phase = ""
+        self.done = 0
+        self.total = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = dt.datetime.now()
+        self.started_at: Optional[dt.datetime] = None
+        self.finished_at: Optional[dt.datetime] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def request_cancel(self):
+        self._cancel_event.set()
+
+    def report(self, phase: str, done: int, total: int):
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.id)
+        self.phase = phase
+        self.done = int(done)
+        self.total = int(total)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "phase": self.phase,
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+        }
+        if include_result and self.status == "succeeded":
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    def __init__(self, *, max_workers: int = 2, history_limit: int = 50):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="kanban-job",
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._inflight: Dict[str, str] = {}
+        self._handlers: Dict[str, Callable[[Job], Any]] = {}
+        self._listeners: List[Callable[[Job], None]] = []
+        self._history_limit = max(1, int(history_limit))
+
+    def register(self, kind: str, handler: Callable[[Job], Any]):
+        self._handlers[kind] = handler
+
+    def add_listener(self, listener: Callable[[Job], None]):
+        self._listeners.append(listener)
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Job, bool]:
+        if kind not in self._handlers:
+            raise ValueError(f"未対応のジョブ種別です: {kind}")
+        params = dict(params or {})
+        key = kind + ":" + json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+        with self._lock:
+            inflight_id = self._inflight.get(key)
+            if inflight_id is not None:
+                existing = self._jobs.get(inflight_id)
+                if existing is not None and not existing.finished and not existing.cancel_requested:
+                    return existing, True
+            job = Job(uuid.uuid4().hex, kind, params, key)
+            self._jobs[job.id] = job
+            self._inflight[key] = job.id
+            self._trim_history_locked()
+        self._executor.submit(self._run, job)
+        return job, False
+
+    def _trim_history_locked(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        excess = len(self._jobs) - self._history_limit
+        for job_id in finished[: max(0, excess)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job):
+        if job.cancel_requested:
+            self._finish(job, "cancelled")
+            return
+        job.status = "running"
+        job.started_at = dt.datetime.now()
+        try:
+            job.result = self._handlers[job.kind](job)
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as exc:
+            job.error = str(exc)
+            self._finish(job, "failed")
         else:
-            observer = observer_cls()
-    except TypeError:
-        observer = observer_cls()
+            self._finish(job, "succeeded")
 
-    handler = ExcelFileWatcher(store, window, debounce_seconds=debounce_seconds)
-    watch_path = str(store.excel_path.parent)
-    observer.schedule(handler, watch_path, recursive=False)
-    observer.daemon = True
-    observer.start()
-    mode = "PollingObserver" if observer_cls is PollingObserver else "Observer"
-    print(f"[kanban] Started Excel watcher using {mode} on {watch_path}.")
-    return observer
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = dt.datetime.now()
+        with self._lock:
+            if self._inflight.get(job.key) == job.id:
+                del self._inflight[job.key]
+        for listener in list(self._listeners):
+            try:
+                listener(job)
+            except Exception as exc:
+                print(f"[kanban] Job listener failed: {exc}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(str(job_id))
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.request_cancel()
+        return True
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self):
+        for job in self.list():
+            job.request_cancel()
+        self._executor.shutdown(wait=False)
+
+
+def _resolve_transfer_path(
+    base: Path, name: Any, suffixes: Iterable[str], protected: Iterable[Path]
+) -> Path:
+    # 画面や HTTP から渡されるパスは、取り込み・書き出し用フォルダー直下のファイル名に限る。
+    # 絶対パス・フォルダー区切り・".." は受け付けず、ブック本体と付随ファイルも対象外にする。
+    text = str(name or "").strip()
+    if not text:
+        raise ValueError("ファイル名を指定してください。")
+    if "/" in text or "\\" in text or text in (".", "..") or Path(text).is_absolute() or ":" in text:
+        raise ValueError(f"フォルダーを含まないファイル名を指定してください: {text}")
+    if Path(text).suffix.lower() not in suffixes:
+        raise ValueError(f"対応していない拡張子です: {text} ({' / '.join(suffixes)})")
+    if any(text.lower().endswith(f".{kind}.jsonl") for kind in SIDECAR_KINDS):
+        raise ValueError(f"ボードの付随ファイルは指定できません: {text}")
+    root = base.resolve()
+    target = (root / text).resolve()
+    if target.parent != root or target in {Path(path).resolve() for path in protected}:
+        raise ValueError(f"指定できないファイルです: {text}")
+    return target
 
 
 class JsApi:
-    def __init__(self, store: TaskStore):
+    def __init__(self, store: TaskStore, transfer_dir: Optional[Path] = None):
         self.store = store
+        # 取り込み・書き出しに使うフォルダー。未指定時はブックと同じフォルダー。
+        workbooks = (
+            [source.excel_path for source in store.stores]
+            if isinstance(store, TaskBoard)
+            else [store.excel_path]
+        )
+        self.transfer_dir = Path(transfer_dir) if transfer_dir is not None else Path(workbooks[0]).parent
+        self._protected_paths = workbooks
+        self.watcher = None
+        self.dispatcher: Optional[PushDispatcher] = None
+        self.jobs = JobManager()
+        self.push_wire_format = "rows"
+        self.push_fields: Optional[List[str]] = None
+        self.jobs.register(
+            "reload",
+            lambda job: self._reload_payload(
+                progress=job.report, wire=job.params.get("wire"), fields=job.params.get("fields")
+            ),
+        )
+        self.jobs.register("save", self._run_save_job)
+        self.jobs.register("import", self._run_import_job)
+        self.jobs.register("export", self._run_export_job)
 
-    def get_tasks(self) -> List[Dict[str, Any]]:
-        return self.store.get_tasks()
+    def get_tasks(self, fields: Any = None) -> List[Dict[str, Any]]:
+        return self.store.get_tasks(_normalize_task_fields(fields))
+
+    def get_task_detail(self, no_value: Any) -> Dict[str, Any]:
+        # fields で備考などを省いたページが、編集モーダルを開いたときに 1 件分だけ取得する。
+        return self.store.get_task_detail(int(no_value))
 
     def get_statuses(self) -> List[str]:
         return self.store.get_statuses()
@@ -1094,8 +4938,65 @@ class JsApi:
     def get_validations(self) -> Dict[str, List[str]]:
         return self.store.get_validations()
 
-    def get_state_snapshot(self) -> Dict[str, Any]:
-        return self.store.get_state_snapshot()
+    def get_state_snapshot(self, wire: Any = None, fields: Any = None) -> Dict[str, Any]:
+        return build_update_payload(
+            self.store, _normalize_wire_format(wire), _normalize_task_fields(fields)
+        )
+
+    def get_changes_since(
+        self, version: Any = None, epoch: Any = None, wire: Any = None, fields: Any = None
+    ) -> Dict[str, Any]:
+        # ページ遷移時に、前のページが保持していた版からの差分だけを返す。
+        selected = _normalize_task_fields(fields)
+        result = self.store.get_changes_since(version, epoch, selected)
+        if result["mode"] != "full":
+            if selected is not None:
+                result["fields"] = list(selected)
+            return result
+        return {
+            "mode": "full",
+            **build_update_payload(self.store, _normalize_wire_format(wire), selected),
+        }
+
+    def get_due_states(self) -> Dict[str, Any]:
+        return self.store.get_due_states()
+
+    def suggest(self, column: Any, prefix: Any = "", limit: Any = None) -> List[Dict[str, Any]]:
+        # 入力欄の候補。入力規則の一覧と列の値から、前方一致する値を順位付けして返す。
+        return self.store.suggest(
+            str(column or ""),
+            "" if prefix is None else str(prefix),
+            SUGGEST_LIMIT_DEFAULT if limit is None else int(limit),
+        )
+
+    def get_flow_history(self, start: Any = None, end: Any = None) -> Dict[str, Any]:
+        # 累積フロー図・バーンダウン用の日別件数 (YYYY-MM-DD の範囲、省略時は記録の最初から今日まで)。
+        return self.store.get_flow_history(start, end)
+
+    def get_wire_formats(self) -> List[str]:
+        return list(WIRE_FORMATS)
+
+    def get_push_stats(self) -> Dict[str, Any]:
+        # 自動プッシュの未送信件数と、まとめた・捨てた・時間切れになった件数。
+        if self.dispatcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.dispatcher.stats()}
+
+    def undo(self) -> Dict[str, Any]:
+        # 直前のタスクの追加・更新・削除を 1 手戻す。戻した行と履歴の状態を返す。
+        return self.store.undo()
+
+    def redo(self) -> Dict[str, Any]:
+        return self.store.redo()
+
+    def get_undo_state(self) -> Dict[str, Any]:
+        return self.store.get_undo_state()
+
+    def set_push_wire_format(self, wire: Any, fields: Any = None) -> str:
+        # PyWebView の自動プッシュで使う形式と列。ページ側が対応を申告したときだけ切り替える。
+        self.push_wire_format = _normalize_wire_format(wire)
+        self.push_fields = _normalize_task_fields(fields)
+        return self.push_wire_format
 
     def update_validations(self, payload: Any) -> Dict[str, Any]:
         data = json.loads(payload) if isinstance(payload, str) else payload
@@ -1120,17 +5021,682 @@ class JsApi:
     def delete_task(self, no_value: Any) -> bool:
         return self.store.delete_task(int(no_value))
 
-    def save_excel(self) -> str:
+    def save_excel(self, only_if_changed: Any = False) -> Any:
+        # only_if_changed の場合は save_if_changed の結果 ({"saved", "path", "counts", ...}) を返し、
+        # 保存済みの内容から変わっていなければ書き込みもバックアップも行わない。
+        if only_if_changed:
+            return self.store.save_if_changed()
         return self.store.save_excel()
 
-    def reload_from_excel(self) -> Dict[str, Any]:
-        self.store.load_excel()
+    def _run_save_job(self, job: Job) -> Any:
+        if job.params.get("only_if_changed"):
+            return self.store.save_if_changed(progress=job.report)
+        return self.store.save_excel(progress=job.report)
+
+    def get_pending_changes(self, limit: Any = None) -> Dict[str, Any]:
+        return self.store.get_pending_changes(
+            PENDING_CHANGES_LIMIT if limit is None else int(limit)
+        )
+
+    def reload_from_excel(self, wire: Any = None, fields: Any = None) -> Dict[str, Any]:
+        return self._reload_payload(wire=wire, fields=fields)
+
+    def get_freshness(self) -> Dict[str, Any]:
+        return self.store.get_freshness()
+
+    def reload_if_stale(self, wire: Any = None, fields: Any = None) -> Dict[str, Any]:
+        # 起動直後のページ初期化用。TaskStore の生成時に読み込んだブックから変わっていなければ
+        # 再解析せず、現在の状態 (再生済みのジャーナルを含む) をそのまま返す。
+        freshness = self.store.get_freshness()
+        if freshness["fresh"]:
+            payload = build_update_payload(
+                self.store, _normalize_wire_format(wire), _normalize_task_fields(fields)
+            )
+            return {"ok": True, "reloaded": False, "freshness": freshness, **payload}
+        payload = self._reload_payload(wire=wire, fields=fields)
+        return {**payload, "reloaded": True, "freshness": self.store.get_freshness()}
+
+    def _reload_payload(
+        self,
+        progress: Optional[ProgressCallback] = None,
+        wire: Any = None,
+        fields: Any = None,
+    ) -> Dict[str, Any]:
+        selected = _normalize_task_fields(fields)
+        self.store.load_excel(progress=progress)
         return {
             "ok": True,
-            "tasks": self.store.get_tasks(),
-            "statuses": self.store.get_statuses(),
-            "validations": self.store.get_validations(),
+            **build_update_payload(self.store, _normalize_wire_format(wire), selected),
+        }
+
+    def _run_import_job(self, job: Job) -> Dict[str, Any]:
+        params = dict(job.params)
+        path = params.pop("path", None)
+        if not path:
+            raise ValueError("取り込み元の path を指定してください。")
+        target = _resolve_transfer_path(self.transfer_dir, path, IMPORT_SUFFIXES, self._protected_paths)
+        kwargs = {
+            key: params[key]
+            for key in ("mapping", "sheet_name", "chunk_size", "extend_validations")
+            if key in params
+        }
+        if isinstance(self.store, TaskBoard) and "source" in params:
+            kwargs["source"] = params["source"]
+        return self.store.import_tasks(target, progress=job.report, **kwargs)
+
+    def _run_export_job(self, job: Job) -> Dict[str, Any]:
+        params = dict(job.params)
+        path = params.get("path")
+        if not path:
+            raise ValueError("出力先の path を指定してください。")
+        return self.store.export_tasks(
+            _resolve_transfer_path(self.transfer_dir, path, EXPORT_FORMATS, self._protected_paths),
+            fmt=params.get("format"),
+            filters=params.get("filters"),
+            include_hidden=bool(params.get("include_hidden", True)),
+            progress=job.report,
+        )
+
+    def export_tasks(self, path: str, fmt: Any = None, filters: Any = None) -> Dict[str, Any]:
+        filter_data = json.loads(filters) if isinstance(filters, str) else filters
+        target = _resolve_transfer_path(self.transfer_dir, path, EXPORT_FORMATS, self._protected_paths)
+        result = self.store.export_tasks(target, fmt=fmt or None, filters=filter_data or None)
+        return {"ok": True, **result}
+
+    def get_watcher_stats(self) -> Dict[str, Any]:
+        stats = getattr(self.watcher, "stats", None)
+        if callable(stats):
+            return stats()
+        return {"mode": "observer" if self.watcher is not None else "disabled"}
+
+    def start_job(self, kind: str, params: Any = None) -> Dict[str, Any]:
+        data = json.loads(params) if isinstance(params, str) else params
+        job, deduplicated = self.jobs.submit(str(kind), data or {})
+        return {"ok": True, "deduplicated": deduplicated, "job": job.to_dict(include_result=False)}
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {"ok": False, "error": f"ジョブ {job_id} は存在しません。"}
+        return {"ok": True, "job": job.to_dict()}
+
+    def cancel_job(self, job_id: str) -> bool:
+        return self.jobs.cancel(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        return [job.to_dict(include_result=False) for job in self.jobs.list()]
+
+    def archive_completed_tasks(self, older_than_days: Any = 30, include_undated: Any = False) -> Dict[str, Any]:
+        archived = self.store.archive_completed_tasks(
+            int(older_than_days), include_undated=bool(include_undated)
+        )
+        return {"ok": True, "archived": archived, **build_update_payload(self.store)}
+
+    def get_archived_tasks(self, offset: Any = 0, limit: Any = 100) -> Dict[str, Any]:
+        return {"ok": True, **self.store.get_archived_tasks(int(offset), int(limit))}
+
+    def get_sources(self) -> List[Dict[str, Any]]:
+        return self.store.get_sources()
+
+
+BATCH_OPERATIONS = ("add", "update", "move", "delete")
+
+
+def _resolve_batch_target(store: TaskStore, record: Dict[str, Any]) -> int:
+    row_id = str(record.get("id") or "").strip()
+    if row_id:
+        no = store.find_task_no(row_id)
+        if no is None:
+            raise KeyError(f"id={row_id} は存在しません。")
+        return no
+    if record.get("no") is None:
+        raise ValueError("no または id を指定してください。")
+    return int(record["no"])
+
+
+def _apply_batch_record(store: TaskStore, record: Dict[str, Any]):
+    op = record.get("op")
+    if op == "add":
+        return store.add_task(record.get("task") or {})
+    if op == "update":
+        return store.update_task(_resolve_batch_target(store, record), record.get("patch") or {})
+    if op == "move":
+        return store.move_task(_resolve_batch_target(store, record), str(record.get("status") or ""))
+    if op == "delete":
+        no = _resolve_batch_target(store, record)
+        if not store.delete_task(no):
+            raise KeyError(f"No={no} は存在しません。")
+        return True
+    raise ValueError(f"未対応の操作です: {op!r} (対応: {', '.join(BATCH_OPERATIONS)})")
+
+
+def apply_batch_operations(
+    store: TaskStore,
+    lines: Iterable[str],
+    *,
+    save: bool = True,
+    max_errors: int = 100,
+) -> Dict[str, Any]:
+    # 1 行 1 操作の JSONL を順に適用し、最後に 1 回だけ保存する。
+    # 失敗した行は記録して読み飛ばし、残りの操作は続行する。
+    # 前回の画面操作のジャーナルは TaskStore の生成時に再生済みで、保存で一緒に書き込まれる。
+    with store.journal_suspended():
+        return _apply_batch_lines(store, lines, save=save, max_errors=max_errors)
+
+
+def _apply_batch_lines(
+    store: TaskStore, lines: Iterable[str], *, save: bool, max_errors: int
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    applied = 0
+    failed = 0
+    errors: List[Dict[str, Any]] = []
+    for line_no, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text:
+            continue
+        op = None
+        try:
+            record = json.loads(text)
+            if not isinstance(record, dict):
+                raise ValueError("各行は JSON オブジェクトである必要があります。")
+            op = record.get("op")
+            _apply_batch_record(store, record)
+            applied += 1
+        except (KeyError, TypeError, ValueError) as exc:
+            failed += 1
+            message = exc.args[0] if isinstance(exc, KeyError) and exc.args else str(exc)
+            if len(errors) < max_errors:
+                errors.append({"line": line_no, "op": op, "error": str(message)})
+    apply_seconds = time.perf_counter() - started
+
+    saved_path: Optional[str] = None
+    save_seconds = 0.0
+    if save and applied:
+        save_started = time.perf_counter()
+        saved_path = store.save_excel(backup=False)
+        save_seconds = time.perf_counter() - save_started
+    total = applied + failed
+    return {
+        "applied": applied,
+        "failed": failed,
+        "errors": errors,
+        "saved": saved_path,
+        "apply_seconds": round(apply_seconds, 4),
+        "save_seconds": round(save_seconds, 4),
+        "ops_per_second": round(total / apply_seconds, 1) if apply_seconds > 0 else None,
+    }
+
+
+def run_batch(store: TaskStore, source: str, *, save: bool = True) -> int:
+    if source == "-":
+        report = apply_batch_operations(store, sys.stdin, save=save)
+    else:
+        with open(Path(source).expanduser(), "r", encoding="utf-8-sig") as fp:
+            report = apply_batch_operations(store, fp, save=save)
+    for error in report["errors"]:
+        print(f"[kanban] line {error['line']} ({error['op']}): {error['error']}", file=sys.stderr)
+    print(json.dumps(report, ensure_ascii=False))
+    return 1 if report["failed"] else 0
+
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+SERVER_MAX_BODY_BYTES = 16 * 1024 * 1024
+SERVER_MAX_WS_FRAME_BYTES = 1024 * 1024
+# 起動ごとのトークン。配信する HTML に埋め込み、API 呼び出しと WebSocket 接続で照合する。
+# ページを開ける人には誰にでも渡るため、他サイトからの呼び出しを防ぐだけで利用者の認証ではない。
+SERVER_TOKEN_HEADER = "x-kanban-token"
+SERVER_TOKEN_META = "kanban-token"
+SERVER_LOOPBACK_NAMES = ("localhost", "127.0.0.1", "[::1]")
+SERVER_MUTATING_METHODS = {
+    "add_task",
+    "update_task",
+    "move_task",
+    "delete_task",
+    "undo",
+    "redo",
+    "update_validations",
+    "save_excel",
+    "reload_from_excel",
+    "archive_completed_tasks",
+}
+# 結果によっては状態を変えない呼び出し。返り値の指定キーが真のときだけ他のクライアントへ通知する。
+SERVER_CONDITIONAL_MUTATING_METHODS = {"reload_if_stale": "reloaded"}
+SERVER_MUTATING_JOB_KINDS = {"reload", "import"}
+STATIC_CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".ico": "image/x-icon",
+}
+HTTP_REASONS = {
+    101: "Switching Protocols",
+    200: "OK",
+    302: "Found",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+}
+
+
+def _encode_ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < (1 << 16):
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _is_loopback_host(host: str) -> bool:
+    name = str(host or "").strip().strip("[]").lower()
+    if name == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(name).is_loopback
+    except ValueError:
+        return False
+
+
+def _inject_server_token(html: bytes, token: str) -> bytes:
+    meta = f'<meta name="{SERVER_TOKEN_META}" content="{token}">'.encode("ascii")
+    lower = html.lower()
+    pos = lower.find(b"<head")
+    if pos >= 0:
+        end = lower.find(b">", pos)
+        if end >= 0:
+            return html[: end + 1] + meta + html[end + 1 :]
+    return meta + html
+
+
+async def _read_ws_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    masked = bool(second & 0x80)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > SERVER_MAX_WS_FRAME_BYTES:
+        raise ConnectionError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if masked else b""
+    data = await reader.readexactly(length) if length else b""
+    if masked:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return opcode, data
+
+
+class KanbanServer:
+    def __init__(
+        self,
+        store: TaskStore,
+        *,
+        static_root: Path,
+        index_path: str = "pages/index.html",
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        allow_remote: bool = False,
+        transfer_dir: Optional[Path] = None,
+    ):
+        if not allow_remote and not _is_loopback_host(host):
+            raise ValueError(
+                f"ループバック以外のアドレス ({host}) で待ち受けるには --allow-remote を指定してください。"
+            )
+        self.store = store
+        self.api = JsApi(store, transfer_dir)
+        self.static_root = static_root.resolve()
+        self.index_path = index_path.lstrip("/")
+        self.host = host
+        self.port = int(port)
+        self.allow_remote = allow_remote
+        if not _is_loopback_host(host):
+            print(
+                f"[kanban] Warning: serving on {host} without authentication; "
+                "anyone who can reach this port can read and edit the board"
+            )
+        # 他のサイトのページから API を呼ばれないよう、起動ごとのトークンを要求する。
+        self.token = secrets.token_urlsafe(32)
+        # TaskStore への呼び出しはすべて単一スレッドで直列化する。
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kanban-store")
+        self._methods: Dict[str, Callable[..., Any]] = {
+            name: getattr(self.api, name)
+            for name in dir(self.api)
+            if not name.startswith("_") and callable(getattr(self.api, name))
         }
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.api.jobs.add_listener(self._on_job_finished)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        print(f"[kanban] Serving board on http://{self.host}:{self.port}/{self.index_path}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._clients):
+            await self._close_client(writer)
+        self.api.jobs.shutdown()
+        self._executor.shutdown(wait=False)
+
+    def _on_job_finished(self, job: Job):
+        if job.status == "succeeded" and job.kind in SERVER_MUTATING_JOB_KINDS:
+            self.notify_threadsafe()
+
+    def notify_threadsafe(self, store: Optional[TaskStore] = None):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        text = json.dumps(build_update_payload(self.store), ensure_ascii=False, default=str)
+        asyncio.run_coroutine_threadsafe(self.broadcast(text), loop)
+
+    def notify_due_threadsafe(self, payload: Dict[str, Any]):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        text = json.dumps({"type": "due", **payload}, ensure_ascii=False, default=str)
+        asyncio.run_coroutine_threadsafe(self.broadcast(text), loop)
+
+    async def broadcast(self, text: str):
+        frame = _encode_ws_frame(text.encode("utf-8"))
+        for writer in list(self._clients):
+            try:
+                writer.write(frame)
+                await asyncio.wait_for(writer.drain(), timeout=5.0)
+            except (ConnectionError, asyncio.TimeoutError, RuntimeError):
+                await self._close_client(writer)
+
+    async def _close_client(self, writer: asyncio.StreamWriter):
+        self._clients.discard(writer)
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except (ConnectionError, RuntimeError):
+            pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        upgraded = False
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, query, headers, body = request
+            rejected = self._check_host_and_origin(headers)
+            if rejected is not None:
+                await self._write_response(writer, *self._json_response(403, {"ok": False, "error": rejected}))
+                return
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                if not self._token_matches((query.get("token") or [""])[0]):
+                    await self._write_response(writer, 403, "text/plain", b"")
+                    return
+                upgraded = True
+                await self._serve_websocket(reader, writer, headers)
+                return
+            status, content_type, payload, extra_headers = await self._dispatch(
+                method, path, headers, body
+            )
+            await self._write_response(writer, status, content_type, payload, extra_headers)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            if not upgraded:
+                try:
+                    writer.close()
+                    await writer.wait_closed()
+                except (ConnectionError, RuntimeError):
+                    pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            return None
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise ConnectionError("malformed request line")
+        method, target, _version = parts
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+            if len(headers) > 100:
+                raise ConnectionError("too many headers")
+        length = int(headers.get("content-length") or 0)
+        if length > SERVER_MAX_BODY_BYTES:
+            raise ConnectionError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+        parts = urlsplit(target)
+        return method.upper(), unquote(parts.path), parse_qs(parts.query), headers, body
+
+    def _allowed_hosts(self) -> Set[str]:
+        names = SERVER_LOOPBACK_NAMES if _is_loopback_host(self.host) else (self.host,)
+        return {f"{name}:{self.port}".lower() for name in names}
+
+    def _check_host_and_origin(self, headers: Dict[str, str]) -> Optional[str]:
+        # DNS リバインディング対策として Host を、他サイトからの呼び出し対策として Origin を確かめる。
+        # --allow-remote でワイルドカード待ち受けする場合は Host が決まらないため、
+        # Origin が Host と同じであることとトークンだけで判断する。
+        host = headers.get("host", "").strip().lower()
+        if not host:
+            return "Host ヘッダーがありません。"
+        if not (self.allow_remote and not _is_loopback_host(self.host)) and host not in self._allowed_hosts():
+            return f"許可されていないホストです: {host}"
+        origin = headers.get("origin")
+        if origin is not None:
+            parts = urlsplit(origin.strip().lower())
+            if parts.scheme not in ("http", "https") or parts.netloc != host:
+                return f"許可されていないオリジンです: {origin}"
+        return None
+
+    def _token_matches(self, token: Any) -> bool:
+        return hmac.compare_digest(str(token or "").encode("utf-8"), self.token.encode("ascii"))
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        payload: bytes,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ):
+        lines = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Cache-Control: no-store",
+            "Connection: close",
+        ]
+        for name, value in (extra_headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+    def _json_response(self, status: int, data: Any):
+        payload = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        return status, "application/json; charset=utf-8", payload, None
+
+    async def _dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        if path in ("", "/"):
+            return 302, "text/plain", b"", {"Location": "/" + self.index_path}
+        if path == "/api" or path.startswith("/api/"):
+            if not self._token_matches(headers.get(SERVER_TOKEN_HEADER)):
+                return self._json_response(403, {"ok": False, "error": "トークンが一致しません。"})
+        if path == "/api":
+            return self._json_response(200, {"methods": sorted(self._methods)})
+        if path.startswith("/api/"):
+            if method != "POST":
+                return self._json_response(405, {"ok": False, "error": "POST で呼び出してください。"})
+            content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                return self._json_response(
+                    415, {"ok": False, "error": "Content-Type: application/json で呼び出してください。"}
+                )
+            return await self._call_api(path[len("/api/"):], body)
+        if method not in ("GET", "HEAD"):
+            return 405, "text/plain", b"", None
+        return self._serve_static(path)
+
+    async def _call_api(self, name: str, body: bytes):
+        handler = self._methods.get(name)
+        if handler is None:
+            return self._json_response(404, {"ok": False, "error": f"{name} は存在しません。"})
+        try:
+            data = json.loads(body.decode("utf-8")) if body else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            return self._json_response(400, {"ok": False, "error": f"JSON を解析できません: {exc}"})
+        args = data.get("args", []) if isinstance(data, dict) else data
+        if not isinstance(args, list):
+            return self._json_response(400, {"ok": False, "error": "args は配列で指定してください。"})
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, functools.partial(handler, *args))
+        except (KeyError, ValueError, TypeError) as exc:
+            message = exc.args[0] if isinstance(exc, KeyError) and exc.args else str(exc)
+            return self._json_response(400, {"ok": False, "error": str(message)})
+        except Exception as exc:
+            return self._json_response(500, {"ok": False, "error": str(exc)})
+
+        changed = name in SERVER_MUTATING_METHODS
+        if name in SERVER_CONDITIONAL_MUTATING_METHODS:
+            changed = isinstance(result, dict) and bool(result.get(SERVER_CONDITIONAL_MUTATING_METHODS[name]))
+        if changed and self._clients:
+            text = await loop.run_in_executor(
+                self._executor,
+                lambda: json.dumps(build_update_payload(self.store), ensure_ascii=False, default=str),
+            )
+            await self.broadcast(text)
+        return self._json_response(200, {"ok": True, "result": result})
+
+    def _serve_static(self, path: str):
+        try:
+            target = (self.static_root / path.lstrip("/")).resolve()
+            target.relative_to(self.static_root)
+        except (OSError, ValueError):
+            return 403, "text/plain", b"", None
+        if not target.is_file():
+            return 404, "text/plain; charset=utf-8", b"Not Found", None
+        content_type = STATIC_CONTENT_TYPES.get(target.suffix.lower(), "application/octet-stream")
+        payload = target.read_bytes()
+        if target.suffix.lower() == ".html":
+            payload = _inject_server_token(payload, self.token)
+        return 200, content_type, payload, None
+
+    async def _serve_websocket(self, reader, writer, headers: Dict[str, str]):
+        key = headers.get("sec-websocket-key", "")
+        if not key:
+            await self._write_response(writer, 400, "text/plain", b"")
+            writer.close()
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest())
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept.decode('ascii')}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+        self._clients.add(writer)
+        try:
+            while True:
+                opcode, data = await _read_ws_frame(reader)
+                if opcode == 0x8:
+                    writer.write(_encode_ws_frame(data[:2], opcode=0x8))
+                    await writer.drain()
+                    break
+                if opcode == 0x9:
+                    writer.write(_encode_ws_frame(data, opcode=0xA))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await self._close_client(writer)
+
+
+def run_server(
+    store: TaskStore,
+    *,
+    static_root: Path,
+    index_path: str,
+    host: str,
+    port: int,
+    watch: bool = True,
+    debounce_seconds: float = 2.0,
+    use_polling: bool = False,
+    poll_interval: float = 1.0,
+    max_poll_interval: float = 8.0,
+    allow_remote: bool = False,
+    transfer_dir: Optional[Path] = None,
+):  # pragma: no cover - blocking runtime loop
+    server = KanbanServer(
+        store,
+        static_root=static_root,
+        index_path=index_path,
+        host=host,
+        port=port,
+        allow_remote=allow_remote,
+        transfer_dir=transfer_dir,
+    )
+
+    async def _run():
+        await server.start()
+        scheduler = DeadlineScheduler(store, server.notify_due_threadsafe)
+        scheduler.start()
+        observer = None
+        if watch:
+            observer = start_excel_watcher(
+                None,
+                store,
+                debounce_seconds=debounce_seconds,
+                use_polling=use_polling,
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+                notifier=server.notify_threadsafe,
+            )
+            server.api.watcher = observer
+        try:
+            await server.serve_forever()
+        finally:
+            scheduler.stop()
+            if observer is not None:
+                observer.stop()
+                observer.join(timeout=5)
+            await server.close()
+
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        print("[kanban] Server stopped.")
 
 
 def main():
@@ -1154,13 +5720,19 @@ def main():
     parser.add_argument(
         "--watch-polling",
         action="store_true",
-        help="watchdog の PollingObserver を使用します (ネットワークドライブ等向け)",
+        help="対象ブックだけを stat するポーリング監視を使用します (ネットワークドライブ等向け)",
     )
     parser.add_argument(
         "--watch-interval",
         type=float,
         default=1.0,
-        help="PollingObserver 利用時の監視間隔（秒）",
+        help="ポーリング監視の最短間隔（秒）。変更検知直後はこの間隔で確認します",
+    )
+    parser.add_argument(
+        "--watch-max-interval",
+        type=float,
+        default=8.0,
+        help="ポーリング監視で変更が無い間に間隔を延ばす上限（秒）",
     )
     parser.add_argument(
         "--watch-debounce",
@@ -1168,6 +5740,96 @@ def main():
         default=2.0,
         help="アプリ自身の保存直後に発生したイベントを無視する猶予時間（秒）",
     )
+    parser.add_argument(
+        "--source",
+        action="append",
+        default=None,
+        help="ボードに含めるブック (\"パス\" または \"パス#シート名\")。複数指定すると 1 つのボードにまとめます",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="操作ジャーナル (ブック横の .journal.jsonl) への追記を無効化します",
+    )
+    parser.add_argument(
+        "--journal-interval",
+        type=float,
+        default=300.0,
+        help="ジャーナルを Excel へ圧縮書き込みする間隔（秒、0 で無効）",
+    )
+    parser.add_argument(
+        "--journal-max-bytes",
+        type=int,
+        default=256 * 1024,
+        help="ジャーナルがこのサイズ（バイト）に達したら Excel へ圧縮書き込みします (0 で無効)",
+    )
+    parser.add_argument(
+        "--no-change-log",
+        action="store_true",
+        help="他インスタンスとの差分共有用の変更ログ (ブック横の .changes.jsonl) を無効化します",
+    )
+    parser.add_argument(
+        "--undo-limit-kb",
+        type=int,
+        default=UNDO_MAX_BYTES // 1024,
+        help="元に戻す / やり直す履歴に使うメモリの上限 (KB、ソースごと)",
+    )
+    parser.add_argument(
+        "--no-flow-history",
+        action="store_true",
+        help="累積フロー図・バーンダウン用の日別件数 (*.analytics.jsonl) を記録しません",
+    )
+    parser.add_argument(
+        "--archive-days",
+        type=int,
+        default=0,
+        help="起動時に期限からこの日数以上経過した完了タスクをアーカイブシートへ移します (0 で無効)",
+    )
+    parser.add_argument(
+        "--inline-parse",
+        action="store_true",
+        help="Excel の再読込をワーカープロセスではなく同一プロセスで解析します",
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="ウィンドウを開かず、JSONL の操作 (add/update/move/delete) を適用して保存します (\"-\" で標準入力)",
+    )
+    parser.add_argument(
+        "--batch-dry-run",
+        action="store_true",
+        help="--batch の操作を検証するだけで Excel へは保存しません",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="ウィンドウを開かず、ローカル HTTP/WebSocket サーバーとして複数ブラウザーへボードを配信します",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="--serve 利用時に待ち受けるホスト",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="--serve 利用時に待ち受けるポート番号",
+    )
+    parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help=(
+            "--host にループバック以外のアドレスを指定することを許可します。トークンは配信する HTML に埋め込まれるため"
+            "他サイトからの呼び出しを防ぐだけで利用者の認証にはならず、ポートに届く誰もがタスクの読み書き・取り込み・"
+            "書き出しを行えます。信頼できるネットワークでのみ使用してください"
+        ),
+    )
+    parser.add_argument(
+        "--transfer-dir",
+        default=None,
+        help="画面からの取り込み・エクスポートに使うフォルダー (未指定時はブックと同じフォルダー)",
+    )
     parser.add_argument(
         "--config",
         default=None,
@@ -1179,6 +5841,8 @@ def main():
         help="Tkinter による起動画面を表示せず、コマンドライン引数の値を使用します",
     )
     args = parser.parse_args()
+    if args.serve and not args.allow_remote and not _is_loopback_host(args.host):
+        parser.error(f"ループバック以外のアドレス ({args.host}) で待ち受けるには --allow-remote を指定してください。")
 
     gui_fields = [
         "excel",
@@ -1191,6 +5855,7 @@ def main():
         "no_watch",
         "watch_polling",
         "watch_interval",
+        "watch_max_interval",
         "watch_debounce",
     ]
 
@@ -1211,7 +5876,7 @@ def main():
             if current_value == default_value:
                 current_options[field] = stored_options[field]
 
-    if not args.no_gui:
+    if not args.no_gui and not args.serve and not args.batch:
         selected_options = _open_option_dialog(current_options)
         if selected_options is None:
             print("[kanban] 起動がキャンセルされました。")
@@ -1226,13 +5891,114 @@ def main():
     args.sheet = (args.sheet or "").strip() or None
 
     excel_path = Path(args.excel).expanduser().resolve()
+
+    if args.batch:
+        # クラッシュした画面操作のジャーナルが残っていれば、生成時に再生してから操作を適用する。
+        # 保存でジャーナルは空になり、次の起動で古い操作が二重に当たることはない。
+        # バッチの操作自体は最後に 1 回保存するため、操作ごとのジャーナルには書かない。
+        if args.source:
+            batch_store = TaskBoard(
+                [_parse_source_spec(spec) for spec in args.source],
+                enable_journal=True,
+                enable_change_log=not args.no_change_log,
+                enable_flow_history=not args.no_flow_history,
+            )
+        else:
+            batch_store = TaskStore(
+                excel_path,
+                sheet_name=args.sheet,
+                enable_journal=True,
+                enable_change_log=not args.no_change_log,
+                enable_flow_history=not args.no_flow_history,
+            )
+        try:
+            exit_code = run_batch(batch_store, args.batch, save=not args.batch_dry_run)
+        finally:
+            batch_store.close()
+        sys.exit(exit_code)
+
+    transfer_dir = Path(args.transfer_dir).expanduser().resolve() if args.transfer_dir else None
+
     html_path = Path(args.html).expanduser().resolve()
     if not html_path.exists():
         raise FileNotFoundError(f"HTML が見つかりません: {html_path}")
 
-    store = TaskStore(excel_path, sheet_name=args.sheet)
-    api = JsApi(store)
+    if args.source:
+        store = TaskBoard(
+            [_parse_source_spec(spec) for spec in args.source],
+            enable_journal=not args.no_journal,
+            enable_change_log=not args.no_change_log,
+            parse_in_subprocess=not args.inline_parse,
+            undo_max_bytes=max(0, args.undo_limit_kb) * 1024,
+            enable_flow_history=not args.no_flow_history,
+        )
+        sources = list(store.stores)
+        print(f"[kanban] Loaded {len(sources)} source(s): {', '.join(store.labels)}")
+    else:
+        store = TaskStore(
+            excel_path,
+            sheet_name=args.sheet,
+            enable_journal=not args.no_journal,
+            enable_change_log=not args.no_change_log,
+            parse_in_subprocess=not args.inline_parse,
+            undo_max_bytes=max(0, args.undo_limit_kb) * 1024,
+            enable_flow_history=not args.no_flow_history,
+        )
+        sources = [store]
+    store.warm_up_parse_worker()
+    if not args.no_flow_history:
+        # 初回だけ既存のバックアップから日別件数を補う。起動はこれを待たない。
+        threading.Thread(
+            target=store.backfill_flow_history, name="kanban-flow-backfill", daemon=True
+        ).start()
+    if args.archive_days > 0:
+        try:
+            archived = store.archive_completed_tasks(args.archive_days)
+        except ValueError as exc:
+            # ジャーナルから未保存の操作を再生した直後など。起動は続ける。
+            print(f"[kanban] Skipped archiving: {exc}")
+        else:
+            if archived:
+                print(f"[kanban] Archived {archived} completed task(s)")
+
+    compactors: List[JournalCompactor] = []
+    for source in sources:
+        if source.journal is None:
+            continue
+        compactor = JournalCompactor(
+            source,
+            interval_seconds=args.journal_interval,
+            max_bytes=args.journal_max_bytes,
+        )
+        compactor.start()
+        compactors.append(compactor)
+
+    if args.serve:
+        static_root = html_path.parent.parent
+        try:
+            index_path = html_path.relative_to(static_root).as_posix()
+        except ValueError:
+            index_path = html_path.name
+        run_server(
+            store,
+            static_root=static_root,
+            index_path=index_path,
+            host=args.host,
+            port=args.port,
+            watch=not args.no_watch,
+            debounce_seconds=max(0.0, float(args.watch_debounce)),
+            use_polling=args.watch_polling,
+            poll_interval=float(args.watch_interval),
+            max_poll_interval=float(args.watch_max_interval),
+            allow_remote=args.allow_remote,
+            transfer_dir=transfer_dir,
+        )
+        for compactor in compactors:
+            compactor.stop()
+        store.close()
+        return
 
+    api = JsApi(store, transfer_dir)
     window = webview.create_window(
         title=args.title,
         url=html_path.as_uri(),
@@ -1240,6 +6006,11 @@ def main():
         height=args.height,
         js_api=api,
     )
+    dispatcher = PushDispatcher(window)
+    dispatcher.start()
+    api.dispatcher = dispatcher
+    scheduler = DeadlineScheduler(store, dispatcher.push_due)
+    scheduler.start()
 
     def bootstrap_file_watcher():  # pragma: no cover - runtime behaviour
         if args.no_watch:
@@ -1252,14 +6023,22 @@ def main():
             debounce_seconds=max(0.0, float(args.watch_debounce)),
             use_polling=args.watch_polling,
             poll_interval=float(args.watch_interval),
+            max_poll_interval=float(args.watch_max_interval),
+            notifier=lambda changed: dispatcher.push_state(
+                changed, lambda: api.push_wire_format, lambda: api.push_fields
+            ),
         )
         if observer is None:
             return
+        api.watcher = observer
 
         def _stop_observer():
             try:
                 observer.stop()
                 observer.join(timeout=5)
+                stats = getattr(observer, "stats", None)
+                if callable(stats):
+                    print(f"[kanban] Excel watcher stats: {stats()}")
                 print("[kanban] Excel watcher stopped.")
             except Exception:
                 pass
@@ -1276,6 +6055,13 @@ def main():
         private_mode=False,
     )
 
+    api.jobs.shutdown()
+    scheduler.stop()
+    dispatcher.stop()
+    for compactor in compactors:
+        compactor.stop()
+    store.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# 期限・優先度などの列単位コーデックとセル単位変換の速度比較。
+# 出力が一致することを確認してから所要時間を表示する。
+#   python benchmarks/bench_column_codecs.py [行数]
+from __future__ import annotations
+
+import datetime as dt
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.backend import TASK_COLUMNS, TaskStore  # noqa: E402
+
+
+def build_frame(store: TaskStore, rows: int) -> pd.DataFrame:
+    rng = random.Random(0)
+    base = dt.date(2024, 1, 1)
+    data = {
+        "ステータス": [rng.choice(["未着手", "進行中", "完了", "保留"]) for _ in range(rows)],
+        "大分類": [f"分類{rng.randrange(12)}" for _ in range(rows)],
+        "中分類": [f"小分類{rng.randrange(40)}" for _ in range(rows)],
+        "タスク": [f"タスク{i}" for i in range(rows)],
+        "担当者": [rng.choice(["Alice", "Bob", "Carol", "Dave", None]) for _ in range(rows)],
+        "優先度": [rng.choice(["高", "中", "低", 1, 2, 3, None]) for _ in range(rows)],
+        "期限": [
+            base + dt.timedelta(days=rng.randrange(730)) if rng.random() > 0.1 else None
+            for _ in range(rows)
+        ],
+        "備考": [rng.choice(["", "メモ", None]) for _ in range(rows)],
+    }
+    df, = store._encode_categorical_frames(pd.DataFrame(data, columns=TASK_COLUMNS))
+    return df
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TaskStore(Path(tmp) / "bench.xlsx", enable_journal=False, enable_change_log=False)
+        df = build_frame(store, rows)
+
+        per_cell, per_cell_s = timed(lambda: [store._format_row(i, df.iloc[i]) for i in range(len(df))])
+        columnar, columnar_s = timed(lambda: store._format_frame(df))
+        assert per_cell == columnar, "JSON 変換の結果が一致しません"
+        print(f"format  rows={rows}: per-cell {per_cell_s:.3f}s / columnar {columnar_s:.3f}s")
+
+        def excel_per_cell():
+            return [
+                [store._to_excel_value(col, value) for col, value in zip(TASK_COLUMNS, row)]
+                for row in df[TASK_COLUMNS].itertuples(index=False, name=None)
+            ]
+
+        def excel_columnar():
+            columns = [store._excel_column_values(col, df[col]) for col in TASK_COLUMNS]
+            return [list(values) for values in zip(*columns)]
+
+        per_cell, per_cell_s = timed(excel_per_cell)
+        columnar, columnar_s = timed(excel_columnar)
+        assert per_cell == columnar, "Excel 変換の結果が一致しません"
+        print(f"excel   rows={rows}: per-cell {per_cell_s:.3f}s / columnar {columnar_s:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
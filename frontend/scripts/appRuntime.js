@@ -68,6 +68,95 @@
     safeSessionRemove(INITIAL_LOAD_FLAG_KEY);
   }
 
+  function isServedOverHttp() {
+    const protocol = global.location?.protocol;
+    return protocol === 'http:' || protocol === 'https:';
+  }
+
+  function getServerToken() {
+    // サーバーモードでは配信された HTML に起動ごとのトークンが埋め込まれる。
+    const meta = global.document?.querySelector?.('meta[name="kanban-token"]');
+    return meta?.getAttribute('content') || '';
+  }
+
+  async function createHttpApi(baseUrl = '') {
+    if (typeof global.fetch !== 'function') return null;
+    const token = getServerToken();
+    let methods = [];
+    try {
+      const response = await global.fetch(`${baseUrl}/api`, {
+        cache: 'no-store',
+        headers: { 'X-Kanban-Token': token },
+      });
+      if (!response.ok) return null;
+      const data = await response.json();
+      methods = Array.isArray(data?.methods) ? data.methods : [];
+    } catch (err) {
+      return null;
+    }
+    if (methods.length === 0) return null;
+
+    const call = async (name, args) => {
+      const response = await global.fetch(`${baseUrl}/api/${encodeURIComponent(name)}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-Kanban-Token': token },
+        body: JSON.stringify({ args }),
+      });
+      let data = null;
+      try {
+        data = await response.json();
+      } catch (err) {
+        data = null;
+      }
+      if (!response.ok || !data || data.ok === false) {
+        throw new Error(data?.error || `${name} failed (${response.status})`);
+      }
+      return data.result;
+    };
+
+    const api = {};
+    methods.forEach((name) => {
+      api[name] = (...args) => call(name, args);
+    });
+    return api;
+  }
+
+  function connectChangeFeed(onPayload, { maxDelay = 10000 } = {}) {
+    if (typeof global.WebSocket !== 'function') return;
+    const scheme = global.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const url = `${scheme}//${global.location.host}/ws?token=${encodeURIComponent(getServerToken())}`;
+    let delay = 500;
+
+    const open = () => {
+      let socket;
+      try {
+        socket = new global.WebSocket(url);
+      } catch (err) {
+        console.warn('[TaskAppRuntime] change feed connection failed', err);
+        return;
+      }
+      socket.onopen = () => {
+        delay = 500;
+      };
+      socket.onmessage = (event) => {
+        let payload = null;
+        try {
+          payload = JSON.parse(event.data);
+        } catch (err) {
+          console.warn('[TaskAppRuntime] invalid change feed message', err);
+          return;
+        }
+        onPayload(payload);
+      };
+      socket.onclose = () => {
+        global.setTimeout(open, delay);
+        delay = Math.min(delay * 2, maxDelay);
+      };
+    };
+
+    open();
+  }
+
   function bindExcelActions({ onSave, onReload, enableKeyboardShortcuts = true } = {}) {
     state.handlers.save = typeof onSave === 'function' ? onSave : null;
     state.handlers.reload = typeof onReload === 'function' ? onReload : null;
@@ -114,7 +203,7 @@
     };
   }
 
-  function setupRuntime({ mockApiFactory, onApiChanged, onInit, onRealtimeUpdate } = {}) {
+  function setupRuntime({ mockApiFactory, onApiChanged, onInit, onRealtimeUpdate, onDueUpdate } = {}) {
     const getMockApi = () => {
       if (typeof mockApiFactory === 'function') {
         try {
@@ -130,10 +219,41 @@
       return null;
     };
 
+    // Excel 監視からのプッシュも columnar 形式 (とページが使う列) で受け取れるようバックエンドへ伝える
+    const enablePushWireFormat = (api) => {
+      const common = global.TaskAppCommon || {};
+      if (typeof api.set_push_wire_format !== 'function' || typeof common.negotiateWireFormat !== 'function') {
+        return;
+      }
+      const fields = typeof common.getTaskFieldProjection === 'function'
+        ? common.getTaskFieldProjection(api)
+        : null;
+      common.negotiateWireFormat(api)
+        .then(format => {
+          if (fields) return api.set_push_wire_format(format, fields);
+          return format === 'rows' ? null : api.set_push_wire_format(format);
+        })
+        .catch(err => console.warn('[TaskAppRuntime] set_push_wire_format failed', err));
+    };
+
+    // 期限状態はバックエンドのスケジューラーが日付の変わり目に通知する
+    const loadDueStates = (api) => {
+      const common = global.TaskAppCommon || {};
+      if (typeof common.refreshDueStates !== 'function') return;
+      common.refreshDueStates(api).then((changed) => {
+        if (!changed || typeof onDueUpdate !== 'function') return;
+        Promise.resolve(onDueUpdate()).catch(err => {
+          console.error('[TaskAppRuntime] failed to apply due states', err);
+        });
+      });
+    };
+
     const assignApi = (api, runMode) => {
       if (!api) return;
       state.api = api;
       state.runMode = runMode;
+      enablePushWireFormat(api);
+      loadDueStates(api);
       if (typeof onApiChanged === 'function') {
         try {
           onApiChanged({ api, runMode });
@@ -160,6 +280,49 @@
       handleRealtime(payload);
     };
 
+    // 通知に含まれる変化した行と件数をキャッシュへ当てる。当てられないときだけ全件を取り直す
+    global.__kanban_receive_due_update = (payload) => {
+      const common = global.TaskAppCommon || {};
+      if (typeof common.applyDueTransitions === 'function' && common.applyDueTransitions(payload)) {
+        if (typeof onDueUpdate !== 'function') return;
+        Promise.resolve(onDueUpdate()).catch(err => {
+          console.error('[TaskAppRuntime] failed to apply due states', err);
+        });
+        return;
+      }
+      if (state.api) loadDueStates(state.api);
+    };
+
+    // Ctrl+Z で直前の操作を戻し、Ctrl+Shift+Z / Ctrl+Y でやり直す。入力欄では標準の取り消しを優先する
+    const runHistoryStep = async (method) => {
+      const api = state.api;
+      if (typeof api?.[method] !== 'function') return;
+      try {
+        const result = await api[method]();
+        if (!result?.ok) return;
+        const common = global.TaskAppCommon || {};
+        const payload = typeof common.requestCachedStatePayload === 'function'
+          ? await common.requestCachedStatePayload(api)
+          : await api.get_state_snapshot();
+        handleRealtime(payload);
+      } catch (err) {
+        console.error(`[TaskAppRuntime] ${method} failed`, err);
+      }
+    };
+
+    global.addEventListener('keydown', (event) => {
+      if (!(event.ctrlKey || event.metaKey) || event.altKey) return;
+      const target = event.target;
+      if (target?.isContentEditable || ['INPUT', 'TEXTAREA', 'SELECT'].includes(target?.tagName)) return;
+      const key = String(event.key || '').toLowerCase();
+      let method = null;
+      if (key === 'z') method = event.shiftKey ? 'redo' : 'undo';
+      if (key === 'y' && !event.shiftKey) method = 'redo';
+      if (!method) return;
+      event.preventDefault();
+      runHistoryStep(method);
+    });
+
     global.addEventListener('pywebviewready', () => {
       const pyApi = global.pywebview?.api;
       if (pyApi) {
@@ -167,16 +330,39 @@
       }
     });
 
+    const assignMockApi = () => {
+      const mock = getMockApi();
+      if (mock) {
+        assignApi(mock, 'mock');
+      }
+    };
+
     ready(() => {
       const pyApi = global.pywebview?.api;
       if (pyApi) {
         assignApi(pyApi, 'pywebview');
-      } else {
-        const mock = getMockApi();
-        if (mock) {
-          assignApi(mock, 'mock');
-        }
+        return;
       }
+      if (!isServedOverHttp()) {
+        assignMockApi();
+        return;
+      }
+      // --serve モード: HTTP API と WebSocket の変更通知を利用する
+      createHttpApi().then((httpApi) => {
+        if (state.runMode === 'pywebview') return;
+        if (!httpApi) {
+          assignMockApi();
+          return;
+        }
+        assignApi(httpApi, 'http');
+        connectChangeFeed((payload) => {
+          if (payload?.type === 'due') {
+            global.__kanban_receive_due_update(payload);
+            return;
+          }
+          global.__kanban_receive_update(payload);
+        });
+      });
     });
 
     return {
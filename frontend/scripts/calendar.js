@@ -4,8 +4,15 @@ const {
   sanitizeTaskRecord,
   sanitizeTaskList,
   normalizeStatePayload,
+  requestInitialStatePayload,
+  requestCachedStatePayload,
   setupDragViewportAutoScroll,
   parseISO: parseISODate,
+  bindSuggestions,
+  getDueCounts,
+  setTaskFieldProjection,
+  requestTaskList,
+  loadTaskDetail,
 } = window.TaskAppCommon;
 
 const {
@@ -32,10 +39,15 @@ const { createFilterPresetManager } = window.TaskFilterPresets || {};
 let api;
 let RUN_MODE = 'mock';
 let TASKS = [];
+// TASKS を読み込んだ状態の版。画面側で書き換えたら null にし、ヘッダーは数え直す
+let TASKS_STATE = null;
 let STATUSES = [];
 let VALIDATIONS = {};
 let excelSyncHandlers = null;
 const VALIDATION_COLUMNS = ["ステータス", "大分類", "中分類", "タスク", "担当者", "優先度", "期限", "備考"];
+// カレンダーは備考を表示しないため一覧では受け取らず、編集モーダルを開いたときに取得する
+const CALENDAR_TASK_FIELDS = VALIDATION_COLUMNS.filter(col => col !== '備考');
+setTaskFieldProjection?.(CALENDAR_TASK_FIELDS);
 let CURRENT_EDIT = null;
 let CURRENT_DRAG = null;
 let cleanupAutoScroll = null;
@@ -87,10 +99,11 @@ const headerController = window.TaskAppHeader?.initHeader({
 });
 
 function updateHeaderDueSummary(tasks) {
+  const counts = tasks === TASKS && typeof getDueCounts === 'function' ? getDueCounts(TASKS_STATE) : null;
   if (headerController && typeof headerController.updateDueSummary === 'function') {
-    headerController.updateDueSummary(tasks);
+    headerController.updateDueSummary(tasks, { counts });
   } else {
-    window.TaskAppHeader?.updateDueSummary(tasks);
+    window.TaskAppHeader?.updateDueSummary(tasks, { counts });
   }
 }
 
@@ -111,6 +124,7 @@ if (typeof createExcelSyncHandlers === 'function') {
       }) || {};
 
       TASKS = Array.isArray(snapshot.tasks) ? snapshot.tasks : TASKS;
+      TASKS_STATE = null;
       if (Array.isArray(snapshot.statuses) && snapshot.statuses.length > 0) {
         STATUSES = snapshot.statuses;
       }
@@ -174,6 +188,7 @@ if (typeof setupRuntime === 'function') {
       }
     },
     onRealtimeUpdate: (payload) => applyStateFromPayload(payload, { fallbackToApi: false }),
+    onDueUpdate: () => updateHeaderDueSummary(TASKS),
   });
 }
 
@@ -199,14 +214,14 @@ async function init(force = false) {
       const isPywebview = RUN_MODE === 'pywebview';
       let loadedViaReload = false;
       if (isPywebview && !hasInitialExcelLoadFlag?.() && typeof api.reload_from_excel === 'function') {
-        payload = normalizeStatePayload(await api.reload_from_excel());
+        payload = await requestInitialStatePayload(api);
         loadedViaReload = true;
       }
-      if (isPywebview && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
-        payload = normalizeStatePayload(await api.get_state_snapshot());
+      if (RUN_MODE !== 'mock' && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
+        payload = await requestCachedStatePayload(api);
       }
       if (!Array.isArray(payload.tasks) && typeof api.get_tasks === 'function') {
-        payload.tasks = await api.get_tasks();
+        payload.tasks = await requestTaskList(api);
       }
       if (!Array.isArray(payload.statuses) && typeof api.get_statuses === 'function') {
         payload.statuses = await api.get_statuses();
@@ -237,13 +252,15 @@ async function applyStateFromPayload(payload, { fallbackToApi = false } = {}) {
   const data = normalizeStatePayload(payload);
 
   let tasksUpdated = false;
+  TASKS_STATE = null;
   if (Array.isArray(data.tasks)) {
     TASKS = sanitizeTaskList(data.tasks);
+    TASKS_STATE = { epoch: data.state_epoch, version: data.state_version };
     tasksUpdated = true;
   }
   if (!tasksUpdated && fallbackToApi && typeof api?.get_tasks === 'function') {
     try {
-      TASKS = sanitizeTaskList(await api.get_tasks());
+      TASKS = sanitizeTaskList(await requestTaskList(api));
       tasksUpdated = true;
     } catch (err) {
       console.error('get_tasks failed:', err);
@@ -906,6 +923,26 @@ function openModal(task, { mode }) {
   applyPriorityOptions(fprio, task.優先度, mode === 'create');
   fdue.value = (task.期限 || '').slice(0, 10);
   fnote.value = task.備考 || '';
+  let notesLoaded = '備考' in task;
+  fnote.disabled = !notesLoaded;
+  fnote.placeholder = notesLoaded ? '' : '読み込み中…';
+  if (!notesLoaded) {
+    const requestedNo = task.No;
+    loadTaskDetail(api, task)
+      .then(detail => {
+        if (CURRENT_EDIT !== requestedNo || !detail || !('備考' in detail)) return;
+        notesLoaded = true;
+        fnote.value = detail.備考 || '';
+        fnote.disabled = false;
+        fnote.placeholder = '';
+        const idx = TASKS.findIndex(x => x.No === requestedNo);
+        if (idx >= 0) TASKS[idx] = { ...TASKS[idx], 備考: detail.備考 || '' };
+      })
+      .catch(err => {
+        console.warn('[calendar] get_task_detail failed', err);
+        fnote.placeholder = '備考を読み込めませんでした';
+      });
+  }
 
   btnDelete.style.display = mode === 'edit' ? 'inline-flex' : 'none';
 
@@ -919,13 +956,14 @@ function openModal(task, { mode }) {
       const ok = await api.delete_task(CURRENT_EDIT);
       if (ok) {
         if (typeof api.get_tasks === 'function') {
-          TASKS = sanitizeTaskList(await api.get_tasks());
+          TASKS = sanitizeTaskList(await requestTaskList(api));
         } else {
           const remaining = TASKS
             .filter(x => x.No !== CURRENT_EDIT)
             .map((record, idx) => ({ ...record, No: idx + 1 }));
           TASKS = sanitizeTaskList(remaining);
         }
+        TASKS_STATE = null;
         CURRENT_EDIT = null;
         closeModal();
         ensureMonthDefault();
@@ -954,6 +992,10 @@ function openModal(task, { mode }) {
       期限: fdue.value ? fdue.value : '',
       備考: fnote.value,
     };
+    if (!notesLoaded) {
+      // 読み込めていない備考で既存の内容を上書きしない
+      delete payload.備考;
+    }
 
     if (!payload.タスク) {
       alert('タスクを入力してください。');
@@ -981,6 +1023,7 @@ function openModal(task, { mode }) {
           }
         }
       }
+      TASKS_STATE = null;
       CURRENT_EDIT = null;
       closeModal();
       ensureMonthDefault();
@@ -1008,30 +1051,13 @@ function setupAssigneeInputSuggestions(fassignee) {
   const datalist = document.getElementById('modal-assignee-list');
   if (!fassignee || !datalist) return;
 
-  const candidates = collectAllAssignees()
-    .map(name => (name === '' ? '' : String(name ?? '').trim()))
-    .filter(Boolean);
-
-  const seen = new Set();
-  datalist.innerHTML = '';
-
-  candidates.forEach(name => {
-    if (seen.has(name)) return;
-    seen.add(name);
-    const opt = document.createElement('option');
-    opt.value = name;
-    datalist.appendChild(opt);
+  bindSuggestions(fassignee, datalist, {
+    api,
+    column: '担当者',
+    fallback: () => collectAllAssignees()
+      .map(name => (name === '' ? '' : String(name ?? '').trim()))
+      .filter(Boolean),
   });
-
-  const current = String(fassignee.value ?? '').trim();
-  if (current && !seen.has(current)) {
-    const opt = document.createElement('option');
-    opt.value = current;
-    datalist.appendChild(opt);
-    seen.add(current);
-  }
-
-  fassignee.setAttribute('list', datalist.id);
 }
 
 function collectAllAssignees() {
@@ -1080,6 +1106,7 @@ async function updateTaskDue(no, dueIso) {
   const previousDue = current.期限 || '';
   if ((previousDue || '') === (dueIso || '')) return;
 
+  TASKS_STATE = null;
   try {
     if (typeof api?.update_task === 'function') {
       const updated = await api.update_task(no, { 期限: dueIso });
@@ -266,18 +266,220 @@
     return result;
   }
 
+  const DAY_MS = 24 * 60 * 60 * 1000;
+  const wireFormatCache = new WeakMap();
+  const STATE_CACHE_KEY = 'kanban-state-cache';
+  let latestState = null;
+  let stateCachePersistHooked = false;
+  // ページが表示に使う列。null は全列。備考のような重い列を省いたページは編集時に loadTaskDetail で補う
+  const TASK_DETAIL_FIELDS = ['備考'];
+  let taskFieldProjection = null;
+
+  function decodeWireDay(value) {
+    if (value === null || value === undefined) return '';
+    if (typeof value === 'number') {
+      return new Date(value * DAY_MS).toISOString().slice(0, 10);
+    }
+    return String(value);
+  }
+
+  function decodeWireColumn(column, count) {
+    const type = column?.type;
+    if (type === 'range') {
+      const start = Number(column.start) || 1;
+      return Array.from({ length: count }, (_, index) => start + index);
+    }
+    if (type === 'dict') {
+      const values = Array.isArray(column.values) ? column.values : [];
+      const codes = Array.isArray(column.codes) ? column.codes : [];
+      return codes.map(code => values[code]);
+    }
+    if (type === 'days') {
+      return (Array.isArray(column.values) ? column.values : []).map(decodeWireDay);
+    }
+    return Array.isArray(column?.values) ? column.values : [];
+  }
+
+  // バックエンドの columnar 形式 (列名 1 回 + 辞書化した値 + 日数表現の期限) をタスク配列へ戻す
+  function decodeColumnarTable(table) {
+    const count = Number(table?.count) || 0;
+    const columns = Array.isArray(table?.columns) ? table.columns : [];
+    const decoded = columns.map(name => decodeWireColumn(table.data?.[name], count));
+    const tasks = new Array(count);
+    for (let row = 0; row < count; row += 1) {
+      const task = {};
+      for (let col = 0; col < columns.length; col += 1) {
+        task[columns[col]] = decoded[col][row];
+      }
+      tasks[row] = task;
+    }
+    return tasks;
+  }
+
   function normalizeStatePayload(payload) {
     if (!payload) return {};
+    let data = payload;
     if (typeof payload === 'string') {
       try {
-        return JSON.parse(payload) || {};
+        data = JSON.parse(payload) || {};
       } catch (err) {
         console.warn('[kanban] failed to parse payload string', err);
         return {};
       }
     }
-    if (typeof payload === 'object') return payload;
-    return {};
+    if (typeof data !== 'object') return {};
+    if (data.format === 'columnar' && data.table) {
+      const { table, format, version, ...rest } = data;
+      data = { ...rest, tasks: decodeColumnarTable(table) };
+    }
+    rememberStatePayload(data);
+    return data;
+  }
+
+  // 版付きの全件状態を覚えておき、ページ遷移 (pagehide) の直前に sessionStorage へ書き出す
+  function rememberStatePayload(data) {
+    if (!data || !Array.isArray(data.tasks) || data.mode === 'delta') return;
+    if (data.state_version === undefined || data.state_version === null) return;
+    latestState = {
+      epoch: data.state_epoch,
+      version: data.state_version,
+      fields: Array.isArray(data.fields) ? data.fields : null,
+      tasks: data.tasks,
+      statuses: data.statuses,
+      validations: data.validations,
+    };
+    if (!stateCachePersistHooked && typeof global.addEventListener === 'function') {
+      stateCachePersistHooked = true;
+      global.addEventListener('pagehide', persistStateCache);
+    }
+  }
+
+  function persistStateCache() {
+    if (!latestState) return;
+    try {
+      global.sessionStorage?.setItem(STATE_CACHE_KEY, JSON.stringify(latestState));
+    } catch (err) {
+      console.warn('[kanban] failed to persist state cache', err);
+      try {
+        global.sessionStorage?.removeItem(STATE_CACHE_KEY);
+      } catch (removeErr) {
+        // sessionStorage が使えない環境では何もしない
+      }
+    }
+  }
+
+  function readStateCache() {
+    try {
+      const raw = global.sessionStorage?.getItem(STATE_CACHE_KEY);
+      const cached = raw ? JSON.parse(raw) : null;
+      return cached && Array.isArray(cached.tasks) ? cached : null;
+    } catch (err) {
+      return null;
+    }
+  }
+
+  async function negotiateWireFormat(api) {
+    if (!api || typeof api.get_wire_formats !== 'function') return 'rows';
+    if (wireFormatCache.has(api)) return wireFormatCache.get(api);
+    let format = 'rows';
+    try {
+      const formats = await api.get_wire_formats();
+      if (Array.isArray(formats) && formats.includes('columnar')) {
+        format = 'columnar';
+      }
+    } catch (err) {
+      console.warn('[kanban] get_wire_formats failed', err);
+    }
+    wireFormatCache.set(api, format);
+    return format;
+  }
+
+  function setTaskFieldProjection(fields) {
+    taskFieldProjection = Array.isArray(fields) && fields.length > 0 ? fields.slice() : null;
+  }
+
+  // 列の指定は get_task_detail を持つ (列の省略に対応した) バックエンドにだけ送る
+  function getTaskFieldProjection(api) {
+    if (!taskFieldProjection || typeof api?.get_task_detail !== 'function') return null;
+    return taskFieldProjection;
+  }
+
+  function coversTaskFields(available, wanted) {
+    if (!Array.isArray(available)) return true;
+    if (!Array.isArray(wanted)) return false;
+    return wanted.every(name => available.includes(name));
+  }
+
+  async function requestTaskList(api) {
+    const fields = getTaskFieldProjection(api);
+    return fields ? api.get_tasks(fields) : api.get_tasks();
+  }
+
+  // 省いた列が無いタスクはそのまま返し、あれば get_task_detail で 1 件分を取得して補う
+  async function loadTaskDetail(api, task) {
+    if (!task || TASK_DETAIL_FIELDS.every(name => name in task)) return task;
+    if (typeof api?.get_task_detail !== 'function') return task;
+    const detail = await api.get_task_detail(task.No);
+    return detail && typeof detail === 'object' ? { ...task, ...detail, No: task.No } : task;
+  }
+
+  // 対応しているバックエンドには columnar 形式を要求し、古いバックエンドには引数なしで呼び出す
+  async function requestStatePayload(api, method) {
+    const format = await negotiateWireFormat(api);
+    const fields = getTaskFieldProjection(api);
+    let raw;
+    if (fields) {
+      raw = await api[method](format, fields);
+    } else {
+      raw = format === 'columnar' ? await api[method](format) : await api[method]();
+    }
+    return normalizeStatePayload(raw);
+  }
+
+  // 前のページが持っていた版からの差分だけを受け取り、キャッシュ済みの状態へ当てる
+  async function requestCachedStatePayload(api) {
+    if (typeof api?.get_changes_since !== 'function') {
+      return requestStatePayload(api, 'get_state_snapshot');
+    }
+    const fields = getTaskFieldProjection(api);
+    let cached = latestState || readStateCache();
+    if (cached && !coversTaskFields(cached.fields, fields)) {
+      // 列を省いた状態は、全列を必要とするページの差分の土台にできない
+      cached = null;
+    }
+    const wire = await negotiateWireFormat(api);
+    const args = [cached ? cached.version : null, cached ? cached.epoch : null, wire];
+    if (fields) args.push(fields);
+    const result = normalizeStatePayload(await api.get_changes_since(...args));
+    if (!cached || (result.mode !== 'unchanged' && result.mode !== 'delta')) {
+      return result;
+    }
+    let tasks = cached.tasks;
+    if (result.mode === 'delta') {
+      tasks = cached.tasks.slice(0, Number(result.count) || 0);
+      (result.tasks || []).forEach(task => {
+        tasks[Number(task.No) - 1] = task;
+      });
+    }
+    const data = {
+      tasks,
+      statuses: result.statuses ?? cached.statuses,
+      validations: result.validations ?? cached.validations,
+      state_epoch: result.state_epoch,
+      state_version: result.state_version,
+    };
+    if (fields || Array.isArray(cached.fields)) {
+      // 差分で当てた行は指定の列しか持たないため、状態全体を列を省いたものとして扱う
+      data.fields = fields || cached.fields;
+    }
+    rememberStatePayload(data);
+    return data;
+  }
+
+  // 起動直後の初期化。バックエンドが読み込み済みのブックから変わっていなければ再解析を省く
+  async function requestInitialStatePayload(api) {
+    const method = typeof api?.reload_if_stale === 'function' ? 'reload_if_stale' : 'reload_from_excel';
+    return requestStatePayload(api, method);
   }
 
   function getPriorityLevel(value) {
@@ -424,17 +626,85 @@
       || normalized === 'completed';
   }
 
-  function getDueState(task) {
-    if (!task || typeof task !== 'object') return null;
-    if (isCompletedStatus(task.ステータス)) return null;
+  const SUGGEST_LIMIT = 20;
+  const SUGGEST_DEBOUNCE_MS = 80;
 
-    const dueDate = parseISODate(task.期限 || '');
-    if (!dueDate) return null;
+  function fillDatalist(datalist, values, extra) {
+    if (!datalist) return;
+    const seen = new Set();
+    const fragment = document.createDocumentFragment();
+    [...(Array.isArray(values) ? values : []), extra].forEach(value => {
+      const text = String(value ?? '').trim();
+      if (!text || seen.has(text)) return;
+      seen.add(text);
+      const opt = document.createElement('option');
+      opt.value = text;
+      fragment.appendChild(opt);
+    });
+    datalist.replaceChildren(fragment);
+  }
+
+  // 入力中の文字列で api.suggest に候補を問い合わせて datalist を差し替える。
+  // suggest が無い環境 (古いバックエンドやモック) では fallback() の一覧を使う。
+  // narrow() が配列を返したときは問い合わせずにその一覧を出す (大分類で絞った中分類など)
+  function bindSuggestions(input, datalist, { api, column, fallback, narrow, limit = SUGGEST_LIMIT } = {}) {
+    if (!input || !datalist) return { refresh: () => {}, unbind: () => {} };
+    input.setAttribute('list', datalist.id);
+    if (typeof input.__suggestUnbind === 'function') input.__suggestUnbind();
+
+    let timer = null;
+    let seq = 0;
+    const useLocal = () => {
+      const values = typeof fallback === 'function' ? fallback() : [];
+      fillDatalist(datalist, values, input.value);
+    };
+    const refresh = () => {
+      const narrowed = typeof narrow === 'function' ? narrow() : null;
+      if (Array.isArray(narrowed)) {
+        seq += 1;
+        fillDatalist(datalist, narrowed, input.value);
+        return;
+      }
+      if (typeof api?.suggest !== 'function') {
+        useLocal();
+        return;
+      }
+      const ticket = ++seq;
+      Promise.resolve(api.suggest(column, String(input.value ?? '').trim(), limit))
+        .then(matches => {
+          if (ticket !== seq) return;
+          const values = Array.isArray(matches) ? matches.map(match => match?.value ?? match) : [];
+          fillDatalist(datalist, values, input.value);
+        })
+        .catch(err => {
+          console.warn('[kanban] suggest failed', err);
+          if (ticket === seq) useLocal();
+        });
+    };
+    const schedule = () => {
+      clearTimeout(timer);
+      timer = setTimeout(refresh, SUGGEST_DEBOUNCE_MS);
+    };
 
+    input.addEventListener('input', schedule);
+    input.addEventListener('focus', refresh);
+    const unbind = () => {
+      clearTimeout(timer);
+      seq += 1;
+      input.removeEventListener('input', schedule);
+      input.removeEventListener('focus', refresh);
+    };
+    input.__suggestUnbind = unbind;
+    refresh();
+    return { refresh, unbind };
+  }
+
+  // バックエンドの期限スケジューラーが計算した状態。その日の間だけ No ごとに引く
+  let dueStateCache = null;
+
+  function computeDueState(dueDate, today) {
     const due = new Date(dueDate.getTime());
     due.setHours(0, 0, 0, 0);
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
     const diffDays = Math.ceil((due.getTime() - today.getTime()) / 86400000);
 
     if (diffDays < 0) {
@@ -470,6 +740,111 @@
     };
   }
 
+  function toDueEntry(entry, from) {
+    return {
+      due: entry.期限,
+      from,
+      state: { level: entry.level, diff: entry.diff, label: entry.label },
+    };
+  }
+
+  function applyDueStates(summary) {
+    if (!summary || !Array.isArray(summary.states)) return false;
+    const day = parseISODate(summary.date || '');
+    if (!day) return false;
+    day.setHours(0, 0, 0, 0);
+    const byNo = new Map();
+    summary.states.forEach(entry => {
+      byNo.set(Number(entry.No), toDueEntry(entry, day.getTime()));
+    });
+    dueStateCache = {
+      from: day.getTime(),
+      until: day.getTime() + DAY_MS,
+      counts: summary.counts || null,
+      epoch: summary.state_epoch ?? null,
+      version: summary.state_version ?? null,
+      byNo,
+    };
+    return true;
+  }
+
+  // 日付の変わり目の通知 (advance_due_clock の結果) をキャッシュへ当てる。区分が変わった行は
+  // transitions で置き換え、それ以外の行の残り日数は参照時に新しい日付で数え直す。
+  // 元にした状態の版が違う場合などは false を返し、呼び出し側に全件の再取得を任せる。
+  function applyDueTransitions(update) {
+    if (!dueStateCache || !update || !Array.isArray(update.transitions)) return false;
+    if (update.state_version === undefined || update.state_version !== dueStateCache.version) return false;
+    if (update.state_epoch !== dueStateCache.epoch) return false;
+    const day = parseISODate(update.date || '');
+    if (!day) return false;
+    day.setHours(0, 0, 0, 0);
+    const from = day.getTime();
+    update.transitions.forEach(entry => {
+      dueStateCache.byNo.set(Number(entry.No), toDueEntry(entry, from));
+    });
+    dueStateCache.from = from;
+    dueStateCache.until = from + DAY_MS;
+    dueStateCache.counts = update.counts || null;
+    return true;
+  }
+
+  async function refreshDueStates(api) {
+    if (typeof api?.get_due_states !== 'function') return false;
+    try {
+      return applyDueStates(await api.get_due_states());
+    } catch (err) {
+      console.warn('[kanban] get_due_states failed', err);
+      return false;
+    }
+  }
+
+  // 画面のタスク一覧が読み込まれた版 ({ epoch, version }) と同じ版から計算された件数だけを返す。
+  // 版が違う、または画面側で一覧を書き換えた (stamp が null) 場合は null
+  function getDueCounts(stamp) {
+    if (!dueStateCache || !dueStateCache.counts || !stamp) return null;
+    const now = Date.now();
+    if (now < dueStateCache.from || now >= dueStateCache.until) return null;
+    if (stamp.epoch !== dueStateCache.epoch || stamp.version !== dueStateCache.version) {
+      return null;
+    }
+    return dueStateCache.counts;
+  }
+
+  // 期限の文字列が一致する場合だけ使う。未保存の編集などで変わった行は従来どおり計算する
+  function lookupDueState(task) {
+    if (!dueStateCache) return undefined;
+    const now = Date.now();
+    if (now < dueStateCache.from || now >= dueStateCache.until) return undefined;
+    const dueText = String(task.期限 || '');
+    const entry = dueStateCache.byNo.get(Number(task.No));
+    if (entry) {
+      if (entry.due !== dueText) return undefined;
+      if (entry.from !== dueStateCache.from) {
+        const dueDate = parseISODate(entry.due);
+        if (!dueDate) return undefined;
+        entry.state = computeDueState(dueDate, new Date(dueStateCache.from));
+        entry.from = dueStateCache.from;
+      }
+      return entry.state;
+    }
+    return dueText ? undefined : null;
+  }
+
+  function getDueState(task) {
+    if (!task || typeof task !== 'object') return null;
+    if (isCompletedStatus(task.ステータス)) return null;
+
+    const cached = lookupDueState(task);
+    if (cached !== undefined) return cached;
+
+    const dueDate = parseISODate(task.期限 || '');
+    if (!dueDate) return null;
+
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    return computeDueState(dueDate, today);
+  }
+
   function summarizeAssigneeWorkload(tasks, {
     normalizeStatusLabel: normalizeStatus = (value) => {
       const text = String(value ?? '').trim();
@@ -789,6 +1164,20 @@
     sanitizeTaskRecord,
     sanitizeTaskList,
     normalizeStatePayload,
+    negotiateWireFormat,
+    requestStatePayload,
+    requestInitialStatePayload,
+    requestCachedStatePayload,
+    setTaskFieldProjection,
+    getTaskFieldProjection,
+    requestTaskList,
+    loadTaskDetail,
+    applyDueStates,
+    applyDueTransitions,
+    refreshDueStates,
+    getDueCounts,
+    fillDatalist,
+    bindSuggestions,
     normalizeStatusLabel,
     denormalizeStatusLabel,
     normalizeValidationValues,
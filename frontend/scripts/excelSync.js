@@ -13,6 +13,121 @@
     };
   }
 
+  const JOB_POLL_INTERVAL_MS = 250;
+  const JOB_PHASE_LABELS = {
+    reading: '読込中',
+    rows_parsed: '解析',
+    rows_merged: '統合',
+    rows_written: '書込',
+    writing_file: 'ファイル保存中',
+  };
+
+  function sleep(ms) {
+    return new Promise(resolve => global.setTimeout(resolve, ms));
+  }
+
+  function formatJobProgress(job) {
+    const label = JOB_PHASE_LABELS[job?.phase] || '処理中';
+    const done = Number(job?.done) || 0;
+    const total = Number(job?.total) || 0;
+    return total > 0 ? `${label} ${done}/${total}` : `${label}…`;
+  }
+
+  async function runJob(api, kind, { params, onProgress } = {}) {
+    const started = await api.start_job(kind, params || {});
+    const jobId = started?.job?.id;
+    if (!jobId) {
+      throw new Error(started?.error || 'ジョブを開始できませんでした');
+    }
+    for (;;) {
+      const response = await api.get_job(jobId);
+      const job = response?.job;
+      if (!response?.ok || !job) {
+        throw new Error(response?.error || 'ジョブの状態を取得できませんでした');
+      }
+      if (job.status === 'succeeded') return job.result;
+      if (job.status === 'failed') throw new Error(job.error || 'ジョブが失敗しました');
+      if (job.status === 'cancelled') throw new Error('ジョブがキャンセルされました');
+      if (typeof onProgress === 'function') {
+        try {
+          onProgress(job);
+        } catch (err) {
+          console.warn('[excelSync] onProgress failed:', err);
+        }
+      }
+      await sleep(JOB_POLL_INTERVAL_MS);
+    }
+  }
+
+  function supportsJobs(api) {
+    return typeof api?.start_job === 'function' && typeof api?.get_job === 'function';
+  }
+
+  function withButtonProgress(buttonId) {
+    const button = document.getElementById(buttonId);
+    const originalText = button ? button.textContent : '';
+    if (button) button.disabled = true;
+    return {
+      update(job) {
+        if (button) button.textContent = formatJobProgress(job);
+      },
+      restore() {
+        if (!button) return;
+        button.disabled = false;
+        button.textContent = originalText;
+      },
+    };
+  }
+
+  const PENDING_PREVIEW_ROWS = 10;
+
+  function summarizePendingCounts(changes) {
+    const counts = changes?.counts || {};
+    return `追加 ${counts.added || 0} 件・変更 ${counts.modified || 0} 件・削除 ${counts.deleted || 0} 件`;
+  }
+
+  // 保存ボタンの title に出す、保存で書き込まれる内容の要約
+  function describePendingChanges(changes) {
+    if (!changes?.has_changes) return '保存されていない変更はありません';
+    const lines = [summarizePendingCounts(changes)];
+    if (changes.validations_changed) lines.push('入力規則の変更あり');
+    (changes.added || []).slice(0, PENDING_PREVIEW_ROWS).forEach(row => {
+      lines.push(`+ No.${row.No} ${row.タスク || ''}`);
+    });
+    (changes.modified || []).slice(0, PENDING_PREVIEW_ROWS).forEach(row => {
+      const fields = Object.entries(row.changes || {})
+        .map(([col, change]) => `${col}: ${change.before || '(空)'} → ${change.after || '(空)'}`)
+        .join(', ');
+      lines.push(`* No.${row.No} ${row.タスク || ''} (${fields})`);
+    });
+    (changes.deleted || []).slice(0, PENDING_PREVIEW_ROWS).forEach(row => {
+      lines.push(`- ${row.タスク || ''}`);
+    });
+    return lines.join('\n');
+  }
+
+  // save_excel(true) / save ジョブの only_if_changed は {saved, path, counts} を返す。古い API は保存先の文字列
+  function describeSaveResult(result) {
+    if (result && typeof result === 'object' && 'saved' in result) {
+      const counts = summarizePendingCounts(result);
+      const label = result.saved
+        ? `Excelへ保存しました（${counts}）`
+        : '保存されていない変更がないため、書き込みを省きました';
+      return result.path ? `${label}\n${result.path}` : label;
+    }
+    return result ? `Excelへ保存しました\n${result}` : 'Excelへ保存しました';
+  }
+
+  async function fetchPendingChanges(api) {
+    if (typeof api?.get_pending_changes !== 'function') return null;
+    try {
+      return await api.get_pending_changes(PENDING_PREVIEW_ROWS);
+    } catch (err) {
+      console.warn('[excelSync] get_pending_changes failed:', err);
+      return null;
+    }
+  }
+
   function createExcelSyncHandlers({ apiAccessor, onAfterValidationSave } = {}) {
     if (typeof apiAccessor !== 'function') {
       throw new Error('createExcelSyncHandlers requires apiAccessor function');
@@ -20,16 +135,44 @@
 
     const resolveApi = getSafeApi(apiAccessor);
 
+    // 保存ボタンにカーソルを合わせると、保存で書き込まれる変更の一覧を表示する
+    const saveButton = document.getElementById('btn-save');
+    if (saveButton && !saveButton.dataset.pendingPreview) {
+      saveButton.dataset.pendingPreview = '1';
+      const refreshPreview = async () => {
+        const changes = await fetchPendingChanges(resolveApi());
+        if (changes) saveButton.title = describePendingChanges(changes);
+      };
+      saveButton.addEventListener('mouseenter', refreshPreview);
+      saveButton.addEventListener('focus', refreshPreview);
+    }
+
     async function handleSaveToExcel() {
       const api = resolveApi();
       if (!api || typeof api.save_excel !== 'function') {
         alert('保存機能が利用できません。');
         return;
       }
+      // 変更の件数は保存側で 1 回だけ数えたものを使う (保存前に差分を取り直さない)
+      const onlyIfChanged = typeof api.get_pending_changes === 'function';
+      if (supportsJobs(api)) {
+        const indicator = withButtonProgress('btn-save');
+        try {
+          const result = await runJob(api, 'save', {
+            params: onlyIfChanged ? { only_if_changed: true } : {},
+            onProgress: job => indicator.update(job),
+          });
+          alert(describeSaveResult(result));
+        } catch (err) {
+          alert('保存に失敗: ' + (err?.message || err));
+        } finally {
+          indicator.restore();
+        }
+        return;
+      }
       try {
-        const result = await api.save_excel();
-        const message = result ? `Excelへ保存しました\n${result}` : 'Excelへ保存しました';
-        alert(message);
+        const result = onlyIfChanged ? await api.save_excel(true) : await api.save_excel();
+        alert(describeSaveResult(result));
       } catch (err) {
         alert('保存に失敗: ' + (err?.message || err));
       }
@@ -49,7 +192,24 @@
             console.warn('[excelSync] onBeforeReload failed:', err);
           }
         }
-        const payload = await api.reload_from_excel();
+        let payload;
+        const common = global.TaskAppCommon || {};
+        const wire = typeof common.negotiateWireFormat === 'function'
+          ? await common.negotiateWireFormat(api)
+          : 'rows';
+        if (supportsJobs(api)) {
+          const indicator = withButtonProgress('btn-reload');
+          try {
+            payload = await runJob(api, 'reload', {
+              params: wire === 'rows' ? {} : { wire },
+              onProgress: job => indicator.update(job),
+            });
+          } finally {
+            indicator.restore();
+          }
+        } else {
+          payload = wire === 'rows' ? await api.reload_from_excel() : await api.reload_from_excel(wire);
+        }
         if (typeof onAfterReload === 'function') {
           await onAfterReload(payload);
         }
@@ -179,5 +339,6 @@
 
   global.TaskExcelSync = {
     createExcelSyncHandlers,
+    runJob,
   };
 }(window));
@@ -290,18 +290,23 @@
     return { container, toggle, overlay, panel, closeButton };
   }
 
-  function updateDueSummary(tasks, instance = state.current) {
+  // counts はバックエンドが数えた件数。渡されたときはタスク一覧を数え直さない
+  function updateDueSummary(tasks, instance = state.current, counts = null) {
     if (!instance) return;
     const due = instance.due;
     if (!due) return;
 
-    const list = Array.isArray(tasks) ? tasks : [];
-    const { getDueState } = global.TaskAppCommon || {};
-    if (typeof getDueState !== 'function') return;
-
     let overdue = 0;
     let warning = 0;
 
+    const list = counts ? [] : (Array.isArray(tasks) ? tasks : []);
+    if (counts) {
+      overdue = Number(counts.overdue) || 0;
+      warning = Number(counts.warning) || 0;
+    }
+    const { getDueState } = global.TaskAppCommon || {};
+    if (!counts && typeof getDueState !== 'function') return;
+
     list.forEach(task => {
       const state = getDueState(task);
       if (!state) return;
@@ -461,8 +466,8 @@
 
     return {
       element: root,
-      updateDueSummary(tasks) {
-        updateDueSummary(tasks, instance);
+      updateDueSummary(tasks, { counts } = {}) {
+        updateDueSummary(tasks, instance, counts);
       },
       setHint(text) {
         if (!instance.hintEl && text) {
@@ -489,8 +494,8 @@
 
   global.TaskAppHeader = {
     initHeader,
-    updateDueSummary(tasks) {
-      updateDueSummary(tasks);
+    updateDueSummary(tasks, { counts } = {}) {
+      updateDueSummary(tasks, state.current, counts);
     },
   };
 }(window));
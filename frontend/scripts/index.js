@@ -3,9 +3,12 @@ const {
   sanitizeTaskRecord,
   sanitizeTaskList,
   normalizeStatePayload,
+  requestInitialStatePayload,
+  requestCachedStatePayload,
   parseISO,
   getDueState,
   getPriorityLevel,
+  bindSuggestions,
 } = window.TaskAppCommon;
 
 const {
@@ -37,7 +40,7 @@ const { createTaskPageBase } = window.TaskPageBase || {};
 const { createExcelSyncHandlers } = window.TaskExcelSync || {};
 
 let api;                  // 実際に使う API （後で差し替える）
-let RUN_MODE = 'mock';    // 'mock' | 'pywebview'
+let RUN_MODE = 'mock';    // 'mock' | 'pywebview' | 'http'
 let excelSyncHandlers = null;
 
 /* ===================== 状態 ===================== */
@@ -211,7 +214,7 @@ async function init(force = false) {
     let loadedViaReload = false;
       if (isPywebview && !hasInitialExcelLoadFlag?.() && typeof api.reload_from_excel === 'function') {
       try {
-        payload = normalizeStatePayload(await api.reload_from_excel());
+        payload = await requestInitialStatePayload(api);
         loadedViaReload = true;
       } catch (e) {
         console.warn('reload_from_excel failed, fallback to get_*', e);
@@ -219,9 +222,9 @@ async function init(force = false) {
       }
     }
 
-    if (isPywebview && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
+    if (RUN_MODE !== 'mock' && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
       try {
-        payload = normalizeStatePayload(await api.get_state_snapshot());
+        payload = await requestCachedStatePayload(api);
       } catch (err) {
         console.warn('get_state_snapshot failed:', err);
       }
@@ -248,54 +251,129 @@ async function init(force = false) {
 }
 
 /* ===================== レンダリング ===================== */
+// 描画済みのカードと列をタスク ID / ステータスで保持し、内容が変わったものだけを作り直す。
+// No は前の行の追加・削除でずれるため署名に含めず、再利用するカードの表示だけを書き換える
+const renderedCards = new Map();
+const renderedColumns = new Map();
+
+function cardKey(task) {
+  return task.__kanban_id ? `id:${task.__kanban_id}` : `no:${task.No}`;
+}
+
+function cardSignature(task) {
+  const dueState = getDueState(task);
+  return JSON.stringify([
+    task.ソース, task.大分類, task.中分類, task.タスク,
+    task.優先度, task.担当者, task.期限, task.備考,
+    dueState?.level, dueState?.label,
+  ]);
+}
+
+function getCardElement(task) {
+  const key = cardKey(task);
+  const signature = cardSignature(task);
+  const cached = renderedCards.get(key);
+  if (cached && cached.signature === signature) {
+    if (cached.el.dataset.no !== String(task.No)) {
+      cached.el.dataset.no = task.No;
+      const no = cached.el.querySelector('.card-no');
+      if (no) no.textContent = `#${task.No}`;
+    }
+    return cached.el;
+  }
+  const el = renderCard(task);
+  renderedCards.set(key, { signature, el });
+  return el;
+}
+
+function getColumnElement(status) {
+  let column = renderedColumns.get(status);
+  if (column) return column;
+
+  const col = document.createElement('section');
+  col.className = 'column';
+  col.dataset.status = status;
+
+  const header = document.createElement('div');
+  header.className = 'column-header';
+  const title = document.createElement('div');
+  title.className = 'column-title';
+  title.textContent = status;
+  const count = document.createElement('div');
+  count.className = 'column-count';
+
+  header.appendChild(title);
+  header.appendChild(count);
+
+  const body = document.createElement('div');
+  body.className = 'column-body';
+  const drop = document.createElement('div');
+  drop.className = 'dropzone';
+  drop.addEventListener('dragover', e => { e.preventDefault(); drop.classList.add('dragover'); });
+  drop.addEventListener('dragleave', () => drop.classList.remove('dragover'));
+  drop.addEventListener('drop', e => onDropCard(e, status, drop));
+
+  body.appendChild(drop);
+  col.appendChild(header);
+  col.appendChild(body);
+  column = { col, count, drop };
+  renderedColumns.set(status, column);
+  return column;
+}
+
+// parent の子要素を elements の並びに揃える。位置が合っている要素には触れない
+function reconcileChildren(parent, elements) {
+  elements.forEach((el, index) => {
+    const current = parent.children[index];
+    if (current !== el) {
+      parent.insertBefore(el, current || null);
+    }
+  });
+  while (parent.children.length > elements.length) {
+    parent.removeChild(parent.lastElementChild);
+  }
+}
+
 function renderBoard() {
   const board = document.getElementById('board');
-  board.innerHTML = '';
 
   const FILTERED = getFilteredTasks();  // ← 追加
+  const tasksByStatus = new Map(STATUSES.map(status => [status, []]));
+  FILTERED.forEach(task => {
+    tasksByStatus.get(normalizeStatusLabel(task.ステータス))?.push(task);
+  });
 
+  const seenKeys = new Set();
+  const columns = [];
   STATUSES.forEach(status => {
-    const columnTasks = FILTERED.filter(t => normalizeStatusLabel(t.ステータス) === status);
+    const columnTasks = tasksByStatus.get(status);
     if (status === UNSET_STATUS_LABEL && columnTasks.length === 0) {
       return;
     }
 
-    const col = document.createElement('section');
-    col.className = 'column';
-    col.dataset.status = status;
-
-    const header = document.createElement('div');
-    header.className = 'column-header';
-    const title = document.createElement('div');
-    title.className = 'column-title';
-    title.textContent = status;
-    const count = document.createElement('div');
-    count.className = 'column-count';
+    const column = getColumnElement(status);
     // ↓ 絞り込み済みから件数を出す
-    count.textContent = `${columnTasks.length} 件`;
-
-    header.appendChild(title);
-    header.appendChild(count);
-
-    const body = document.createElement('div');
-    body.className = 'column-body';
-    const drop = document.createElement('div');
-    drop.className = 'dropzone';
-    drop.addEventListener('dragover', e => { e.preventDefault(); drop.classList.add('dragover'); });
-    drop.addEventListener('dragleave', () => drop.classList.remove('dragover'));
-    drop.addEventListener('drop', e => onDropCard(e, status, drop));
+    column.count.textContent = `${columnTasks.length} 件`;
 
     // ↓ 絞り込み済みから、その列のカードを描画
-    columnTasks
+    const cards = columnTasks
       .sort((a, b) => compareDueValues(a, b)
         || comparePriorityValues(a.優先度, b.優先度)
         || (a.No || 0) - (b.No || 0))
-      .forEach(task => drop.appendChild(renderCard(task)));
+      .map(task => {
+        seenKeys.add(cardKey(task));
+        return getCardElement(task);
+      });
+    reconcileChildren(column.drop, cards);
+    columns.push(column.col);
+  });
+  reconcileChildren(board, columns);
 
-    body.appendChild(drop);
-    col.appendChild(header);
-    col.appendChild(body);
-    board.appendChild(col);
+  renderedCards.forEach((_, key) => {
+    if (!seenKeys.has(key)) renderedCards.delete(key);
+  });
+  renderedColumns.forEach((_, status) => {
+    if (!tasksByStatus.has(status)) renderedColumns.delete(status);
   });
 
   if (headerController && typeof headerController.updateDueSummary === 'function') {
@@ -446,16 +524,24 @@ function renderCard(task) {
     el.classList.add('due-warning');
   }
 
+  // カードは No がずれても再利用されるため、No はイベント発生時に dataset から読む
   el.addEventListener('dragstart', e => {
-    e.dataTransfer.setData('text/plain', String(task.No));
+    e.dataTransfer.setData('text/plain', el.dataset.no);
     e.dataTransfer.dropEffect = 'move';
   });
 
-  el.addEventListener('dblclick', () => openEdit(task.No));
+  el.addEventListener('dblclick', () => openEdit(Number(el.dataset.no)));
 
   const category = document.createElement('div');
   category.className = 'card-category';
   let hasCategory = false;
+  if (task.ソース) {
+    const source = document.createElement('span');
+    source.className = 'badge badge-source';
+    source.textContent = task.ソース;
+    category.appendChild(source);
+    hasCategory = true;
+  }
   if (task.大分類) {
     const major = document.createElement('span');
     major.className = 'badge badge-major';
@@ -602,89 +688,44 @@ function setupCategoryInputSuggestions(fmajor, fminor) {
   const minorListEl = document.getElementById('modal-minor-list');
   if (!majorListEl && !minorListEl) return;
 
-  const { majorList, minorMap, allMinors } = collectCategoryOptions();
-
-  const fillOptions = (datalist, values) => {
-    if (!datalist) return;
-    datalist.innerHTML = '';
-    if (!Array.isArray(values)) return;
-    const seen = new Set();
-    values.forEach(value => {
-      const text = String(value ?? '').trim();
-      if (!text || seen.has(text)) return;
-      seen.add(text);
-      const opt = document.createElement('option');
-      opt.value = text;
-      datalist.appendChild(opt);
-    });
-  };
-
-  fillOptions(majorListEl, majorList);
-
-  const fallbackMinors = Array.isArray(allMinors) ? allMinors : [];
-  const updateMinorOptions = () => {
-    if (!minorListEl) return;
-    const majorValue = String(fmajor?.value ?? '').trim();
-    let candidates = fallbackMinors;
-    if (majorValue && minorMap.has(majorValue)) {
-      const list = minorMap.get(majorValue) || [];
-      if (Array.isArray(list) && list.length > 0) {
-        candidates = list;
-      }
-    }
-    fillOptions(minorListEl, candidates);
-  };
+  bindSuggestions(fmajor, majorListEl, {
+    api,
+    column: '大分類',
+    fallback: () => collectCategoryOptions().majorList,
+  });
 
-  updateMinorOptions();
+  const minorSuggest = bindSuggestions(fminor, minorListEl, {
+    api,
+    column: '中分類',
+    fallback: () => collectCategoryOptions().allMinors,
+    narrow: () => {
+      // 大分類が入力済みでその下に既存の中分類があれば、その一覧に絞る
+      const majorValue = String(fmajor?.value ?? '').trim();
+      if (!majorValue) return null;
+      const list = collectCategoryOptions().minorMap.get(majorValue);
+      return Array.isArray(list) && list.length > 0 ? list : null;
+    },
+  });
 
   if (fmajor && minorListEl) {
     if (typeof fmajor.__minorListHandler === 'function') {
-      fmajor.removeEventListener('input', fmajor.__minorListHandler);
       fmajor.removeEventListener('change', fmajor.__minorListHandler);
     }
-    const handler = () => updateMinorOptions();
+    const handler = () => minorSuggest.refresh();
     fmajor.__minorListHandler = handler;
-    fmajor.addEventListener('input', handler);
     fmajor.addEventListener('change', handler);
   }
-
-  if (fminor && minorListEl) {
-    // Ensure the list is refreshed when the field gains focus after manual edits.
-    if (typeof fminor.__minorListRefresh === 'function') {
-      fminor.removeEventListener('focus', fminor.__minorListRefresh);
-    }
-    const refresh = () => updateMinorOptions();
-    fminor.__minorListRefresh = refresh;
-    fminor.addEventListener('focus', refresh);
-  }
 }
 
 function setupAssigneeInputSuggestions(fassignee) {
   const datalist = document.getElementById('modal-assignee-list');
   if (!fassignee || !datalist) return;
 
-  const candidates = Array.isArray(TASKS) ? uniqAssignees() : [];
-  const seen = new Set();
-  datalist.innerHTML = '';
-
-  candidates.forEach(name => {
-    const text = String(name ?? '').trim();
-    if (!text || seen.has(text)) return;
-    seen.add(text);
-    const opt = document.createElement('option');
-    opt.value = text;
-    datalist.appendChild(opt);
+  bindSuggestions(fassignee, datalist, {
+    api,
+    column: '担当者',
+    fallback: () => (Array.isArray(TASKS) ? uniqAssignees() : []),
   });
-
-  const current = String(fassignee.value ?? '').trim();
-  if (current && !seen.has(current)) {
-    const opt = document.createElement('option');
-    opt.value = current;
-    datalist.appendChild(opt);
-    seen.add(current);
-  }
-
-  fassignee.setAttribute('list', datalist.id);
 }
 
 function openModal(task, { mode }) {
@@ -3,9 +3,12 @@ const {
   sanitizeTaskRecord,
   sanitizeTaskList,
   normalizeStatePayload,
+  requestInitialStatePayload,
+  requestCachedStatePayload,
   parseISO,
   getDueState,
   getPriorityLevel,
+  bindSuggestions,
 } = window.TaskAppCommon;
 
 const {
@@ -37,7 +40,7 @@ const { createTaskPageBase } = window.TaskPageBase || {};
 const { createExcelSyncHandlers } = window.TaskExcelSync || {};
 
 let api;                  // 実際に使う API （後で差し替える）
-let RUN_MODE = 'mock';    // 'mock' | 'pywebview'
+let RUN_MODE = 'mock';    // 'mock' | 'pywebview' | 'http'
 let excelSyncHandlers = null;
 
 /* ===================== 状態 ===================== */
@@ -704,7 +707,7 @@ function applyColumnWidth(table, columnKey, width) {
     colElement.style.width = px;
   }
 
-  table.querySelectorAll(`tbody tr`).forEach(row => {
+  table.querySelectorAll(`tbody tr:not(.virtual-spacer)`).forEach(row => {
     const cell = row.children[column.index];
     if (cell) {
       cell.style.width = px;
@@ -848,7 +851,7 @@ async function init(force = false) {
     let loadedViaReload = false;
     if (isPywebview && !hasInitialExcelLoadFlag?.() && typeof api.reload_from_excel === 'function') {
       try {
-        payload = normalizeStatePayload(await api.reload_from_excel());
+        payload = await requestInitialStatePayload(api);
         loadedViaReload = true;
       } catch (e) {
         console.warn('reload_from_excel failed, fallback to get_*', e);
@@ -856,9 +859,9 @@ async function init(force = false) {
       }
     }
 
-    if (isPywebview && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
+    if (RUN_MODE !== 'mock' && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
       try {
-        payload = normalizeStatePayload(await api.get_state_snapshot());
+        payload = await requestCachedStatePayload(api);
       } catch (err) {
         console.warn('get_state_snapshot failed:', err);
       }
@@ -885,28 +888,134 @@ async function init(force = false) {
 }
 
 /* ===================== レンダリング ===================== */
-function renderList() {
-  const container = document.getElementById('list-container');
-  if (!container) return;
+// 件数がこれを超えると、表示範囲の行だけを DOM に置く (前後は高さだけのスペーサー行)
+const LIST_VIRTUALIZE_THRESHOLD = 300;
+const LIST_ROW_HEIGHT_ESTIMATE = 36;
+const LIST_OVERSCAN_ROWS = 20;
+const listView = {
+  table: null,
+  thead: null,
+  tbody: null,
+  topSpacer: null,
+  bottomSpacer: null,
+  entries: [],
+  rows: new Map(),
+  rowHeight: LIST_ROW_HEIGHT_ESTIMATE,
+  scrollBound: false,
+  pendingScroll: false,
+};
 
-  const filtered = getFilteredTasks();
+function createTaskRow(task) {
+  const tr = document.createElement('tr');
+  tr.dataset.no = String(task.No || '');
+  // 行は No がずれても再利用されるため、No はイベント発生時に dataset から読む
+  tr.addEventListener('dblclick', () => openEdit(Number(tr.dataset.no)));
+
+  const noTd = document.createElement('td');
+  applyColumnBaseStyles(noTd, 'no');
+  noTd.textContent = task.No ? `#${task.No}` : '';
+  tr.appendChild(noTd);
+
+  const majorTd = document.createElement('td');
+  applyColumnBaseStyles(majorTd, 'major');
+  if ((task.大分類 || '').trim()) {
+    const badge = document.createElement('span');
+    badge.className = 'category-pill category-major';
+    badge.textContent = task.大分類.trim();
+    majorTd.appendChild(badge);
+  }
+  tr.appendChild(majorTd);
+
+  const minorTd = document.createElement('td');
+  applyColumnBaseStyles(minorTd, 'minor');
+  if ((task.中分類 || '').trim()) {
+    const badge = document.createElement('span');
+    badge.className = 'category-pill category-minor';
+    badge.textContent = task.中分類.trim();
+    minorTd.appendChild(badge);
+  }
+  tr.appendChild(minorTd);
+
+  const titleTd = document.createElement('td');
+  applyColumnBaseStyles(titleTd, 'task');
+  titleTd.classList.add('task-cell', 'col-task');
+  titleTd.textContent = task.タスク || '(無題)';
+  tr.appendChild(titleTd);
+
+  const statusTd = document.createElement('td');
+  applyColumnBaseStyles(statusTd, 'status');
+  const statusPill = document.createElement('span');
+  statusPill.className = 'status-pill';
+  const statusLabel = normalizeStatusLabel(task.ステータス);
+  statusPill.textContent = statusLabel;
+  const statusClass = STATUS_CLASS_MAP.get(statusLabel);
+  if (statusClass) {
+    statusPill.classList.add(statusClass);
+  }
+  statusTd.appendChild(statusPill);
+  tr.appendChild(statusTd);
+
+  const assigneeTd = document.createElement('td');
+  applyColumnBaseStyles(assigneeTd, 'assignee');
+  assigneeTd.textContent = (task.担当者 || '').trim();
+  tr.appendChild(assigneeTd);
+
+  const priorityTd = document.createElement('td');
+  applyColumnBaseStyles(priorityTd, 'priority');
+  if (task.優先度 !== undefined && task.優先度 !== null && String(task.優先度).trim() !== '') {
+    const pill = document.createElement('span');
+    pill.className = 'priority-pill';
+    pill.textContent = `優先度: ${task.優先度}`;
+    const priorityLevel = getPriorityLevel(task.優先度);
+    if (priorityLevel && priorityLevel !== 'unset' && priorityLevel !== 'custom') {
+      pill.classList.add(`priority-pill--${priorityLevel}`);
+    }
+    priorityTd.appendChild(pill);
+  }
+  tr.appendChild(priorityTd);
+
+  const dueTd = document.createElement('td');
+  applyColumnBaseStyles(dueTd, 'due');
+  if (task.期限) {
+    const due = document.createElement('span');
+    due.className = 'due-badge';
+    let label = task.期限;
+    const state = getDueState(task);
+    if (state) {
+      if (state.level === 'overdue') due.classList.add('due-overdue');
+      if (state.level === 'warning') due.classList.add('due-warning');
+      label += `（${state.label}）`;
+    }
+    due.textContent = label;
+    dueTd.appendChild(due);
+  }
+  tr.appendChild(dueTd);
 
-  buildAssigneeWorkload(filtered);
+  const notesTd = document.createElement('td');
+  applyColumnBaseStyles(notesTd, 'notes');
+  notesTd.classList.add('notes-cell', 'col-notes');
+  notesTd.textContent = task.備考 || '';
+  tr.appendChild(notesTd);
 
-  container.innerHTML = '';
+  return tr;
+}
 
-  if (filtered.length === 0) {
-    const empty = document.createElement('div');
-    empty.className = 'empty-message';
-    empty.textContent = '該当するタスクはありません。';
-    container.appendChild(empty);
-    updateHorizontalScrollbar(null);
-    updateHeaderDueSummary(filtered);
-    return;
-  }
+function createSpacerRow() {
+  const row = document.createElement('tr');
+  row.className = 'virtual-spacer';
+  row.setAttribute('aria-hidden', 'true');
+  const cell = document.createElement('td');
+  cell.colSpan = TABLE_COLUMN_CONFIG.length;
+  row.appendChild(cell);
+  return row;
+}
 
-  const statusOrder = new Map();
-  STATUSES.forEach((s, idx) => { statusOrder.set(s, idx); });
+function ensureListTable(container) {
+  if (listView.table && listView.table.parentNode === container) {
+    return listView.table;
+  }
+  container.innerHTML = '';
+  listView.rows.clear();
 
   const table = document.createElement('table');
   table.className = 'task-list';
@@ -959,9 +1068,172 @@ function renderList() {
   });
   thead.appendChild(headerRow);
   table.appendChild(thead);
-  applySortHeaderState(thead);
 
   const tbody = document.createElement('tbody');
+  table.appendChild(tbody);
+  container.appendChild(table);
+
+  listView.table = table;
+  listView.thead = thead;
+  listView.tbody = tbody;
+  listView.topSpacer = createSpacerRow();
+  listView.bottomSpacer = createSpacerRow();
+  return table;
+}
+
+function bindListScroll() {
+  if (listView.scrollBound) return;
+  const scroller = document.getElementById('list-panel');
+  if (!scroller) return;
+  scroller.addEventListener('scroll', () => {
+    if (listView.pendingScroll) return;
+    listView.pendingScroll = true;
+    window.requestAnimationFrame(() => {
+      listView.pendingScroll = false;
+      renderVisibleRows();
+    });
+  }, { passive: true });
+  window.addEventListener('resize', () => renderVisibleRows());
+  listView.scrollBound = true;
+}
+
+function visibleEntryRange(total) {
+  if (total <= LIST_VIRTUALIZE_THRESHOLD) {
+    return [0, total];
+  }
+  const scroller = document.getElementById('list-panel');
+  const { table, thead } = listView;
+  if (!scroller || !table) {
+    return [0, Math.min(total, LIST_VIRTUALIZE_THRESHOLD)];
+  }
+  const tableTop = table.getBoundingClientRect().top - scroller.getBoundingClientRect().top + scroller.scrollTop;
+  const offset = scroller.scrollTop - tableTop - (thead?.offsetHeight || 0);
+  const rowHeight = listView.rowHeight;
+  const start = Math.max(0, Math.floor(offset / rowHeight) - LIST_OVERSCAN_ROWS);
+  const visible = Math.ceil((scroller.clientHeight || window.innerHeight) / rowHeight);
+  return [Math.min(start, total), Math.min(total, start + visible + LIST_OVERSCAN_ROWS * 2)];
+}
+
+// 表示範囲の行を、行キーと内容の署名で使い回しながら tbody に並べる
+function renderVisibleRows() {
+  const { tbody, entries } = listView;
+  if (!tbody) return;
+  const [start, end] = visibleEntryRange(entries.length);
+  const virtualized = entries.length > LIST_VIRTUALIZE_THRESHOLD;
+  const nextRows = new Map();
+  const elements = [];
+  if (virtualized) {
+    listView.topSpacer.firstChild.style.height = `${start * listView.rowHeight}px`;
+    elements.push(listView.topSpacer);
+  }
+  for (let index = start; index < end; index += 1) {
+    const entry = entries[index];
+    const cached = listView.rows.get(entry.key);
+    const reused = cached && cached.signature === entry.signature;
+    const row = reused ? cached.el : entry.build();
+    if (reused && entry.refresh) entry.refresh(row);
+    nextRows.set(entry.key, { signature: entry.signature, el: row });
+    elements.push(row);
+  }
+  if (virtualized) {
+    listView.bottomSpacer.firstChild.style.height = `${(entries.length - end) * listView.rowHeight}px`;
+    elements.push(listView.bottomSpacer);
+  }
+  elements.forEach((el, index) => {
+    const current = tbody.children[index];
+    if (current !== el) {
+      tbody.insertBefore(el, current || null);
+    }
+  });
+  while (tbody.children.length > elements.length) {
+    tbody.removeChild(tbody.lastElementChild);
+  }
+  listView.rows = nextRows;
+
+  if (virtualized && end > start) {
+    // 実際の行の高さの平均で見積もりを補正し、スクロール位置とのずれを抑える
+    const first = nextRows.get(entries[start].key).el;
+    const last = nextRows.get(entries[end - 1].key).el;
+    const measured = (last.offsetTop + last.offsetHeight - first.offsetTop) / (end - start);
+    if (Number.isFinite(measured) && measured > 0) {
+      listView.rowHeight = measured;
+    }
+  }
+}
+
+// No は前の行の追加・削除でずれるため署名に含めず、再利用する行の表示だけを refreshTaskRowNo で直す
+function taskRowSignature(task) {
+  const state = task.期限 ? getDueState(task) : null;
+  return JSON.stringify([
+    task.大分類, task.中分類, task.タスク, task.ステータス,
+    task.担当者, task.優先度, task.期限, task.備考,
+    state?.level, state?.label,
+  ]);
+}
+
+function refreshTaskRowNo(row, task) {
+  const no = String(task.No || '');
+  if (row.dataset.no === no) return;
+  row.dataset.no = no;
+  row.firstElementChild.textContent = task.No ? `#${task.No}` : '';
+}
+
+function buildListEntries(groupedTasks) {
+  const entries = [];
+  groupedTasks.forEach(majorGroup => {
+    const majorMeta = { majorValue: majorGroup.value };
+    entries.push({
+      key: `major:${majorGroup.key}`,
+      signature: `${majorGroup.label}\u0000${majorGroup.count}`,
+      build: () => createGroupRow('major', majorGroup.label, majorGroup.count, majorMeta),
+    });
+    majorGroup.minors.forEach(minorGroup => {
+      const minorMeta = { majorValue: majorGroup.value, minorValue: minorGroup.value };
+      entries.push({
+        key: `minor:${majorGroup.key}\u0000${minorGroup.key}`,
+        signature: `${minorGroup.label}\u0000${minorGroup.tasks.length}`,
+        build: () => createGroupRow('minor', minorGroup.label, minorGroup.tasks.length, minorMeta),
+      });
+      minorGroup.tasks.forEach(task => {
+        entries.push({
+          key: task.__kanban_id ? `task:${task.__kanban_id}` : `task-no:${task.No}`,
+          signature: taskRowSignature(task),
+          build: () => createTaskRow(task),
+          refresh: row => refreshTaskRowNo(row, task),
+        });
+      });
+    });
+  });
+  return entries;
+}
+
+function renderList() {
+  const container = document.getElementById('list-container');
+  if (!container) return;
+
+  const filtered = getFilteredTasks();
+
+  buildAssigneeWorkload(filtered);
+
+  if (filtered.length === 0) {
+    container.innerHTML = '';
+    listView.table = null;
+    listView.rows.clear();
+    const empty = document.createElement('div');
+    empty.className = 'empty-message';
+    empty.textContent = '該当するタスクはありません。';
+    container.appendChild(empty);
+    updateHorizontalScrollbar(null);
+    updateHeaderDueSummary(filtered);
+    return;
+  }
+
+  const statusOrder = new Map();
+  STATUSES.forEach((s, idx) => { statusOrder.set(s, idx); });
+
+  const table = ensureListTable(container);
+  applySortHeaderState(listView.thead);
+  bindListScroll();
 
   const activeSorts = SORT_STATE.filter(entry => SORT_COMPARATORS[entry.key]);
 
@@ -981,118 +1253,8 @@ function renderList() {
       return defaultListComparator(a, b, statusOrder);
     });
 
-  const createTaskRow = (task) => {
-    const tr = document.createElement('tr');
-    tr.dataset.no = String(task.No || '');
-    tr.addEventListener('dblclick', () => openEdit(task.No));
-
-    const noTd = document.createElement('td');
-    applyColumnBaseStyles(noTd, 'no');
-    noTd.textContent = task.No ? `#${task.No}` : '';
-    tr.appendChild(noTd);
-
-    const majorTd = document.createElement('td');
-    applyColumnBaseStyles(majorTd, 'major');
-    if ((task.大分類 || '').trim()) {
-      const badge = document.createElement('span');
-      badge.className = 'category-pill category-major';
-      badge.textContent = task.大分類.trim();
-      majorTd.appendChild(badge);
-    }
-    tr.appendChild(majorTd);
-
-    const minorTd = document.createElement('td');
-    applyColumnBaseStyles(minorTd, 'minor');
-    if ((task.中分類 || '').trim()) {
-      const badge = document.createElement('span');
-      badge.className = 'category-pill category-minor';
-      badge.textContent = task.中分類.trim();
-      minorTd.appendChild(badge);
-    }
-    tr.appendChild(minorTd);
-
-    const titleTd = document.createElement('td');
-    applyColumnBaseStyles(titleTd, 'task');
-    titleTd.classList.add('task-cell', 'col-task');
-    titleTd.textContent = task.タスク || '(無題)';
-    tr.appendChild(titleTd);
-
-    const statusTd = document.createElement('td');
-    applyColumnBaseStyles(statusTd, 'status');
-    const statusPill = document.createElement('span');
-    statusPill.className = 'status-pill';
-    const statusLabel = normalizeStatusLabel(task.ステータス);
-    statusPill.textContent = statusLabel;
-    const statusClass = STATUS_CLASS_MAP.get(statusLabel);
-    if (statusClass) {
-      statusPill.classList.add(statusClass);
-    }
-    statusTd.appendChild(statusPill);
-    tr.appendChild(statusTd);
-
-    const assigneeTd = document.createElement('td');
-    applyColumnBaseStyles(assigneeTd, 'assignee');
-    assigneeTd.textContent = (task.担当者 || '').trim();
-    tr.appendChild(assigneeTd);
-
-    const priorityTd = document.createElement('td');
-    applyColumnBaseStyles(priorityTd, 'priority');
-    if (task.優先度 !== undefined && task.優先度 !== null && String(task.優先度).trim() !== '') {
-      const pill = document.createElement('span');
-      pill.className = 'priority-pill';
-      pill.textContent = `優先度: ${task.優先度}`;
-      const priorityLevel = getPriorityLevel(task.優先度);
-      if (priorityLevel && priorityLevel !== 'unset' && priorityLevel !== 'custom') {
-        pill.classList.add(`priority-pill--${priorityLevel}`);
-      }
-      priorityTd.appendChild(pill);
-    }
-    tr.appendChild(priorityTd);
-
-    const dueTd = document.createElement('td');
-    applyColumnBaseStyles(dueTd, 'due');
-    if (task.期限) {
-      const due = document.createElement('span');
-      due.className = 'due-badge';
-      let label = task.期限;
-      const state = getDueState(task);
-      if (state) {
-        if (state.level === 'overdue') due.classList.add('due-overdue');
-        if (state.level === 'warning') due.classList.add('due-warning');
-        label += `（${state.label}）`;
-      }
-      due.textContent = label;
-      dueTd.appendChild(due);
-    }
-    tr.appendChild(dueTd);
-
-    const notesTd = document.createElement('td');
-    applyColumnBaseStyles(notesTd, 'notes');
-    notesTd.classList.add('notes-cell', 'col-notes');
-    notesTd.textContent = task.備考 || '';
-    tr.appendChild(notesTd);
-
-    return tr;
-  };
-
-  const groupedTasks = buildGroupedTaskList(sortedTasks);
-  groupedTasks.forEach(majorGroup => {
-    tbody.appendChild(createGroupRow('major', majorGroup.label, majorGroup.count, {
-      majorValue: majorGroup.value,
-    }));
-    majorGroup.minors.forEach(minorGroup => {
-      tbody.appendChild(createGroupRow('minor', minorGroup.label, minorGroup.tasks.length, {
-        majorValue: majorGroup.value,
-        minorValue: minorGroup.value,
-      }));
-      minorGroup.tasks.forEach(task => {
-        tbody.appendChild(createTaskRow(task));
-      });
-    });
-  });
-
-  table.appendChild(tbody);
-  container.appendChild(table);
+  listView.entries = buildListEntries(buildGroupedTaskList(sortedTasks));
+  renderVisibleRows();
 
   updateHorizontalScrollbar(table);
   updateHeaderDueSummary(filtered);
@@ -1319,88 +1481,44 @@ function setupCategoryInputSuggestions(fmajor, fminor) {
   const minorListEl = document.getElementById('modal-minor-list');
   if (!majorListEl && !minorListEl) return;
 
-  const { majorList, minorMap, allMinors } = collectCategoryOptions();
-
-  const fillOptions = (datalist, values) => {
-    if (!datalist) return;
-    datalist.innerHTML = '';
-    if (!Array.isArray(values)) return;
-    const seen = new Set();
-    values.forEach(value => {
-      const text = String(value ?? '').trim();
-      if (!text || seen.has(text)) return;
-      seen.add(text);
-      const opt = document.createElement('option');
-      opt.value = text;
-      datalist.appendChild(opt);
-    });
-  };
-
-  fillOptions(majorListEl, majorList);
-
-  const fallbackMinors = Array.isArray(allMinors) ? allMinors : [];
-  const updateMinorOptions = () => {
-    if (!minorListEl) return;
-    const majorValue = String(fmajor?.value ?? '').trim();
-    let candidates = fallbackMinors;
-    if (majorValue && minorMap.has(majorValue)) {
-      const list = minorMap.get(majorValue) || [];
-      if (Array.isArray(list) && list.length > 0) {
-        candidates = list;
-      }
-    }
-    fillOptions(minorListEl, candidates);
-  };
+  bindSuggestions(fmajor, majorListEl, {
+    api,
+    column: '大分類',
+    fallback: () => collectCategoryOptions().majorList,
+  });
 
-  updateMinorOptions();
+  const minorSuggest = bindSuggestions(fminor, minorListEl, {
+    api,
+    column: '中分類',
+    fallback: () => collectCategoryOptions().allMinors,
+    narrow: () => {
+      // 大分類が入力済みでその下に既存の中分類があれば、その一覧に絞る
+      const majorValue = String(fmajor?.value ?? '').trim();
+      if (!majorValue) return null;
+      const list = collectCategoryOptions().minorMap.get(majorValue);
+      return Array.isArray(list) && list.length > 0 ? list : null;
+    },
+  });
 
   if (fmajor && minorListEl) {
     if (typeof fmajor.__minorListHandler === 'function') {
-      fmajor.removeEventListener('input', fmajor.__minorListHandler);
       fmajor.removeEventListener('change', fmajor.__minorListHandler);
     }
-    const handler = () => updateMinorOptions();
+    const handler = () => minorSuggest.refresh();
     fmajor.__minorListHandler = handler;
-    fmajor.addEventListener('input', handler);
     fmajor.addEventListener('change', handler);
   }
-
-  if (fminor && minorListEl) {
-    if (typeof fminor.__minorListRefresh === 'function') {
-      fminor.removeEventListener('focus', fminor.__minorListRefresh);
-    }
-    const refresh = () => updateMinorOptions();
-    fminor.__minorListRefresh = refresh;
-    fminor.addEventListener('focus', refresh);
-  }
 }
 
 function setupAssigneeInputSuggestions(fassignee) {
   const datalist = document.getElementById('modal-assignee-list');
   if (!fassignee || !datalist) return;
 
-  const candidates = Array.isArray(TASKS) ? uniqAssignees() : [];
-  const seen = new Set();
-  datalist.innerHTML = '';
-
-  candidates.forEach(name => {
-    const text = String(name ?? '').trim();
-    if (!text || seen.has(text)) return;
-    seen.add(text);
-    const opt = document.createElement('option');
-    opt.value = text;
-    datalist.appendChild(opt);
+  bindSuggestions(fassignee, datalist, {
+    api,
+    column: '担当者',
+    fallback: () => (Array.isArray(TASKS) ? uniqAssignees() : []),
   });
-
-  const current = String(fassignee.value ?? '').trim();
-  if (current && !seen.has(current)) {
-    const opt = document.createElement('option');
-    opt.value = current;
-    datalist.appendChild(opt);
-    seen.add(current);
-  }
-
-  fassignee.setAttribute('list', datalist.id);
 }
 
 function openModal(task, { mode }) {
@@ -163,6 +163,11 @@
             onRealtimeUpdate(payload, context);
           }
         },
+        onDueUpdate: () => {
+          if (typeof onRender === 'function') {
+            onRender(context);
+          }
+        },
       });
     }
 
@@ -4,10 +4,14 @@ const {
   sanitizeTaskRecord,
   sanitizeTaskList,
   normalizeStatePayload,
+  requestInitialStatePayload,
+  requestCachedStatePayload,
   normalizeStatusLabel,
   denormalizeStatusLabel,
   createPriorityHelper,
   setupDragViewportAutoScroll,
+  bindSuggestions,
+  getDueCounts,
 } = window.TaskAppCommon;
 
 const {
@@ -30,6 +34,8 @@ const { createFilterPresetManager } = window.TaskFilterPresets || {};
 let api;
 let RUN_MODE = 'mock';
 let TASKS = [];
+// TASKS を読み込んだ状態の版。画面側で書き換えたら null にし、ヘッダーは数え直す
+let TASKS_STATE = null;
 let STATUSES = [];
 let VALIDATIONS = {};
 let excelSyncHandlers = null;
@@ -97,10 +103,11 @@ const headerController = window.TaskAppHeader?.initHeader({
 });
 
 function updateHeaderDueSummary(tasks) {
+  const counts = tasks === TASKS && typeof getDueCounts === 'function' ? getDueCounts(TASKS_STATE) : null;
   if (headerController && typeof headerController.updateDueSummary === 'function') {
-    headerController.updateDueSummary(tasks);
+    headerController.updateDueSummary(tasks, { counts });
   } else {
-    window.TaskAppHeader?.updateDueSummary(tasks);
+    window.TaskAppHeader?.updateDueSummary(tasks, { counts });
   }
 }
 
@@ -121,6 +128,7 @@ if (typeof createExcelSyncHandlers === 'function') {
       }) || {};
 
       TASKS = Array.isArray(snapshot.tasks) ? snapshot.tasks : TASKS;
+      TASKS_STATE = null;
       if (Array.isArray(snapshot.statuses) && snapshot.statuses.length > 0) {
         STATUSES = snapshot.statuses;
       }
@@ -198,6 +206,7 @@ if (typeof setupRuntime === 'function') {
       }
     },
     onRealtimeUpdate: (payload) => applyStateFromPayload(payload, { fallbackToApi: false }),
+    onDueUpdate: () => updateHeaderDueSummary(TASKS),
   });
 }
 
@@ -223,11 +232,11 @@ async function init(force = false) {
       const isPywebview = RUN_MODE === 'pywebview';
       let loadedViaReload = false;
       if (isPywebview && !hasInitialExcelLoadFlag?.() && typeof api.reload_from_excel === 'function') {
-        payload = normalizeStatePayload(await api.reload_from_excel());
+        payload = await requestInitialStatePayload(api);
         loadedViaReload = true;
       }
-      if (isPywebview && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
-        payload = normalizeStatePayload(await api.get_state_snapshot());
+      if (RUN_MODE !== 'mock' && !loadedViaReload && typeof api.get_state_snapshot === 'function') {
+        payload = await requestCachedStatePayload(api);
       }
       if (!Array.isArray(payload.tasks) && typeof api.get_tasks === 'function') {
         payload.tasks = await api.get_tasks();
@@ -260,8 +269,10 @@ async function applyStateFromPayload(payload, { fallbackToApi = false } = {}) {
   const data = normalizeStatePayload(payload);
 
   let tasksUpdated = false;
+  TASKS_STATE = null;
   if (Array.isArray(data.tasks)) {
     TASKS = sanitizeTaskList(data.tasks);
+    TASKS_STATE = { epoch: data.state_epoch, version: data.state_version };
     tasksUpdated = true;
   }
   if (!tasksUpdated && fallbackToApi && typeof api?.get_tasks === 'function') {
@@ -848,30 +859,13 @@ function setupAssigneeInputSuggestions(fassignee) {
   const datalist = document.getElementById('modal-assignee-list');
   if (!fassignee || !datalist) return;
 
-  const candidates = collectAllAssignees()
-    .map(name => (name === ASSIGNEE_UNASSIGNED_LABEL ? '' : String(name ?? '').trim()))
-    .filter(Boolean);
-
-  const seen = new Set();
-  datalist.innerHTML = '';
-
-  candidates.forEach(name => {
-    if (seen.has(name)) return;
-    seen.add(name);
-    const opt = document.createElement('option');
-    opt.value = name;
-    datalist.appendChild(opt);
+  bindSuggestions(fassignee, datalist, {
+    api,
+    column: '担当者',
+    fallback: () => collectAllAssignees()
+      .map(name => (name === ASSIGNEE_UNASSIGNED_LABEL ? '' : String(name ?? '').trim()))
+      .filter(Boolean),
   });
-
-  const current = String(fassignee.value ?? '').trim();
-  if (current && !seen.has(current)) {
-    const opt = document.createElement('option');
-    opt.value = current;
-    datalist.appendChild(opt);
-    seen.add(current);
-  }
-
-  fassignee.setAttribute('list', datalist.id);
 }
 
 function enumerateDays(from, to) {
@@ -1038,6 +1032,7 @@ function openModal(task, { mode }) {
             .map((record, idx) => ({ ...record, No: idx + 1 }));
           TASKS = sanitizeTaskList(remaining);
         }
+        TASKS_STATE = null;
         CURRENT_EDIT = null;
         ensureRangeDefaults();
         closeModal();
@@ -1094,6 +1089,7 @@ function openModal(task, { mode }) {
           }
         }
       }
+      TASKS_STATE = null;
       CURRENT_EDIT = null;
       closeModal();
       ensureRangeDefaults();
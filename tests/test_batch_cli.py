@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, TaskStore, apply_batch_operations
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "既存1", "Alice", "高", None, ""])
+    ws.append(["未着手", "A", "a", "既存2", "Bob", "中", None, ""])
+    wb.save(path)
+
+
+def test_batch_applies_stream_with_single_save_and_reports_errors(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    second_id = str(store._df.iloc[1]["__kanban_id"])
+
+    saves = []
+    original_save = store.save_excel
+
+    def counting_save(**kwargs):
+        saves.append(kwargs)
+        return original_save(**kwargs)
+
+    store.save_excel = counting_save
+    lines = [
+        json.dumps({"op": "add", "task": {"タスク": "夜間追加", "担当者": "Carol"}}, ensure_ascii=False),
+        json.dumps({"op": "move", "no": 1, "status": "完了"}, ensure_ascii=False),
+        "",
+        json.dumps({"op": "update", "id": second_id, "patch": {"担当者": "Dave"}}, ensure_ascii=False),
+        json.dumps({"op": "delete", "no": 99}),
+        "{broken",
+        json.dumps({"op": "rename"}),
+        json.dumps({"op": "update", "no": 1, "patch": {"タスク": ""}}, ensure_ascii=False),
+    ]
+    report = apply_batch_operations(store, lines)
+
+    assert report["applied"] == 3
+    assert report["failed"] == 4
+    assert [e["line"] for e in report["errors"]] == [5, 6, 7, 8]
+    assert report["errors"][0]["error"] == "No=99 は存在しません。"
+    assert report["saved"] == str(excel_path.resolve())
+    assert len(saves) == 1
+
+    rows = list(load_workbook(excel_path).active.iter_rows(min_row=2, values_only=True))
+    assert [(r[0], r[3], r[4]) for r in rows] == [
+        ("完了", "既存1", "Alice"),
+        ("未着手", "既存2", "Dave"),
+        (None, "夜間追加", "Carol"),
+    ]
+
+
+def test_batch_replays_a_leftover_journal_and_clears_it_on_save(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    crashed = TaskStore(excel_path, enable_change_log=False)
+    crashed.update_task(1, {"担当者": "前回の画面操作"})
+    crashed.close()
+    journal_path = crashed.journal.path
+    assert journal_path.exists()
+
+    dry = TaskStore(excel_path, enable_change_log=False)
+    dry_report = apply_batch_operations(
+        dry, [json.dumps({"op": "move", "no": 2, "status": "完了"}, ensure_ascii=False)], save=False
+    )
+    dry.close()
+    assert dry_report["applied"] == 1 and dry_report["saved"] is None
+    # 保存しない場合はバッチの操作をジャーナルへ書かず、残っていた操作もそのまま残す。
+    assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 1
+
+    store = TaskStore(excel_path, enable_change_log=False)
+    report = apply_batch_operations(
+        store, [json.dumps({"op": "move", "no": 2, "status": "完了"}, ensure_ascii=False)]
+    )
+    store.close()
+    assert report["applied"] == 1 and report["saved"]
+    assert not journal_path.exists() or journal_path.stat().st_size == 0
+
+    rows = list(load_workbook(excel_path).active.iter_rows(min_row=2, values_only=True))
+    assert [(r[0], r[4]) for r in rows] == [("未着手", "前回の画面操作"), ("完了", "Bob")]
+    reopened = TaskStore(excel_path, enable_change_log=False)
+    assert [t["担当者"] for t in reopened.get_tasks()] == ["前回の画面操作", "Bob"]
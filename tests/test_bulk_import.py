@@ -0,0 +1,71 @@
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    ws.append(["未着手", "A", "a", "既存", "Alice", "高", None, "", "keep-1"])
+    wb.save(path)
+
+
+def _wait(api: JsApi, job_id: str) -> dict:
+    for _ in range(500):
+        job = api.get_job(job_id)["job"]
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_bulk_import_streams_csv_with_mapping_and_dedupe(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    csv_path = tmp_path / "tickets.csv"
+    rows = ["Title,Owner,State,Due,Priority,__kanban_id"]
+    rows.append("重複,Bob,未着手,2024-05-01,1,keep-1")
+    rows.append(",Bob,未着手,,,")
+    for i in range(4999):
+        rows.append(f"チケット{i},User{i % 7},{'検証中' if i % 2 else '未着手'},2024-06-{i % 28 + 1:02d},{i % 3 + 1},")
+    rows.append("同一ID,Carol,未着手,,高,dup-x")
+    rows.append("同一ID2,Carol,未着手,,高,dup-x")
+    csv_path.write_text("\n".join(rows), encoding="utf-8")
+
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    api = JsApi(store)
+    started = api.start_job(
+        "import",
+        {
+            "path": csv_path.name,
+            "chunk_size": 1000,
+            "mapping": {"Title": "タスク", "Owner": "担当者", "State": "ステータス", "Due": "期限", "Priority": "優先度"},
+        },
+    )
+    job = _wait(api, started["job"]["id"])
+    outside = api.start_job("import", {"path": str(csv_path)})
+    rejected = _wait(api, outside["job"]["id"])
+    api.jobs.shutdown()
+
+    assert rejected["status"] == "failed" and "ファイル名" in rejected["error"]
+
+    assert job["status"] == "succeeded", job
+    assert job["result"] == {"imported": 5000, "duplicates": 2, "invalid": 1, "read": 5003}
+    tasks = store.get_tasks()
+    assert len(tasks) == 5001
+    assert tasks[1]["タスク"] == "チケット0"
+    assert tasks[1]["期限"] == "2024-06-01"
+    assert tasks[1]["優先度"] == 1
+    assert tasks[-1]["タスク"] == "同一ID"
+    assert "検証中" in store.get_statuses()
+    assert isinstance(store._df["担当者"].dtype, pd.CategoricalDtype)
+    assert len(set(store._df["__kanban_id"])) == 5001
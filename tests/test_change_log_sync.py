@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+import backend.backend as backend
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "既存タスク", "Alice", "高", None, ""])
+    ws.append(["未着手", "B", "b", "消えるタスク", "Bob", "中", None, ""])
+    wb.save(path)
+
+
+def test_peer_applies_saved_delta_without_reparse(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    writer = TaskStore(excel_path, enable_journal=False)
+    reader = TaskStore(excel_path, enable_journal=False)
+
+    writer.move_task(1, "完了")
+    writer.delete_task(2)
+    writer.add_task({"タスク": "新規", "ステータス": "レビュー"})
+    writer.save_excel(backup=False)
+
+    def fail_parse(requested_sheet):
+        raise AssertionError("reparse should not happen")
+
+    monkeypatch.setattr(reader, "_parse_workbook", fail_parse)
+    assert reader.sync_from_change_log() is True
+    tasks = reader.get_tasks()
+    assert [t["タスク"] for t in tasks] == ["既存タスク", "新規"]
+    assert tasks[0]["ステータス"] == "完了"
+    assert "レビュー" in reader.get_statuses()
+    # 自分自身の保存は取り込まない
+    assert writer.sync_from_change_log() is False
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    writer.update_task(1, {"タスク": "再保存"})
+    writer.save_excel(backup=False)
+    wb = load_workbook(excel_path)
+    wb.active.cell(row=2, column=TASK_COLUMNS.index("備考") + 1).value = "Excel で直接編集"
+    wb.save(excel_path)
+
+    # 指紋が一致しないので全再解析が必要
+    assert reader.sync_from_change_log() is False
+    reader.load_excel()
+    assert reader.get_tasks()[0]["備考"] == "Excel で直接編集"
+
+
+def test_failed_replace_does_not_announce_a_save(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    writer = TaskStore(excel_path, enable_journal=False)
+    reader = TaskStore(excel_path, enable_journal=False)
+    writer.update_task(1, {"タスク": "保存されない"})
+
+    def fail_replace(src, dst):
+        raise PermissionError("locked")
+
+    monkeypatch.setattr(backend.os, "replace", fail_replace)
+    with pytest.raises(PermissionError):
+        writer.save_excel(backup=False)
+    monkeypatch.undo()
+
+    assert reader.sync_from_change_log() is False
+    assert reader.get_tasks()[0]["タスク"] == "既存タスク"
+    assert writer.has_unsaved_changes()
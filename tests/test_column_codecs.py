@@ -0,0 +1,51 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _edge_frame(store: TaskStore) -> pd.DataFrame:
+    due = [
+        dt.date(2024, 1, 5),
+        pd.Timestamp("2024-02-03 10:00"),
+        dt.datetime(2024, 3, 4, 12, 30),
+        "2024/4/5",
+        "期限未定",
+        None,
+        pd.NaT,
+        dt.date(1500, 1, 1),
+        dt.date(2024, 1, 5),
+    ]
+    priority = [2, 2.0, 1.5, "高", None, np.int64(3), "", "中", 2]
+    rows = len(due)
+    df = pd.DataFrame(
+        {
+            "ステータス": ["未着手", "完了", None, "未着手", "保留", "完了", "進行中", "", "未着手"],
+            "大分類": ["A"] * rows,
+            "中分類": [None, "b", "b", None, "c", "c", "c", "c", "c"],
+            "タスク": [f"タスク{i}" for i in range(rows)],
+            "担当者": ["Alice", "Bob", pd.NA, "Alice", "Bob", "Carol", "Alice", "Bob", "Alice"],
+            "優先度": priority,
+            "期限": due,
+            "備考": ["", "改行\r\nあり", None, "x", "y", "z", " ", "w", "v"],
+        },
+        columns=TASK_COLUMNS,
+    )
+    return store._encode_categorical_frames(df)[0]
+
+
+def test_column_codecs_match_per_cell_conversion(tmp_path):
+    store = TaskStore(tmp_path / "board.xlsx", enable_journal=False, enable_change_log=False)
+    df = _edge_frame(store)
+
+    expected_rows = [store._format_row(i, df.iloc[i]) for i in range(len(df))]
+    assert store._format_frame(df) == expected_rows
+
+    for col in TASK_COLUMNS:
+        expected = [store._to_excel_value(col, value) for value in df[col].tolist()]
+        assert store._excel_column_values(col, df[col]) == expected
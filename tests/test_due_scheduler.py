@@ -0,0 +1,56 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, DeadlineScheduler, TaskStore
+
+
+def _build_workbook(path: Path, today: dt.date) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    rows = [
+        ("未着手", "あと5日", today + dt.timedelta(days=5)),
+        ("進行中", "あと1日", today + dt.timedelta(days=1)),
+        ("完了", "完了済み", today - dt.timedelta(days=2)),
+        ("未着手", "期限なし", None),
+    ]
+    for i, (status, title, due) in enumerate(rows):
+        ws.append([status, "", "", title, "", "", due, "", f"id-{i}"])
+    wb.save(path)
+
+
+def test_due_transitions_are_pushed_when_the_day_rolls_over(tmp_path):
+    today = dt.date.today()
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, today)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+
+    summary = store.get_due_states(today)
+    assert summary["counts"] == {"overdue": 0, "warning": 1}
+    assert [(s["No"], s["level"], s["label"]) for s in summary["states"]] == [
+        (1, "normal", "あと5日"),
+        (2, "warning", "あと1日"),
+    ]
+
+    pushed = []
+    scheduler = DeadlineScheduler(store, pushed.append)
+    assert scheduler.tick(today) is None
+
+    result = scheduler.tick(today + dt.timedelta(days=2))
+    assert result["rolled_over"] and pushed == [result]
+    assert [(s["No"], s["level"]) for s in result["transitions"]] == [(1, "warning"), (2, "overdue")]
+    assert result["counts"] == {"overdue": 1, "warning": 1}
+
+    store.update_task(1, {"期限": (today + dt.timedelta(days=10)).isoformat()})
+    store.update_task(2, {"ステータス": "完了"})
+    result = store.advance_due_clock(today + dt.timedelta(days=6))
+    assert result["transitions"] == [] and result["counts"] == {"overdue": 0, "warning": 0}
+
+    result = store.advance_due_clock(today + dt.timedelta(days=7))
+    assert [(s["No"], s["label"]) for s in result["transitions"]] == [(1, "あと3日")]
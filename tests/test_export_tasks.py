@@ -0,0 +1,69 @@
+import csv
+import datetime as dt
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["見積時間", "__kanban_id"])
+    ws.append(["完了", "A", "a", "済み", "Alice", "高", dt.date(2024, 1, 2), "", 3, "id-1"])
+    ws.append(["未着手", "A", "a", "これから", "Bob", 2, None, "メモ", None, "id-2"])
+    ws.append(["完了", "B", "b", "済み2", "Bob", "低", dt.date(2024, 3, 4), "", 1.5, "id-3"])
+    wb.save(path)
+
+
+def test_exports_stream_filtered_state_without_touching_workbook(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    api = JsApi(store)
+    store.add_task({"タスク": "未保存", "ステータス": "完了", "担当者": "Bob"})
+    before = excel_path.stat().st_mtime_ns
+
+    result = store.export_tasks(
+        tmp_path / "done.csv", filters={"ステータス": "完了", "担当者": ["Bob"]}, chunk_size=1
+    )
+    assert result["rows"] == 2 and result["format"] == "csv"
+    with open(tmp_path / "done.csv", encoding="utf-8-sig", newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert [r["タスク"] for r in rows] == ["済み2", "未保存"]
+    assert rows[0]["期限"] == "2024-03-04"
+    assert rows[0]["見積時間"] == "1.5"
+    assert rows[0]["__kanban_id"] == "id-3"
+    assert rows[1]["__kanban_id"]
+
+    api.export_tasks("all.jsonl", None, json.dumps({"期限": "2024-01-02"}))
+    lines = (tmp_path / "all.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {
+            "ステータス": "完了",
+            "大分類": "A",
+            "中分類": "a",
+            "タスク": "済み",
+            "担当者": "Alice",
+            "優先度": "高",
+            "期限": "2024-01-02",
+            "備考": "",
+            "見積時間": 3,
+            "__kanban_id": "id-1",
+        }
+    ]
+
+    with pytest.raises(ValueError):
+        store.export_tasks(tmp_path / "out.txt")
+    # 画面や HTTP からはブックのフォルダー直下のファイル名しか指定できない。
+    for name in (str(tmp_path / "abs.csv"), "../up.csv", "sub/x.csv", "board.xlsx", "board.journal.jsonl"):
+        with pytest.raises(ValueError):
+            api.export_tasks(name)
+    assert excel_path.stat().st_mtime_ns == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["all.jsonl", "board.xlsx", "done.csv"]
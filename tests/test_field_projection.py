@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path, rows: int) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    for i in range(rows):
+        notes = "\n".join(f"メモ{i}-{line}" for line in range(20))
+        ws.append(["未着手", "大", "中", f"タスク{i}", "Alice", "高", None, notes, f"id-{i}"])
+    wb.save(path)
+
+
+def test_projected_payloads_omit_notes_until_detail_is_requested(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 6)
+    api = JsApi(TaskStore(excel_path, enable_journal=False, enable_change_log=False))
+    fields = [col for col in TASK_COLUMNS if col != "備考"]
+
+    tasks = api.get_tasks(fields)
+    # 画面がカード・行の対応付けに使う行 ID は、列の指定にかかわらず常に付く。
+    assert list(tasks[0]) == ["No"] + fields + ["__kanban_id"]
+    assert api.get_tasks("タスク,No")[2] == {"No": 3, "タスク": "タスク2", "__kanban_id": "id-2"}
+
+    snapshot = api.get_state_snapshot("columnar", fields)
+    assert snapshot["fields"] == fields
+    assert "備考" not in snapshot["table"]["columns"]
+    assert "fields" not in api.get_state_snapshot()
+
+    version = snapshot["state_version"]
+    api.update_task(2, {"タスク": "変更"})
+    delta = api.get_changes_since(version, snapshot["state_epoch"], "rows", fields)
+    assert delta["mode"] == "delta" and delta["fields"] == fields
+    assert delta["tasks"] == [{**tasks[1], "タスク": "変更"}]
+
+    detail = api.get_task_detail(2)
+    assert detail["No"] == 2 and detail["備考"].startswith("メモ1-0\nメモ1-1")
+
+    with pytest.raises(ValueError):
+        api.get_tasks(["存在しない列"])
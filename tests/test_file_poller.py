@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from backend.backend import SingleFilePoller
+
+
+class _RecordingHandler:
+    def __init__(self):
+        self.calls = 0
+
+    def process_change(self):
+        self.calls += 1
+
+
+def test_poller_backs_off_when_idle_and_tightens_after_change(tmp_path):
+    target = tmp_path / "board.xlsx"
+    target.write_bytes(b"v1")
+    (tmp_path / "board.bak_20240101_000000.xlsx").write_bytes(b"old")
+    handler = _RecordingHandler()
+    poller = SingleFilePoller(handler, target, min_interval=1.0, max_interval=4.0, backoff_factor=2.0)
+
+    assert poller.poll_once() is False
+    assert poller.poll_once() is False
+    assert poller.stats()["interval_seconds"] == 4.0
+    assert poller.poll_once() is False
+    assert poller.stats()["interval_seconds"] == 4.0
+
+    target.write_bytes(b"version 2")
+    stat = target.stat()
+    os.utime(target, (stat.st_atime, stat.st_mtime + 5))
+    assert poller.poll_once() is True
+    assert handler.calls == 1
+
+    stats = poller.stats()
+    assert stats["interval_seconds"] == 1.0
+    assert stats["polls"] == 4
+    assert stats["changes"] == 1
+    assert stats["avg_latency_ms"] >= 0.0
+    assert stats["path"] == str(Path(target))
@@ -0,0 +1,66 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+import backend.backend as backend
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _build_workbook(path: Path, rows) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    for i, (status, assignee) in enumerate(rows):
+        ws.append([status, "", "", f"タスク{i}", assignee, "", None, "", f"id-{i}"])
+    wb.save(path)
+
+
+def _open(path: Path) -> TaskStore:
+    return TaskStore(path, enable_journal=False, enable_change_log=False, enable_flow_history=True)
+
+
+def test_flow_history_records_mutations_and_backfills_once(tmp_path, monkeypatch):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, [("未着手", "佐藤"), ("未着手", "鈴木"), ("進行中", "佐藤")])
+    _build_workbook(tmp_path / "board.bak_20240101_090000.xlsx", [("未着手", "佐藤")] * 5)
+    _build_workbook(tmp_path / "board.bak_20240101_180000.xlsx", [("未着手", "佐藤"), ("完了", "")])
+    _build_workbook(tmp_path / "board.bak_20240103_120000.xlsx", [("完了", "佐藤")] * 3)
+    _build_workbook(tmp_path / "other.bak_20240102_120000.xlsx", [("未着手", "佐藤")])
+
+    store = _open(excel_path)
+    today = dt.date.today().isoformat()
+    store.update_task(1, {"ステータス": "完了"})
+    store.add_task({"ステータス": "未着手", "タスク": "追加", "担当者": "田中"})
+    store.delete_task(2)
+
+    series = store.get_flow_history(today, today)
+    assert series["status"] == {"未着手": [1], "進行中": [1], "完了": [1]}
+    assert series["assignee"] == {"佐藤": [2], "田中": [1]}
+    assert (series["total"], series["remaining"]) == ([3], [2])
+
+    assert store.backfill_flow_history([tmp_path]) == 2
+    assert store.backfill_flow_history([tmp_path]) == 0
+    history = store.get_flow_history("2024-01-01", "2024-01-04")
+    assert history["dates"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    assert history["status"]["完了"] == [1, 1, 3, 3]
+    assert history["remaining"] == [1, 1, 0, 0]
+    assert history["assignee"][""] == [1, 1, 0, 0]
+
+    # 再起動後は記録済みの系列を読むだけで、補完もやり直さない。
+    monkeypatch.setattr(backend, "FLOW_HISTORY_COMPACT_SLACK", 0)
+    reopened = _open(excel_path)
+    assert reopened.flow_history.backfilled
+    assert reopened.get_flow_history()["start"] == "2024-01-01"
+    reopened.update_task(1, {"ステータス": "保留"})
+    assert reopened.get_flow_history(today, today)["status"]["保留"] == [1]
+    lines = (tmp_path / "board.analytics.jsonl").read_text(encoding="utf-8").splitlines()
+    # 読み込み時の記録で 1 日 1 行に詰め直され、その後の操作分が 1 行追記されている。
+    assert len(lines) == 5 and lines[3] == '{"op":"backfill"}'
+
+    with pytest.raises(ValueError):
+        store.get_flow_history("2024-01-05", "2024-01-01")
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    ws.append(["未着手", "A", "a", "初期", "Alice", "高", None, "", "id-1"])
+    wb.save(path)
+
+
+def test_initial_reload_is_skipped_while_workbook_is_unchanged(tmp_path, monkeypatch):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    api = JsApi(store)
+    loads = []
+    original = store.load_excel
+    monkeypatch.setattr(store, "load_excel", lambda *a, **kw: (loads.append(1), original(*a, **kw))[1])
+
+    freshness = api.get_freshness()
+    assert freshness["fresh"] and freshness["version"] == 1 and freshness["loaded_at"]
+
+    store.add_task({"タスク": "未保存", "ステータス": "未着手"})
+    result = api.reload_if_stale()
+    assert result["reloaded"] is False and loads == []
+    assert [t["タスク"] for t in result["tasks"]] == ["初期", "未保存"]
+
+    store.save_excel(backup=False)
+    assert api.get_freshness()["fresh"]
+
+    wb = load_workbook(excel_path)
+    wb.active["D2"] = "外部で変更"
+    wb.save(excel_path)
+    assert not api.get_freshness()["fresh"]
+
+    result = api.reload_if_stale("columnar")
+    assert result["reloaded"] is True and loads == [1]
+    assert result["format"] == "columnar" and result["freshness"]["fresh"]
+    assert api.get_freshness()["version"] == 3
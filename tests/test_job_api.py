@@ -0,0 +1,68 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path, rows: int) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    for i in range(rows):
+        ws.append(["未着手", "A", "a", f"タスク{i}", "Alice", "高", None, ""])
+    wb.save(path)
+
+
+def _wait(api: JsApi, job_id: str) -> dict:
+    for _ in range(200):
+        job = api.get_job(job_id)["job"]
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_jobs_report_progress_dedupe_and_cancel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 1200)
+    api = JsApi(TaskStore(excel_path, enable_journal=False))
+
+    started = api.start_job("save")
+    job = _wait(api, started["job"]["id"])
+    assert job["status"] == "succeeded"
+    assert job["result"] == str(excel_path.resolve())
+    assert job["done"] == job["total"] == 1200
+
+    gate = threading.Event()
+
+    def blocking(job):
+        while not gate.is_set():
+            job.report("waiting", 0, 1)
+            time.sleep(0.01)
+        return "done"
+
+    api.jobs.register("blocking", blocking)
+    first = api.start_job("blocking", {"x": 1})
+    second = api.start_job("blocking", {"x": 1})
+    assert second["deduplicated"] is True
+    assert second["job"]["id"] == first["job"]["id"]
+
+    assert api.cancel_job(first["job"]["id"]) is True
+    assert _wait(api, first["job"]["id"])["status"] == "cancelled"
+
+    third = api.start_job("blocking", {"x": 1})
+    assert third["deduplicated"] is False
+    gate.set()
+    assert _wait(api, third["job"]["id"])["result"] == "done"
+
+    with pytest.raises(ValueError):
+        api.start_job("unknown")
+    api.jobs.shutdown()
@@ -0,0 +1,95 @@
+import datetime as dt
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path, rows: int) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    for i in range(rows):
+        due = dt.date(2024, 1, 1) if i == 0 else None
+        ws.append(["未着手", "大", "", f"タスク{i}", "Alice", "中", due, "", f"id-{i}"])
+    wb.save(path)
+
+
+def test_pending_changes_report_field_level_diff(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 5)
+    api = JsApi(TaskStore(excel_path, enable_journal=False, enable_change_log=False))
+    assert api.get_pending_changes()["has_changes"] is False
+
+    api.update_task(2, {"ステータス": "完了", "期限": "2024-03-01"})
+    api.update_task(3, {"担当者": "Bob"})
+    api.update_task(3, {"担当者": "Alice"})
+    api.delete_task(4)
+    api.add_task({"ステータス": "進行中", "タスク": "追加"})
+
+    changes = api.get_pending_changes()
+    assert changes["counts"] == {"added": 1, "modified": 1, "deleted": 1}
+    assert changes["modified"] == [
+        {
+            "No": 2,
+            "タスク": "タスク1",
+            "changes": {
+                "ステータス": {"before": "未着手", "after": "完了"},
+                "期限": {"before": "", "after": "2024-03-01"},
+            },
+        }
+    ]
+    assert changes["added"][0]["No"] == 5 and changes["added"][0]["タスク"] == "追加"
+    assert changes["deleted"][0]["タスク"] == "タスク3"
+    assert api.get_pending_changes(limit=0)["truncated"] is True
+
+
+def test_save_is_skipped_when_nothing_changed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 3)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    api = JsApi(store)
+
+    api.update_task(1, {"タスク": "一時的"})
+    api.update_task(1, {"タスク": "タスク0"})
+    mtime = excel_path.stat().st_mtime_ns
+    time.sleep(0.01)
+    skipped = api.save_excel(True)
+    assert skipped["saved"] is False and skipped["path"] == str(excel_path.resolve())
+    assert skipped["counts"] == {"added": 0, "modified": 0, "deleted": 0}
+    assert excel_path.stat().st_mtime_ns == mtime
+    assert store.has_unsaved_changes() is False
+
+    api.update_task(1, {"タスク": "変更"})
+    diff_calls = []
+    diff = store._diff_against_saved
+    monkeypatch.setattr(store, "_diff_against_saved", lambda: diff_calls.append(1) or diff())
+    saved = api.save_excel(True)
+    assert len(diff_calls) == 1
+    assert saved["saved"] is True and saved["counts"]["modified"] == 1
+    assert excel_path.stat().st_mtime_ns != mtime
+    assert api.get_pending_changes()["has_changes"] is False
+
+
+def test_pending_changes_scale_to_large_boards(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 1)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    frame = store._df.iloc[[0] * 100_000].reset_index(drop=True)
+    frame["__kanban_id"] = [f"id-{i}" for i in range(len(frame))]
+    frame["タスク"] = [f"タスク{i}" for i in range(len(frame))]
+    store._df = frame
+    store._last_saved_snapshot = frame.copy()
+    store.update_task(50_000, {"担当者": "Bob"})
+
+    started = time.perf_counter()
+    changes = store.get_pending_changes()
+    assert time.perf_counter() - started < 5
+    assert changes["counts"] == {"added": 0, "modified": 1, "deleted": 0}
@@ -0,0 +1,79 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, PushDispatcher, TaskStore
+
+
+class _RecordingWindow:
+    def __init__(self, block: threading.Event = None):
+        self.scripts = []
+        self.block = block
+
+    def evaluate_js(self, script):
+        if self.block is not None:
+            self.block.wait(5)
+        self.scripts.append(script)
+
+
+def _payload(script):
+    return json.loads(script[script.index("(", script.index("window.__kanban_receive")) + 1 : script.rindex(")")])
+
+
+def _build_store(path: Path) -> TaskStore:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    ws.append(["未着手", "", "", "最初", "", "", None, "", "id-0"])
+    wb.save(path)
+    return TaskStore(path, enable_journal=False, enable_change_log=False)
+
+
+def test_superseded_state_pushes_collapse_into_the_latest(tmp_path):
+    store = _build_store(tmp_path / "board.xlsx")
+    window = _RecordingWindow()
+    dispatcher = PushDispatcher(window)
+
+    for title in ("二番目", "三番目"):
+        store.update_task(1, {"タスク": title})
+        dispatcher.push_state(store, lambda: "rows", lambda: None)
+    dispatcher.push_due({"date": "2024-01-01"})
+    dispatcher.push_due({"date": "2024-01-02"})
+    assert dispatcher.stats()["queue_depth"] == 2
+
+    assert dispatcher.dispatch_pending() == 2
+    assert _payload(window.scripts[0])["tasks"][0]["タスク"] == "三番目"
+    assert _payload(window.scripts[1]) == {"date": "2024-01-02"}
+    stats = dispatcher.stats()
+    assert (stats["queue_depth"], stats["delivered"], stats["superseded"]) == (0, 2, 2)
+
+
+def test_bounded_queue_drops_oldest_and_stuck_evaluations_hold_the_queue():
+    block = threading.Event()
+    dispatcher = PushDispatcher(_RecordingWindow(block), max_queue=2, eval_timeout=0.05)
+
+    for index in range(3):
+        dispatcher.submit(None, lambda index=index: f"/* {index} */")
+    assert dispatcher.stats()["dropped"] == 1
+
+    # 止まった evaluate_js が戻るまでは次の通知を送らず、スレッドも増やさずにキューへ残す。
+    assert dispatcher.dispatch_pending() == 1
+    for title in ("古い状態", "最新の状態"):
+        dispatcher.submit("state", lambda title=title: f"/* {title} */")
+    assert dispatcher.dispatch_pending() == 0
+    stats = dispatcher.stats()
+    assert (stats["timed_out"], stats["dropped"], stats["superseded"], stats["queue_depth"]) == (1, 1, 1, 2)
+    assert sum(t.name == "kanban-push-eval" for t in threading.enumerate()) == 1
+
+    block.set()
+    dispatcher._eval_worker.join(5)
+    assert dispatcher.dispatch_pending() == 2
+    assert dispatcher.window.scripts[-2:] == ["/* 2 */", "/* 最新の状態 */"]
+    stats = dispatcher.stats()
+    assert (stats["delivered"], stats["queue_depth"]) == (2, 0)
@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import json
+import os
+import socket
+import threading
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, KanbanServer, TaskStore, _encode_ws_frame
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "既存タスク", "Alice", "高", None, ""])
+    wb.save(path)
+
+
+def _read_ws_text(sock: socket.socket) -> str:
+    header = sock.recv(2)
+    length = header[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(sock.recv(2), "big")
+    elif length == 127:
+        length = int.from_bytes(sock.recv(8), "big")
+    data = b""
+    while len(data) < length:
+        data += sock.recv(length - len(data))
+    return data.decode("utf-8")
+
+
+def test_serve_mode_shares_store_over_http_and_websocket(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    static_root = tmp_path / "frontend"
+    (static_root / "pages").mkdir(parents=True)
+    (static_root / "pages" / "index.html").write_text("<html><head></head></html>", encoding="utf-8")
+
+    store = TaskStore(excel_path, enable_journal=False)
+    server = KanbanServer(store, static_root=static_root, port=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    base = f"http://127.0.0.1:{server.port}"
+    auth = {"X-Kanban-Token": server.token}
+
+    try:
+        with urllib.request.urlopen(f"{base}/pages/index.html") as response:
+            assert response.read() == (
+                f'<html><head><meta name="kanban-token" content="{server.token}"></head></html>'.encode("ascii")
+            )
+        with urllib.request.urlopen(urllib.request.Request(f"{base}/api", headers=auth)) as response:
+            assert "add_task" in json.load(response)["methods"]
+
+        ws = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        ws.sendall(
+            (
+                f"GET /ws?token={server.token} HTTP/1.1\r\nHost: localhost:{server.port}\r\n"
+                "Origin: http://localhost:" + str(server.port) + "\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode("ascii")
+        )
+        handshake = b""
+        while b"\r\n\r\n" not in handshake:
+            handshake += ws.recv(1)
+        assert handshake.startswith(b"HTTP/1.1 101")
+        for _ in range(50):
+            if server.client_count:
+                break
+            threading.Event().wait(0.05)
+
+        request = urllib.request.Request(
+            f"{base}/api/add_task",
+            data=json.dumps({"args": [{"タスク": "共有タスク"}]}).encode("utf-8"),
+            headers={"Content-Type": "application/json", **auth},
+            method="POST",
+        )
+        with urllib.request.urlopen(request) as response:
+            body = json.load(response)
+        assert body["ok"] is True
+        assert body["result"]["タスク"] == "共有タスク"
+
+        pushed = json.loads(_read_ws_text(ws))
+        assert [t["タスク"] for t in pushed["tasks"]] == ["既存タスク", "共有タスク"]
+
+        # ブックが変わっていない reload_if_stale は通知しない。次に届くのは update_task の通知。
+        for method, args in (("reload_if_stale", []), ("update_task", [1, {"タスク": "更新"}])):
+            call = urllib.request.Request(
+                f"{base}/api/{method}",
+                data=json.dumps({"args": args}).encode("utf-8"),
+                headers={"Content-Type": "application/json", **auth},
+                method="POST",
+            )
+            with urllib.request.urlopen(call) as response:
+                assert json.load(response)["ok"] is True
+        pushed = json.loads(_read_ws_text(ws))
+        assert [t["タスク"] for t in pushed["tasks"]] == ["更新", "共有タスク"]
+
+        bad = urllib.request.Request(
+            f"{base}/api/update_task",
+            data=json.dumps({"args": [99, {"タスク": "x"}]}).encode("utf-8"),
+            headers={"Content-Type": "application/json", **auth},
+            method="POST",
+        )
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(bad)
+        assert excinfo.value.code == 400
+
+        # 他サイトからの単純な POST・トークン無し・別ホスト名での呼び出しは拒否する。
+        rejected = [
+            ({"Content-Type": "text/plain", **auth}, 415),
+            ({"Content-Type": "application/json"}, 403),
+            ({"Content-Type": "application/json", "Origin": "http://evil.example", **auth}, 403),
+            ({"Content-Type": "application/json", "Host": "evil.example", **auth}, 403),
+        ]
+        for headers, code in rejected:
+            attempt = urllib.request.Request(
+                f"{base}/api/delete_task", data=b'{"args": [1]}', headers=headers, method="POST"
+            )
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                urllib.request.urlopen(attempt)
+            assert excinfo.value.code == code
+        assert len(store.get_tasks()) == 2
+
+        ws.sendall(_encode_ws_frame(b"", opcode=0x8))
+        ws.close()
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+
+
+def test_serve_mode_refuses_non_loopback_host_without_opt_in(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    with pytest.raises(ValueError):
+        KanbanServer(store, static_root=tmp_path, host="0.0.0.0", port=0)
+    server = KanbanServer(store, static_root=tmp_path, host="0.0.0.0", port=0, allow_remote=True)
+    server.api.jobs.shutdown()
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path, rows: int) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    for i in range(rows):
+        ws.append(["未着手", "A", "a", f"タスク{i}", "Alice", "高", None, "", f"id-{i}"])
+    wb.save(path)
+
+
+def _apply(cached, result):
+    # frontend/scripts/common.js の requestCachedStatePayload と同じ手順で当てる
+    if result["mode"] == "unchanged":
+        return cached
+    if result["mode"] == "full":
+        return result["tasks"]
+    tasks = cached[: result["count"]]
+    for task in result["tasks"]:
+        tasks[task["No"] - 1] = task
+    return tasks
+
+
+def test_changes_since_patch_cached_state_to_current(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 20)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+    api = JsApi(store)
+
+    snapshot = api.get_state_snapshot()
+    epoch, version = snapshot["state_epoch"], snapshot["state_version"]
+    cached = snapshot["tasks"]
+    assert api.get_changes_since(version, epoch)["mode"] == "unchanged"
+
+    store.update_task(3, {"備考": "更新"})
+    store.add_task({"タスク": "追加", "ステータス": "進行中"})
+    store.delete_task(15)
+    store.update_task(2, {"担当者": "Bob"})
+    store.set_validations({"担当者": ["Alice", "Bob"]})
+
+    result = api.get_changes_since(version, epoch)
+    assert result["mode"] == "delta"
+    assert [t["No"] for t in result["tasks"]] == [2, 3] + list(range(15, 21))
+    assert result["validations"]["担当者"] == ["Alice", "Bob"]
+    cached = _apply(cached, result)
+    assert cached == store.get_tasks()
+
+    assert api.get_changes_since(result["state_version"], epoch)["mode"] == "unchanged"
+    assert api.get_changes_since(version, "other-epoch")["mode"] == "full"
+
+    store.load_excel()
+    full = api.get_changes_since(result["state_version"], epoch, "columnar")
+    assert full["mode"] == "full" and full["format"] == "columnar"
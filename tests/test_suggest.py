@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, TaskBoard, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    rows = [
+        ("開発", "佐藤"),
+        ("開発", "佐藤"),
+        ("開発", "鈴木"),
+        ("営業", "佐々木"),
+    ]
+    for i, (major, assignee) in enumerate(rows):
+        ws.append(["未着手", major, "", f"タスク{i}", assignee, "", None, "", f"id-{i}"])
+    wb.save(path)
+
+
+def _values(matches):
+    return [match["value"] for match in matches]
+
+
+def test_suggest_ranks_prefix_matches_and_tracks_edits(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+
+    assert _values(store.suggest("担当者", "佐")) == ["佐藤", "佐々木"]
+    assert store.suggest("担当者", "佐藤")[0] == {"value": "佐藤", "count": 2, "validated": False}
+
+    store.set_validations({"担当者": ["佐野", "田中"]})
+    assert _values(store.suggest("担当者", "佐")) == ["佐藤", "佐々木", "佐野"]
+    assert _values(store.suggest("担当者", "佐", limit=1)) == ["佐藤"]
+
+    store.update_task(1, {"担当者": "佐々木"})
+    store.update_task(2, {"担当者": "佐々木"})
+    assert _values(store.suggest("担当者", "佐")) == ["佐々木", "佐野"]
+
+    store.add_task({"ステータス": "未着手", "タスク": "追加", "担当者": "Ｔａｎａｋａ"})
+    assert _values(store.suggest("担当者", "tan")) == ["Ｔａｎａｋａ"]
+
+    store.delete_task(4)
+    store.delete_task(3)
+    assert _values(store.suggest("大分類", "")) == ["開発"]
+
+    with pytest.raises(ValueError):
+        store.suggest("タスク", "")
+
+
+def test_board_merges_full_prefix_ranges_before_ranking(tmp_path):
+    # 佐藤はどのシートでも 1 件だが、合算すると最多になる。
+    excel_path = tmp_path / "board.xlsx"
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet, assignees in {
+        "P1": ["佐々木", "佐々木", "佐藤"],
+        "P2": ["佐野", "佐野", "佐藤"],
+        "P3": ["佐藤"],
+    }.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(TASK_COLUMNS)
+        for i, assignee in enumerate(assignees):
+            ws.append(["未着手", "", "", f"{sheet}-{i}", assignee, "", None, ""])
+    wb.save(excel_path)
+    board = TaskBoard(
+        [(excel_path, "P1"), (excel_path, "P2"), (excel_path, "P3")],
+        enable_journal=False,
+        enable_change_log=False,
+    )
+
+    assert board.suggest("担当者", "佐", limit=1) == [{"value": "佐藤", "count": 3, "validated": False}]
+    assert _values(board.suggest("担当者", "佐")) == ["佐藤", "佐々木", "佐野"]
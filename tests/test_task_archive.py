@@ -0,0 +1,65 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    today = dt.date.today()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Kanban"
+    ws.append(TASK_COLUMNS)
+    ws.append(["完了", "A", "a", "古い完了1", "Alice", "高", today - dt.timedelta(days=90), ""])
+    ws.append(["進行中", "A", "a", "進行中タスク", "Bob", "中", today - dt.timedelta(days=90), ""])
+    ws.append(["完了", "B", "b", "最近の完了", "Alice", "低", today, ""])
+    ws.append(["完了", "B", "b", "古い完了2", "Bob", "低", today - dt.timedelta(days=40), "メモ"])
+    wb.save(path)
+
+
+def test_archive_moves_old_completed_tasks_and_pages_lazily(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    api = JsApi(TaskStore(excel_path, sheet_name="Kanban", enable_journal=False))
+
+    result = api.archive_completed_tasks(30)
+    assert result["archived"] == 2
+    assert [t["タスク"] for t in result["tasks"]] == ["進行中タスク", "最近の完了"]
+
+    wb = load_workbook(excel_path)
+    assert wb.sheetnames == ["Kanban", "Kanban_アーカイブ"]
+
+    reloaded = TaskStore(excel_path, sheet_name="Kanban", enable_journal=False)
+    assert [t["タスク"] for t in reloaded.get_tasks()] == ["進行中タスク", "最近の完了"]
+
+    first = api.get_archived_tasks(0, 1)
+    assert first["total"] == 2
+    assert [t["タスク"] for t in first["tasks"]] == ["古い完了1"]
+    second = api.get_archived_tasks(1, 1)
+    assert second["total"] == 2
+    assert second["tasks"][0]["備考"] == "メモ"
+    assert second["tasks"][0]["アーカイブ日"] == dt.date.today().isoformat()
+
+    assert api.archive_completed_tasks(30)["archived"] == 0
+
+
+def test_archive_refuses_while_edits_are_unsaved(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, sheet_name="Kanban", enable_journal=False, enable_change_log=False)
+    store.update_task(2, {"タスク": "未保存の編集"})
+    before = excel_path.stat().st_mtime_ns
+
+    with pytest.raises(ValueError):
+        store.archive_completed_tasks(30)
+    assert excel_path.stat().st_mtime_ns == before
+    assert len(store.get_tasks()) == 4
+
+    store.save_excel(backup=False)
+    assert store.archive_completed_tasks(30) == 2
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskBoard
+
+
+def _build_workbook(path: Path, sheets) -> None:
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet, titles in sheets.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(TASK_COLUMNS)
+        for title in titles:
+            ws.append(["未着手", "A", "a", title, "Alice", "高", None, ""])
+    wb.save(path)
+
+
+def test_board_aggregates_sources_and_saves_only_modified_ones(tmp_path, monkeypatch):
+    # save_excel はバックアップをカレントディレクトリへ書くため、tmp_path に閉じ込める。
+    monkeypatch.chdir(tmp_path)
+    projects = tmp_path / "projects.xlsx"
+    sales = tmp_path / "sales.xlsx"
+    _build_workbook(projects, {"P1": ["p1-a", "p1-b"], "P2": ["p2-a"]})
+    _build_workbook(sales, {"Sheet": ["s-a"]})
+
+    board = TaskBoard(
+        [(projects, "P1"), (projects, "P2"), (sales, None)],
+        enable_journal=False,
+        enable_change_log=False,
+    )
+    api = JsApi(board)
+    try:
+        tasks = api.get_tasks()
+        assert [(t["No"], t["タスク"], t["ソース"]) for t in tasks] == [
+            (1, "p1-a", "projects/P1"),
+            (2, "p1-b", "projects/P1"),
+            (3, "p2-a", "projects/P2"),
+            (4, "s-a", "sales"),
+        ]
+
+        moved = api.move_task(3, "完了")
+        assert moved["No"] == 3 and moved["ソース"] == "projects/P2"
+        added = api.add_task({"タスク": "p2-new", "ソース": "projects/P2"})
+        assert added["No"] == 4
+        assert [t["タスク"] for t in api.get_tasks()][2:] == ["p2-a", "p2-new", "s-a"]
+
+        sales_mtime = sales.stat().st_mtime_ns
+        api.save_excel()
+        assert sales.stat().st_mtime_ns == sales_mtime
+
+        wb = load_workbook(projects)
+        p2 = [row[:4] for row in wb["P2"].iter_rows(min_row=2, values_only=True)]
+        assert p2 == [("完了", "A", "a", "p2-a"), (None, None, None, "p2-new")]
+        assert [row[3] for row in wb["P1"].iter_rows(min_row=2, values_only=True)] == ["p1-a", "p1-b"]
+        assert [s["dirty"] for s in api.get_sources()] == [False, False, False]
+    finally:
+        board.close()
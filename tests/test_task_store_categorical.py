@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import CATEGORICAL_COLUMNS, TASK_COLUMNS, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    for i in range(20):
+        ws.append(["未着手" if i % 2 else "進行中", "A", "a", f"タスク{i}", "Alice", 2, None, ""])
+    wb.save(path)
+
+
+def test_low_cardinality_columns_share_dictionary_encoding(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+
+    for col in CATEGORICAL_COLUMNS:
+        assert isinstance(store._df[col].dtype, pd.CategoricalDtype)
+        assert list(store._df[col].cat.categories) == list(store._last_saved_snapshot[col].cat.categories)
+    assert list(store._df["担当者"].cat.categories) == ["Alice"]
+
+    store.add_task({"タスク": "新規", "ステータス": "レビュー", "担当者": "Carol", "優先度": "高"})
+    store.update_task(1, {"担当者": "Bob", "優先度": ""})
+    for col in CATEGORICAL_COLUMNS:
+        assert isinstance(store._df[col].dtype, pd.CategoricalDtype)
+        assert list(store._df[col].cat.categories) == list(store._last_saved_snapshot[col].cat.categories)
+    assert store.get_statuses()[-1] == "レビュー"
+    tasks = store.get_tasks()
+    assert tasks[0]["担当者"] == "Bob" and tasks[0]["優先度"] == ""
+    assert tasks[-1]["優先度"] == "高"
+
+    store.save_excel(backup=False)
+    ws = load_workbook(excel_path).active
+    rows = list(ws.iter_rows(min_row=2, values_only=True))
+    assert rows[0][TASK_COLUMNS.index("担当者")] == "Bob"
+    assert rows[-1][TASK_COLUMNS.index("ステータス")] == "レビュー"
+    assert isinstance(store._df["ステータス"].dtype, pd.CategoricalDtype)
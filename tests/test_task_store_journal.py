@@ -0,0 +1,52 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Kanban"
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "既存タスク", "Alice", "高", dt.date(2024, 1, 1), ""])
+    ws.append(["進行中", "B", "b", "消えるタスク", "Bob", "中", dt.date(2024, 1, 2), ""])
+    wb.save(path)
+
+
+def test_journal_replays_unsaved_operations_and_compacts(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+
+    store = TaskStore(excel_path, sheet_name="Kanban")
+    store.add_task({"タスク": "新規", "ステータス": "レビュー", "期限": "2024-02-03", "優先度": "2"})
+    store.move_task(1, "完了")
+    store.delete_task(2)
+    store.set_validations({"担当者": ["Alice", "Bob"]})
+    assert store.journal is not None and store.journal.has_records()
+    store.journal.close()
+
+    # 保存せずに再起動したケース: ジャーナルから復元される
+    recovered = TaskStore(excel_path, sheet_name="Kanban")
+    tasks = recovered.get_tasks()
+    assert [t["タスク"] for t in tasks] == ["既存タスク", "新規"]
+    assert tasks[0]["ステータス"] == "完了"
+    assert tasks[1]["期限"] == "2024-02-03"
+    assert tasks[1]["優先度"] == 2
+    assert "レビュー" in recovered.get_statuses()
+    assert recovered.get_validations()["担当者"] == ["Alice", "Bob"]
+
+    assert recovered.compact_journal() is not None
+    assert not recovered.journal.has_records()
+    assert not recovered.journal.path.exists()
+    assert not list(Path.cwd().glob("board.bak_*.xlsx"))
+
+    ws = load_workbook(excel_path)["Kanban"]
+    titles = [row[TASK_COLUMNS.index("タスク")] for row in ws.iter_rows(min_row=2, values_only=True)]
+    assert titles == ["既存タスク", "新規"]
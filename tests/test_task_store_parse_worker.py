@@ -0,0 +1,64 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "元のタスク", "Alice", 2, None, ""])
+    wb.save(path)
+
+
+def _rename_first_task(path: Path, title: str) -> None:
+    wb = load_workbook(path)
+    ws = wb.active
+    ws.cell(row=2, column=TASK_COLUMNS.index("タスク") + 1).value = title
+    wb.save(path)
+
+
+def test_reload_parses_in_worker_process(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False, parse_in_subprocess=True)
+    try:
+        _rename_first_task(excel_path, "外部で変更")
+        store.load_excel()
+        assert store._parse_pool is not None
+        task = store.get_tasks()[0]
+        assert task["タスク"] == "外部で変更"
+    finally:
+        store.close()
+
+
+def test_reads_serve_previous_snapshot_while_parsing(tmp_path, monkeypatch):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    store = TaskStore(excel_path, enable_journal=False)
+    _rename_first_task(excel_path, "新しいタスク")
+
+    parsing = threading.Event()
+    release = threading.Event()
+    original = store._parse_workbook
+
+    def slow_parse(requested_sheet):
+        parsing.set()
+        release.wait(5)
+        return original(requested_sheet)
+
+    monkeypatch.setattr(store, "_parse_workbook", slow_parse)
+    loader = threading.Thread(target=store.load_excel)
+    loader.start()
+    assert parsing.wait(5)
+    assert store.get_tasks()[0]["タスク"] == "元のタスク"
+    release.set()
+    loader.join(5)
+    assert store.get_tasks()[0]["タスク"] == "新しいタスク"
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, TaskStore
+
+
+def _build_store(path: Path, **kwargs) -> TaskStore:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    for i in range(4):
+        ws.append(["未着手", "", "", f"タスク{i}", "", "", None, f"メモ{i}", f"id-{i}"])
+    wb.save(path)
+    return TaskStore(path, enable_journal=False, enable_change_log=False, **kwargs)
+
+
+def _titles(store):
+    return [(task["ステータス"], task["タスク"]) for task in store.get_tasks()]
+
+
+def test_undo_and_redo_replay_moves_deletes_and_adds(tmp_path):
+    store = _build_store(tmp_path / "board.xlsx")
+    original = store.get_tasks()
+
+    store.move_task(2, "完了")
+    store.delete_task(3)
+    store.add_task({"ステータス": "進行中", "タスク": "追加"})
+    edited = store.get_tasks()
+
+    assert store.undo()["op"] == "add"
+    result = store.undo()
+    assert (result["op"], result["No"], result["task"]["備考"]) == ("delete", 3, "メモ2")
+    result = store.undo()
+    assert (result["op"], result["task"]["ステータス"]) == ("update", "未着手")
+    assert store.get_tasks() == original
+    assert store.undo()["ok"] is False
+
+    for _ in range(3):
+        assert store.redo()["ok"]
+    assert store.get_tasks() == edited
+    assert store.get_undo_state()["can_redo"] is False
+
+    store.undo()
+    store.update_task(1, {"タスク": "新しい編集"})
+    assert store.get_undo_state()["can_redo"] is False
+
+
+def test_undo_history_is_capped_and_cleared_on_reload(tmp_path):
+    store = _build_store(tmp_path / "board.xlsx", undo_max_bytes=400)
+    for i in range(20):
+        store.update_task(1, {"タスク": f"編集{i}"})
+    state = store.get_undo_state()
+    assert 0 < state["undo_count"] < 20 and state["bytes"] <= 400
+
+    store.load_excel()
+    assert store.get_undo_state()["can_undo"] is False
+
+
+def test_undone_delete_keeps_extra_columns_after_journal_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    excel_path = tmp_path / "board.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["工数", "__kanban_id"])
+    for i in range(3):
+        ws.append(["未着手", "", "", f"タスク{i}", "", "", None, "", f"{i + 1}h", f"id-{i}"])
+    wb.save(excel_path)
+
+    store = TaskStore(excel_path, enable_change_log=False)
+    store.delete_task(2)
+    store.undo()
+    store.journal.close()
+
+    # 保存せずに再起動したケース: ジャーナルの再生で追加列も元の位置に戻る。
+    recovered = TaskStore(excel_path, enable_change_log=False)
+    assert recovered._df["__kanban_id"].tolist() == ["id-0", "id-1", "id-2"]
+    assert recovered._df["工数"].tolist() == ["1h", "2h", "3h"]
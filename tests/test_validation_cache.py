@@ -0,0 +1,123 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from backend import backend
+from backend.backend import TASK_COLUMNS, _parse_workbook_columnar
+
+
+def _build_workbook(path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Tasks"
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "初期", "Alice", "高", None, ""])
+    lists = wb.create_sheet("Lists")
+    for name in ["Alice", "Bob", "Alice", " "]:
+        lists.append([name])
+    dv = DataValidation(type="list", formula1="=Lists!$A:$A")
+    dv.add("E2:E1048576")
+    ws.add_data_validation(dv)
+    dv = DataValidation(type="list", formula1='"高,中,低"')
+    dv.add("F2:XFD2")
+    ws.add_data_validation(dv)
+    wb.save(path)
+
+
+def _edit(path: Path, sheet: str, cell: str, value) -> None:
+    wb = load_workbook(path)
+    wb[sheet][cell] = value
+    wb.save(path)
+
+
+def test_validations_are_cached_until_lookup_sheet_changes(tmp_path, monkeypatch):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path)
+    calls = []
+    original = backend.load_workbook
+
+    def counting_load_workbook(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(backend, "load_workbook", counting_load_workbook)
+
+    parsed = _parse_workbook_columnar(str(excel_path), None)
+    assert parsed["sheet_name"] == "Tasks"
+    assert parsed["validations"]["担当者"] == ["Alice", "Bob"]
+    assert parsed["validations"]["優先度"] == ["高", "中", "低"]
+    assert len(calls) == 1
+
+    _edit(excel_path, "Tasks", "D2", "タスクだけ変更")
+    calls.clear()
+    parsed = _parse_workbook_columnar(str(excel_path), None)
+    assert calls == []
+    assert parsed["validations"]["担当者"] == ["Alice", "Bob"]
+    assert parsed["data"]["タスク"] == ["タスクだけ変更"]
+
+    _edit(excel_path, "Lists", "A5", "Carol")
+    parsed = _parse_workbook_columnar(str(excel_path), "Tasks")
+    assert len(calls) == 1
+    assert parsed["validations"]["担当者"] == ["Alice", "Bob", "Carol"]
+
+
+def _write_shared_strings(path: Path, values) -> None:
+    # Excel が保存したブックと同じく、参照先シートの値を共有文字列に置く。
+    items = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            items[name] = archive.read(name)
+    strings = "".join(f"<si><t>{value}</t></si>" for value in values)
+    items["xl/sharedStrings.xml"] = (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        f'count="{len(values)}" uniqueCount="{len(values)}">{strings}</sst>'
+    ).encode("utf-8")
+    if b"sharedStrings" not in items["[Content_Types].xml"]:
+        items["[Content_Types].xml"] = items["[Content_Types].xml"].replace(
+            b"</Types>",
+            b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+            b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>',
+        )
+        items["xl/_rels/workbook.xml.rels"] = items["xl/_rels/workbook.xml.rels"].replace(
+            b"</Relationships>",
+            b'<Relationship Id="rIdStrings" Type="http://schemas.openxmlformats.org/officeDocument/'
+            b'2006/relationships/sharedStrings" Target="sharedStrings.xml"/></Relationships>',
+        )
+        sheet = items["xl/worksheets/sheet2.xml"].decode("utf-8")
+        for index, value in enumerate(values):
+            sheet = sheet.replace(
+                f't="inlineStr"><is><t>{value}</t></is>', f't="s"><v>{index}</v>'
+            )
+        items["xl/worksheets/sheet2.xml"] = sheet.encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in items.items():
+            archive.writestr(name, data)
+
+
+def test_renamed_shared_string_in_lookup_sheet_invalidates_cache(tmp_path):
+    # 共有文字列の値だけを書き換えた場合、参照先シートの XML は変わらない。
+    excel_path = tmp_path / "board.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS)
+    ws.append(["未着手", "A", "a", "初期", "Alice", "高", None, ""])
+    lists = wb.create_sheet("Lists")
+    for name in ["Xavier", "Yuri"]:
+        lists.append([name])
+    dv = DataValidation(type="list", formula1="=Lists!$A$1:$A$2")
+    dv.add("E2:E100")
+    ws.add_data_validation(dv)
+    wb.save(excel_path)
+    _write_shared_strings(excel_path, ["Xavier", "Yuri"])
+    sheet_before = zipfile.ZipFile(excel_path).read("xl/worksheets/sheet2.xml")
+
+    assert _parse_workbook_columnar(str(excel_path), None)["validations"]["担当者"] == ["Xavier", "Yuri"]
+    _write_shared_strings(excel_path, ["Zelda", "Yuri"])
+    assert zipfile.ZipFile(excel_path).read("xl/worksheets/sheet2.xml") == sheet_before
+    assert _parse_workbook_columnar(str(excel_path), None)["validations"]["担当者"] == ["Zelda", "Yuri"]
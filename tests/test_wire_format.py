@@ -0,0 +1,69 @@
+import datetime as dt
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import Workbook
+
+from backend.backend import TASK_COLUMNS, JsApi, TaskStore, build_update_payload
+
+
+def _build_workbook(path: Path, rows: int) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(TASK_COLUMNS + ["__kanban_id"])
+    statuses = ["未着手", "進行中", "完了"]
+    for i in range(rows):
+        due = dt.date(2024, 1, 1) + dt.timedelta(days=i % 5) if i % 3 else None
+        ws.append([statuses[i % 3], "大", "中", f"タスク{i}", "Alice" if i % 2 else "", "高", due, "", f"id-{i}"])
+    wb.save(path)
+
+
+def _decode(table):
+    # frontend/scripts/common.js の decodeColumnarTable と同じ手順で復元する
+    count = table["count"]
+    decoded = {}
+    for name in table["columns"]:
+        column = table["data"][name]
+        if column["type"] == "range":
+            decoded[name] = [column["start"] + i for i in range(count)]
+        elif column["type"] == "dict":
+            decoded[name] = [column["values"][code] for code in column["codes"]]
+        elif column["type"] == "days":
+            decoded[name] = [
+                "" if v is None else (dt.date(1970, 1, 1) + dt.timedelta(days=v)).isoformat() if isinstance(v, int) else v
+                for v in column["values"]
+            ]
+        else:
+            decoded[name] = column["values"]
+    return [{name: decoded[name][i] for name in table["columns"]} for i in range(count)]
+
+
+def test_columnar_payload_decodes_to_rows_and_is_smaller(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 30)
+    store = TaskStore(excel_path, enable_journal=False, enable_change_log=False)
+
+    rows = build_update_payload(store)
+    columnar = build_update_payload(store, "columnar")
+
+    assert columnar["format"] == "columnar"
+    assert columnar["statuses"] == rows["statuses"]
+    assert _decode(columnar["table"]) == rows["tasks"]
+    assert columnar["table"]["data"]["ステータス"]["type"] == "dict"
+    assert len(json.dumps(columnar, ensure_ascii=False)) < len(json.dumps(rows, ensure_ascii=False))
+
+
+def test_js_api_negotiates_wire_format(tmp_path):
+    excel_path = tmp_path / "board.xlsx"
+    _build_workbook(excel_path, 3)
+    api = JsApi(TaskStore(excel_path, enable_journal=False, enable_change_log=False))
+
+    assert "columnar" in api.get_wire_formats()
+    assert "tasks" in api.get_state_snapshot()
+    assert api.get_state_snapshot("columnar")["table"]["count"] == 3
+    assert api.set_push_wire_format("bogus") == "rows"
+    assert api.set_push_wire_format("columnar") == "columnar"